@@ -23,6 +23,7 @@ from src.spare_part.schemas import SparePart
 from src.repair_request.schemas import RepairRequest
 from src.failure_type.schemas import FailureType
 from src.auth.schemas import User
+from src.statistics.schemas import RepairRequestDailyStat, ExportJob
 
 
 config = context.config
@@ -0,0 +1,41 @@
+"""stock ledger plain ids
+
+Revision ID: 2c6f0e8b5a13
+Revises: d91f4b6a2c38
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c6f0e8b5a13'
+down_revision: Union[str, Sequence[str], None] = 'd91f4b6a2c38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The cascades erased the history of deleted spare parts and institutions.
+    op.drop_constraint("stock_movement_spare_part_id_fkey", "stock_movement", type_="foreignkey")
+    op.drop_constraint("stock_movement_institution_id_fkey", "stock_movement", type_="foreignkey")
+    op.drop_constraint("stock_snapshot_spare_part_id_fkey", "stock_snapshot", type_="foreignkey")
+    op.drop_constraint("stock_snapshot_institution_id_fkey", "stock_snapshot", type_="foreignkey")
+    op.execute("ALTER TYPE stockmovementreason ADD VALUE IF NOT EXISTS 'deletion'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Enum values cannot be dropped, the rows using it go with the history of deleted rows.
+    op.execute("DELETE FROM stock_movement WHERE reason = 'deletion'")
+    for table in ("stock_movement", "stock_snapshot"):
+        op.execute(f"""
+            DELETE FROM {table}
+            WHERE spare_part_id NOT IN (SELECT id FROM spare_part)
+               OR institution_id NOT IN (SELECT id FROM institution)
+        """)
+        op.create_foreign_key(f"{table}_spare_part_id_fkey", table, "spare_part", ["spare_part_id"], ["id"], ondelete="CASCADE")
+        op.create_foreign_key(f"{table}_institution_id_fkey", table, "institution", ["institution_id"], ["id"], ondelete="CASCADE")
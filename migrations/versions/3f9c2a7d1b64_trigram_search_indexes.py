@@ -0,0 +1,45 @@
+"""trigram search indexes
+
+Revision ID: 3f9c2a7d1b64
+Revises: 
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9c2a7d1b64'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ("ix_equipment_serial_number_trgm", "equipment", "serial_number"),
+    ("ix_equipment_model_name_trgm", "equipment_model", "name"),
+    ("ix_institution_name_trgm", "institution", "name"),
+    ("ix_institution_address_trgm", "institution", "address"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,48 @@
+"""repair request daily stat
+
+Revision ID: 5d2b8f61c0e3
+Revises: c4a7e2f19d35
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2b8f61c0e3'
+down_revision: Union[str, Sequence[str], None] = 'c4a7e2f19d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "repair_request_daily_stat",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("institution_id", sa.Integer(), nullable=True),
+        sa.Column("equipment_model_id", sa.Integer(), nullable=True),
+        sa.Column("failure_type_id", sa.Integer(), nullable=True),
+        sa.Column("request_count", sa.Integer(), nullable=False),
+        sa.Column("completed_count", sa.Integer(), nullable=False),
+        sa.Column("repair_seconds", sa.Float(), nullable=False),
+        sa.Column("spare_part_quantity", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_repair_request_daily_stat_day",
+        "repair_request_daily_stat",
+        ["day", "failure_type_id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_repair_request_daily_stat_day", table_name="repair_request_daily_stat", if_exists=True)
+    op.drop_table("repair_request_daily_stat", if_exists=True)
@@ -0,0 +1,27 @@
+"""used spare part repair request index
+
+Revision ID: 7e1b3c5a9d42
+Revises: 2c6f0e8b5a13
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e1b3c5a9d42'
+down_revision: Union[str, Sequence[str], None] = '2c6f0e8b5a13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_used_spare_part_repair_request_id", "used_spare_part", ["repair_request_id"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_used_spare_part_repair_request_id", table_name="used_spare_part", if_exists=True)
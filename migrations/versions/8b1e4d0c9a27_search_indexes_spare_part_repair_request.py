@@ -0,0 +1,42 @@
+"""search indexes for spare parts and repair requests
+
+Revision ID: 8b1e4d0c9a27
+Revises: 3f9c2a7d1b64
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b1e4d0c9a27'
+down_revision: Union[str, Sequence[str], None] = '3f9c2a7d1b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ("ix_spare_part_name_trgm", "spare_part", "name"),
+    ("ix_repair_request_issue_trgm", "repair_request", "issue"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in TRIGRAM_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,50 @@
+"""statistics export job
+
+Revision ID: a61e93c7d8f2
+Revises: 5d2b8f61c0e3
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61e93c7d8f2'
+down_revision: Union[str, Sequence[str], None] = '5d2b8f61c0e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "statistics_export_job",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("filters_hash", sa.String(), nullable=False),
+        sa.Column("filters", sa.JSON(), nullable=False),
+        sa.Column("format", sa.Enum("xlsx", "csv", "parquet", name="exportformat"), nullable=False),
+        sa.Column("status", sa.Enum("pending", "running", "finished", "failed", name="exportjobstatus"), nullable=False),
+        sa.Column("rows_written", sa.Integer(), nullable=False),
+        sa.Column("file_name", sa.String(), nullable=False),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("file_name"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_statistics_export_job_filters_hash", "statistics_export_job", ["filters_hash"], if_not_exists=True)
+    op.create_index("ix_statistics_export_job_expires_at", "statistics_export_job", ["expires_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_statistics_export_job_expires_at", table_name="statistics_export_job", if_exists=True)
+    op.drop_index("ix_statistics_export_job_filters_hash", table_name="statistics_export_job", if_exists=True)
+    op.drop_table("statistics_export_job", if_exists=True)
+    sa.Enum(name="exportjobstatus").drop(op.get_bind(), checkfirst=True)
+    sa.Enum(name="exportformat").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,69 @@
+"""stock ledger
+
+Revision ID: b7e2c94d0f18
+Revises: f83a1d6e2b57
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c94d0f18'
+down_revision: Union[str, Sequence[str], None] = 'f83a1d6e2b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "stock_movement",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("delta", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.Enum("used_spare_part", "location_edit", name="stockmovementreason"), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("spare_part_id", sa.Integer(), nullable=False),
+        sa.Column("institution_id", sa.Integer(), nullable=True),
+        sa.Column("repair_request_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["spare_part_id"], ["spare_part.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["institution_id"], ["institution.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["repair_request_id"], ["repair_request.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index("ix_stock_movement_created_at", "stock_movement", ["created_at"], if_not_exists=True)
+    op.create_index("ix_stock_movement_location", "stock_movement", ["spare_part_id", "institution_id", "created_at"], if_not_exists=True)
+
+    op.create_table(
+        "stock_snapshot",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("taken_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("spare_part_id", sa.Integer(), nullable=False),
+        sa.Column("institution_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["spare_part_id"], ["spare_part.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["institution_id"], ["institution.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("taken_at", "spare_part_id", "institution_id"),
+        if_not_exists=True,
+    )
+
+    # Opening snapshot, the ledger starts from the quantities stored so far.
+    op.execute("""
+        INSERT INTO stock_snapshot (taken_at, spare_part_id, institution_id, quantity)
+        SELECT now(), spare_part_id, institution_id, quantity
+        FROM location
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("stock_snapshot", if_exists=True)
+    op.drop_index("ix_stock_movement_location", table_name="stock_movement", if_exists=True)
+    op.drop_index("ix_stock_movement_created_at", table_name="stock_movement", if_exists=True)
+    op.drop_table("stock_movement", if_exists=True)
+    sa.Enum(name="stockmovementreason").drop(op.get_bind(), checkfirst=True)
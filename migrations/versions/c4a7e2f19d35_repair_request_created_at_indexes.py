@@ -0,0 +1,35 @@
+"""repair request created_at indexes
+
+Revision ID: c4a7e2f19d35
+Revises: 8b1e4d0c9a27
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e2f19d35'
+down_revision: Union[str, Sequence[str], None] = '8b1e4d0c9a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_repair_request_created_at", "repair_request", ["created_at"], if_not_exists=True)
+    op.create_index(
+        "ix_repair_request_equipment_id_created_at",
+        "repair_request",
+        ["equipment_id", "created_at"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_repair_request_equipment_id_created_at", table_name="repair_request", if_exists=True)
+    op.drop_index("ix_repair_request_created_at", table_name="repair_request", if_exists=True)
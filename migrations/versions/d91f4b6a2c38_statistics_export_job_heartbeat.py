@@ -0,0 +1,43 @@
+"""statistics export job heartbeat
+
+Revision ID: d91f4b6a2c38
+Revises: b7e2c94d0f18
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91f4b6a2c38'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c94d0f18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("statistics_export_job", sa.Column("heartbeat_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False))
+    # Workers of jobs that were active before the upgrade are gone with the old process.
+    op.execute("""
+        UPDATE statistics_export_job
+        SET status = 'failed', error = 'The export stopped responding', finished_at = now()
+        WHERE status IN ('pending', 'running')
+    """)
+    op.create_index(
+        "uq_statistics_export_job_active_filters_hash",
+        "statistics_export_job",
+        ["filters_hash"],
+        unique=True,
+        postgresql_where=sa.text("status IN ('pending', 'running')"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("uq_statistics_export_job_active_filters_hash", table_name="statistics_export_job", if_exists=True)
+    op.drop_column("statistics_export_job", "heartbeat_at")
@@ -0,0 +1,53 @@
+"""equipment status column
+
+Revision ID: e27c5b90f4a1
+Revises: a61e93c7d8f2
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e27c5b90f4a1'
+down_revision: Union[str, Sequence[str], None] = 'a61e93c7d8f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+equipment_status = sa.Enum("working", "under_maintenance", "not_working", name="equipmentstatus")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    equipment_status.create(op.get_bind(), checkfirst=True)
+    op.add_column(
+        "equipment",
+        sa.Column("status", equipment_status, server_default="working", nullable=False),
+    )
+    op.execute("""
+        UPDATE equipment
+        SET status = CASE (
+            SELECT max(CASE
+                WHEN repair_request.last_status = 'not_taken' THEN 2
+                WHEN repair_request.last_status IN ('in_progress', 'waiting_spare_parts') THEN 1
+                ELSE 0
+            END)
+            FROM repair_request
+            WHERE repair_request.equipment_id = equipment.id
+        )
+            WHEN 2 THEN 'not_working'::equipmentstatus
+            WHEN 1 THEN 'under_maintenance'::equipmentstatus
+            ELSE 'working'::equipmentstatus
+        END
+    """)
+    op.create_index("ix_equipment_status", "equipment", ["status"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_equipment_status", table_name="equipment", if_exists=True)
+    op.drop_column("equipment", "status")
+    equipment_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,56 @@
+"""spare part stock columns
+
+Revision ID: f83a1d6e2b57
+Revises: e27c5b90f4a1
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f83a1d6e2b57'
+down_revision: Union[str, Sequence[str], None] = 'e27c5b90f4a1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+stock_status = sa.Enum("in_stock", "low_stock", "out_of_stock", name="stockstatus")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    stock_status.create(op.get_bind(), checkfirst=True)
+    op.add_column("spare_part", sa.Column("total_quantity", sa.Integer(), server_default="0", nullable=False))
+    op.add_column("spare_part", sa.Column("stock_status", stock_status, server_default="out_of_stock", nullable=False))
+    op.execute("""
+        UPDATE spare_part
+        SET total_quantity = totals.quantity
+        FROM (
+            SELECT spare_part_id, sum(quantity) AS quantity
+            FROM location
+            GROUP BY spare_part_id
+        ) AS totals
+        WHERE totals.spare_part_id = spare_part.id
+    """)
+    op.execute("""
+        UPDATE spare_part
+        SET stock_status = CASE
+            WHEN total_quantity >= min_quantity THEN 'in_stock'::stockstatus
+            WHEN total_quantity > 0 THEN 'low_stock'::stockstatus
+            ELSE 'out_of_stock'::stockstatus
+        END
+    """)
+    op.create_index("ix_spare_part_total_quantity", "spare_part", ["total_quantity"], if_not_exists=True)
+    op.create_index("ix_spare_part_stock_status", "spare_part", ["stock_status"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_spare_part_stock_status", table_name="spare_part", if_exists=True)
+    op.drop_index("ix_spare_part_total_quantity", table_name="spare_part", if_exists=True)
+    op.drop_column("spare_part", "stock_status")
+    op.drop_column("spare_part", "total_quantity")
+    stock_status.drop(op.get_bind(), checkfirst=True)
@@ -1,10 +1,11 @@
-from sqlalchemy import select
+from sqlalchemy import select, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.schemas import User
 from src.filters import FilterRelatedField, apply_filters_wrapper, apply_filters
 from src.repository import CRUDRepository
 from src.sorting import SortingRelatedField, apply_sorting_wrapper, apply_sorting
+from src.statement_cache import statement_cache
 from src.utils import build_relation
 
 
@@ -26,6 +27,9 @@ class AuthRepository(CRUDRepository[User]):
        )
 
     async def get_by_email(self, email: str, database: AsyncSession, preloads: list[str] | None = None) -> User | None:
-        options = build_relation(User, preloads or [])
-        stmt = select(User).options(*options).where(User.email == email)
-        return (await database.execute(stmt)).unique().scalars().first()
\ No newline at end of file
+        preloads = preloads or []
+        stmt = statement_cache.get_or_build(
+            ("get_by_email", User, tuple(preloads)),
+            lambda: select(User).options(*build_relation(User, preloads)).where(User.email == bindparam("email")),
+        )
+        return (await database.execute(stmt, {"email": email})).unique().scalars().first()
\ No newline at end of file
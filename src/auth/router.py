@@ -1,4 +1,3 @@
-import json
 from typing import Annotated
 
 from fastapi import APIRouter
@@ -25,11 +24,13 @@ async def get_users_list_endpoint(
         pagination: Pagination = Depends(),
         sorting: Sorting = Depends(),
         filters: str | None = Query(None),
+        fields: str | None = Query(None),
 ) -> PaginationResponse[UserInfo]:
     return await auth_services.paginate(
         database=database,
         pagination=pagination,
-        filters=json.loads(filters) if filters else None,
+        filters=auth_services.parse_filters(filters),
+        fields=auth_services.parse_fields(fields),
         sorting=None if sorting.sort_by == "" else sorting,
         preloads=["workplace"],
     )
@@ -0,0 +1,42 @@
+import time
+from collections import OrderedDict
+from typing import Generic, TypeVar, Hashable
+
+KeyType = TypeVar("KeyType", bound=Hashable)
+ValueType = TypeVar("ValueType")
+
+class TTLCache(Generic[KeyType, ValueType]):
+    def __init__(self, ttl: float, max_size: int = 1024):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.entries: OrderedDict[KeyType, tuple[float, ValueType]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: KeyType) -> ValueType | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self.entries[key]
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key: KeyType, value: ValueType) -> None:
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -39,6 +39,13 @@ class AppSettings(BaseSettings):
     superuser_email: str
     superuser_password: str
 
+    # Connections one dashboard request may hold at once, 1 runs the widgets sequentially.
+    statistics_dashboard_connections: int = Field(default=4, ge=1)
+    # Seconds a finished statistics export stays downloadable and reusable.
+    statistics_export_ttl: int = Field(default=3600, ge=1)
+    # Seconds without progress after which a pending or running export counts as dead.
+    statistics_export_heartbeat_timeout: int = Field(default=300, ge=1)
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_nested_delimiter="__"
@@ -0,0 +1,114 @@
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from types import UnionType
+from typing import Any, Iterable, Type, TypeVar, Union, get_args, get_origin
+
+from pydantic import BaseModel, TypeAdapter
+from pydantic.fields import FieldInfo
+
+InfoType = TypeVar("InfoType", bound=BaseModel)
+
+FieldPlan = tuple[tuple[str, str, type | None, FieldInfo], ...]
+
+# Types a database row already holds in their final form. Anything else (EmailStr, phone
+# numbers, custom types) may normalize the value and has to go through validation.
+PLAIN_TYPES = (str, int, float, bool, datetime, date, time, Decimal, Any)
+
+
+class UntrustedRowError(Exception):
+    pass
+
+@lru_cache(maxsize=None)
+def get_list_adapter(info_type: Type[InfoType]) -> TypeAdapter[list[InfoType]]:
+    return TypeAdapter(list[info_type])
+
+@lru_cache(maxsize=None)
+def get_field_plan(info_type: Type[BaseModel]) -> FieldPlan:
+    return tuple((name, *classify_annotation(field.annotation), field) for name, field in info_type.model_fields.items())
+
+@lru_cache(maxsize=None)
+def requires_validation(info_type: Type[BaseModel]) -> bool:
+    decorators = info_type.__pydantic_decorators__
+    if decorators.validators or decorators.field_validators or decorators.root_validators or decorators.model_validators:
+        return True
+    return any(kind == "validate" or field.metadata for _, kind, _, field in get_field_plan(info_type))
+
+def classify_annotation(annotation: Any) -> tuple[str, type | None]:
+    if get_origin(annotation) in (Union, UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return "validate", None
+        annotation = args[0]
+
+    if get_origin(annotation) is list:
+        item = get_args(annotation)[0]
+        if isinstance(item, type) and issubclass(item, BaseModel):
+            return "models", item
+        if item in PLAIN_TYPES:
+            return "value", None
+    elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return "model", annotation
+    elif isinstance(annotation, type) and issubclass(annotation, Enum):
+        return "enum", annotation
+    elif annotation in PLAIN_TYPES:
+        return "value", None
+
+    return "validate", None
+
+def construct_model(info_type: Type[InfoType], row: Any, converted: dict[tuple[type, int], BaseModel] | None = None) -> InfoType:
+    # Rows come from our own tables, so models made only of plain values, enums and
+    # nested models are built without validation. Models with validators or types
+    # that normalize their value (emails, phone numbers) are validated, a row can
+    # hold a value written in another format.
+    # Rows shared through the identity map, like the institution of every request on
+    # a page, are converted once per `converted` mapping.
+    if converted is None:
+        converted = {}
+    key = (info_type, id(row))
+    model = converted.get(key)
+    if model is not None:
+        return model
+
+    if requires_validation(info_type):
+        model = converted[key] = info_type.model_validate(row.__dict__, from_attributes=True)
+        return model
+
+    values = row.__dict__
+    data = {}
+    for name, kind, target, field in get_field_plan(info_type):
+        if name not in values:
+            if field.is_required():
+                raise UntrustedRowError(name)
+            continue
+
+        value = values[name]
+        if value is None:
+            data[name] = None
+        elif kind == "model":
+            data[name] = construct_model(target, value, converted)
+        elif kind == "models":
+            data[name] = [construct_model(target, item, converted) for item in value]
+        elif kind == "enum" and not isinstance(value, target):
+            data[name] = target(value)
+        else:
+            data[name] = value
+
+    model = converted[key] = info_type.model_construct(**data)
+    return model
+
+def to_models(info_type: Type[InfoType], rows: Iterable[Any]) -> list[InfoType]:
+    rows = list(rows)
+    try:
+        converted = {}
+        return [construct_model(info_type, row, converted) for row in rows]
+    except UntrustedRowError:
+        # Rows with unloaded required attributes get the validating path and its errors.
+        return get_list_adapter(info_type).validate_python([row.__dict__ for row in rows], from_attributes=True)
+
+def to_model(info_type: Type[InfoType], row: Any) -> InfoType:
+    try:
+        return construct_model(info_type, row)
+    except UntrustedRowError:
+        return info_type.model_validate(row.__dict__, from_attributes=True)
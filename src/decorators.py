@@ -1,13 +1,19 @@
+import asyncio
+import random
 from functools import wraps
 from typing import ParamSpec, TypeVar, Callable, Awaitable
 
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.exc import IntegrityError, DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.exceptions import DomainError, ApiError, ErrorsMap, parse_integrity_error
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
+# serialization_failure and deadlock_detected, the transaction can simply be run again.
+RETRYABLE_SQLSTATES = {"40001", "40P01"}
+
 def domain_errors(errors_map: ErrorsMap):
     def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
         @wraps(func)
@@ -30,4 +36,23 @@ def integrity_errors():
                 if error is None: raise
                 raise error
         return wrapper
-    return decorator
\ No newline at end of file
+    return decorator
+
+def serialization_retries(attempts: int = 3, base_delay: float = 0.05):
+    # Reruns the whole call, so it only fits methods that own their transaction
+    # and do not mutate their arguments.
+    def decorator(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            database = next(arg for arg in (*args, *kwargs.values()) if isinstance(arg, AsyncSession))
+            for attempt in range(attempts):
+                try:
+                    return await func(*args, **kwargs)
+                except DBAPIError as e:
+                    if getattr(e.orig, "sqlstate", None) not in RETRYABLE_SQLSTATES or attempt == attempts - 1:
+                        raise
+
+                    await database.rollback()
+                    await asyncio.sleep(base_delay * 2 ** attempt * (1 + random.random()))
+        return wrapper
+    return decorator
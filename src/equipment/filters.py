@@ -1,28 +1,26 @@
 from sqlalchemy import or_, select, Select, exists, not_, and_
-from sqlalchemy.orm import aliased
 
 from src.equipment.models import EquipmentStatus
-from src.filters import Filters, FilterRelatedFieldsMap, get_filter_value
+from src.filters import FilterPlan, FilterRelatedFieldsMap
 from src.equipment.schemas import Equipment
 from src.equipment_model.schemas import EquipmentModel
 from src.filters import apply_filters
 from src.repair_request.schemas import RepairRequest, RepairRequestStatus
+from src.search import contains
 
 
-def apply_equipment_filters(stmt: Select, data: Filters, related_fields: FilterRelatedFieldsMap) -> Select:
+def apply_equipment_filters(stmt: Select, data: FilterPlan, related_fields: FilterRelatedFieldsMap) -> Select:
     stmt = apply_filters(stmt, data, related_fields)
-    or_conditions = get_filter_value(data.get("equipment_model_name_or_serial_number"), column=Equipment.serial_number)
+    search = data.condition("equipment_model_name_or_serial_number")
 
-    if or_conditions is not None:
-        EquipmentModelAlias = aliased(EquipmentModel)
-        stmt = (
-            stmt
-            .join(EquipmentModelAlias, EquipmentModelAlias.id == Equipment.equipment_model_id)
-            .where(
-                or_(
-                    Equipment.serial_number.ilike(f"%{or_conditions}%"),
-                    EquipmentModelAlias.name.ilike(f"%{or_conditions}%"),
-                )
+    if search is not None:
+        # Each side is matched within its own table so both trigram indexes can be used.
+        stmt = stmt.where(
+            or_(
+                contains(Equipment.serial_number, search.value),
+                Equipment.equipment_model_id.in_(
+                    select(EquipmentModel.id).where(contains(EquipmentModel.name, search.value))
+                ),
             )
         )
 
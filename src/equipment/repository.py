@@ -1,21 +1,25 @@
-from sqlalchemy import select, func, distinct
+from sqlalchemy import select, func, distinct, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.decorators import integrity_errors
+
 from src.equipment.filters import apply_equipment_filters
 from src.equipment.models import EquipmentStatus, EquipmentQrData
 from src.equipment.schemas import Equipment
 from src.equipment_model.schemas import EquipmentModel
 from src.exceptions import DomainError, DomainErrorCode
-from src.filters import apply_filters_wrapper, FilterRelatedField, Filters
+from src.filters import apply_filters_wrapper, FilterRelatedField, FilterCustomField, SEARCH_OPERATORS, Filters
 from src.institution.schemas import Institution
 from src.manufacturer.schemas import Manufacturer
-from src.repository import CRUDRepository
+from src.repair_request.schemas import RepairRequest
+from src.repository import CRUDRepository, count_cache
 from src.sorting import apply_sorting_wrapper, SortingRelatedField, apply_sorting, Sorting
-from src.utils import build_relation
+from src.statistics.cache import statistics_cache
+from src.statistics.rollup import get_request_days, lock_equipment_request_days, refresh_days
 
 filter_related_fields_map = {
     "status": FilterRelatedField(join=None, column=Equipment.status, use_exists=False),
-    "equipment_model_name_or_serial_number": None,
+    "equipment_model_name_or_serial_number": FilterCustomField(column=Equipment.serial_number, operators=SEARCH_OPERATORS),
     "institution_id": FilterRelatedField(join=None, column=Equipment.institution_id, use_exists=False),
     "equipment_model_id": FilterRelatedField(join=None, column=Equipment.equipment_model_id, use_exists=False),
     "manufacturer_id": FilterRelatedField(join=None, column=Equipment.manufacturer_id, use_exists=False),
@@ -35,15 +39,37 @@ class EquipmentRepository(CRUDRepository[Equipment]):
             sorting_callback=apply_sorting_wrapper(apply_sorting, sorting_related_fields_map),
        )
 
-    async def get(self, id_: int, database: AsyncSession, preloads: list[str] | None = None) -> Equipment:
-        options = build_relation(Equipment, preloads or [])
-        stmt = select(Equipment).options(*options).where(Equipment.id == id_)
-        obj = (await database.execute(stmt)).unique().scalars().first()
+    @integrity_errors()
+    async def update(self, id_: int, data: dict, database: AsyncSession, preloads: list[str] | None = None) -> Equipment:
+        if not data:
+            return await super().update(id_, data, database, preloads)
+
+        rows = await database.execute(update(Equipment).where(Equipment.id == id_).values(data))
+        if rows.rowcount == 0:
+            raise DomainError(code=DomainErrorCode.not_entity, field="")
+
+        # The rollup is grouped by institution and model, moving equipment moves its requests.
+        moved = data.keys() & {"institution_id", "equipment_model_id"}
+        if moved:
+            await refresh_days(database, await get_request_days(database, RepairRequest.equipment_id == id_))
+
+        await database.commit()
+        count_cache.clear()
+        if moved:
+            statistics_cache.clear()
+        return await self.get(id_, database, preloads)
 
-        if obj is None:
-            raise DomainError(code=DomainErrorCode.not_entity)
+    async def delete(self, id_: int, database: AsyncSession) -> int:
+        days = await lock_equipment_request_days(database, Equipment.id == id_)
+        result = await database.execute(delete(Equipment).where(Equipment.id == id_))
+        if result.rowcount == 0:
+            raise DomainError(code=DomainErrorCode.not_entity, field="")
 
-        return obj
+        await refresh_days(database, days)
+        await database.commit()
+        count_cache.clear()
+        statistics_cache.clear()
+        return id_
 
     async def get_qr_data(self, database: AsyncSession) -> list[EquipmentQrData]:
         stmt = (select(Equipment.id, Equipment.serial_number, Institution.name.label("institution_name"))
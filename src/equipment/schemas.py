@@ -1,11 +1,12 @@
 from datetime import date
 from enum import Enum
 
-from sqlalchemy import ForeignKey, case, func, select, DateTime
-from sqlalchemy.orm import Mapped, relationship, mapped_column, column_property
+from sqlalchemy import ForeignKey, case, func, DateTime, Index
+from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from src.database import BaseDatabaseModel
 from src.repair_request.schemas import RepairRequest, RepairRequestStatus
+from src.search import trigram_index
 
 class EquipmentStatus(str, Enum):
     working = 'working'
@@ -22,24 +23,18 @@ worst_status_case = func.max(
 
 class Equipment(BaseDatabaseModel):
     __tablename__ = "equipment"
+    __table_args__ = (
+        trigram_index("ix_equipment_serial_number_trgm", "serial_number"),
+        Index("ix_equipment_status", "status"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     location: Mapped[str] = mapped_column()
     serial_number: Mapped[str] = mapped_column(unique=True)
     installed: Mapped[date] = mapped_column(DateTime(timezone=True))
 
-    status: Mapped[EquipmentStatus] = column_property(
-        select(
-            case(
-                (worst_status_case == 2, EquipmentStatus.not_working),
-                (worst_status_case == 1, EquipmentStatus.under_maintenance),
-                else_=EquipmentStatus.working
-            )
-        )
-        .where(RepairRequest.equipment_id == id)
-        .correlate_except(RepairRequest)
-        .scalar_subquery()
-    )
+    # Kept in sync by RepairRequestRepository, see src/equipment/status.py.
+    status: Mapped[EquipmentStatus] = mapped_column(default=EquipmentStatus.working, server_default=EquipmentStatus.working.value)
 
     institution_id: Mapped[int] = mapped_column(ForeignKey("institution.id", ondelete="CASCADE"))
     institution: Mapped["Institution"] = relationship(back_populates="equipment", lazy="noload")
@@ -4,8 +4,11 @@ from src.equipment.models import EquipmentInfo, EquipmentQrData
 from src.equipment.repository import EquipmentRepository
 from src.equipment.schemas import Equipment
 from src.services import GenericServices
+from src.summary.services import summary_cache
 
 class EquipmentServices(GenericServices[Equipment, EquipmentInfo]):
+    caches = (summary_cache,)
+
     def __init__(self):
         super().__init__(EquipmentRepository(), EquipmentInfo)
         self.repo = EquipmentRepository()
@@ -0,0 +1,65 @@
+import asyncio
+from typing import Iterable
+
+from sqlalchemy import select, update, case, cast
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import session_factory
+from src.equipment.schemas import Equipment, EquipmentStatus, worst_status_case
+from src.repair_request.schemas import RepairRequest
+
+computed_status = cast(
+    select(
+        case(
+            (worst_status_case == 2, EquipmentStatus.not_working),
+            (worst_status_case == 1, EquipmentStatus.under_maintenance),
+            else_=EquipmentStatus.working
+        )
+    )
+    .where(RepairRequest.equipment_id == Equipment.id)
+    .correlate_except(RepairRequest)
+    .scalar_subquery(),
+    Equipment.status.type,
+)
+
+
+async def refresh_equipment_status(database: AsyncSession, equipment_ids: Iterable[int | None]) -> None:
+    ids = sorted({id_ for id_ in equipment_ids if id_ is not None})
+    if not ids:
+        return
+
+    # Locking the rows first serializes concurrent refreshes of the same equipment,
+    # the recount then sees every committed repair request. FOR NO KEY UPDATE rather
+    # than FOR UPDATE, the repair request insert already holds KEY SHARE on the row
+    # through its foreign key and FOR UPDATE would deadlock two such transactions.
+    await database.execute(
+        select(Equipment.id).where(Equipment.id.in_(ids)).order_by(Equipment.id).with_for_update(key_share=True)
+    )
+    await database.execute(update(Equipment).where(Equipment.id.in_(ids)).values(status=computed_status))
+
+async def reconcile_equipment_status(database: AsyncSession, batch_size: int = 1000) -> int:
+    changed = 0
+    last_id = 0
+    while True:
+        ids = (await database.execute(
+            select(Equipment.id).where(Equipment.id > last_id).order_by(Equipment.id).limit(batch_size)
+        )).scalars().all()
+        if not ids:
+            return changed
+
+        result = await database.execute(
+            update(Equipment)
+            .where(Equipment.id.in_(ids), Equipment.status != computed_status)
+            .values(status=computed_status)
+        )
+        await database.commit()
+        changed += result.rowcount
+        last_id = ids[-1]
+
+async def main() -> None:
+    async with session_factory() as session:
+        changed = await reconcile_equipment_status(session)
+    print(f"Reconciled equipment status, {changed} row(s) changed")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,35 @@
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.equipment.schemas import Equipment
+from src.equipment_model.schemas import EquipmentModel
+from src.exceptions import DomainError, DomainErrorCode
+from src.filters import FilterRelatedField, apply_filters_wrapper, apply_filters
+from src.repository import CRUDRepository, count_cache
+from src.sorting import SortingRelatedField, apply_sorting_wrapper, apply_sorting
+from src.statistics.cache import statistics_cache
+from src.statistics.rollup import lock_equipment_request_days, refresh_days
+
+filter_related_fields_map = {"name": FilterRelatedField(join=None, column=EquipmentModel.name, use_exists=False)}
+sorting_related_fields_map = {"name": SortingRelatedField(join=None, column=EquipmentModel.name)}
+
+class EquipmentModelRepository(CRUDRepository[EquipmentModel]):
+    def __init__(self):
+        super().__init__(
+            EquipmentModel,
+            filter_callback=apply_filters_wrapper(apply_filters, filter_related_fields_map),
+            sorting_callback=apply_sorting_wrapper(apply_sorting, sorting_related_fields_map),
+        )
+
+    async def delete(self, id_: int, database: AsyncSession) -> int:
+        # The delete cascades to the model's equipment and their requests.
+        days = await lock_equipment_request_days(database, Equipment.equipment_model_id == id_)
+        result = await database.execute(delete(EquipmentModel).where(EquipmentModel.id == id_))
+        if result.rowcount == 0:
+            raise DomainError(code=DomainErrorCode.not_entity, field="")
+
+        await refresh_days(database, days)
+        await database.commit()
+        count_cache.clear()
+        statistics_cache.clear()
+        return id_
@@ -1,4 +1,3 @@
-import json
 from typing import Annotated
 
 from fastapi import APIRouter
@@ -24,11 +23,13 @@ async def get_equipment_model_list_endpoint(
         pagination: Pagination = Depends(),
         sorting: Sorting = Depends(),
         filters: str | None = Query(None),
+        fields: str | None = Query(None),
 ) -> PaginationResponse[EquipmentModelInfo]:
     return await services.paginate(
         database=database,
         pagination=pagination,
-        filters=json.loads(filters) if filters else None,
+        filters=services.parse_filters(filters),
+        fields=services.parse_fields(fields),
         sorting=None if sorting.sort_by == "" else sorting,
     )
 
@@ -2,10 +2,14 @@ from sqlalchemy import ForeignKey
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from src.database import BaseDatabaseModel
+from src.search import trigram_index
 
 
 class EquipmentModel(BaseDatabaseModel):
     __tablename__ = "equipment_model"
+    __table_args__ = (
+        trigram_index("ix_equipment_model_name_trgm", "name"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(unique=True)
@@ -0,0 +1,32 @@
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.exceptions import DomainError, DomainErrorCode
+from src.failure_type.schemas import FailureType
+from src.filters import apply_filters_wrapper, apply_filters, FilterRelatedField
+from src.repository import CRUDRepository, count_cache
+from src.sorting import SortingRelatedField, apply_sorting_wrapper, apply_sorting
+from src.statistics.cache import statistics_cache
+from src.statistics.rollup import delete_failure_type_stats
+
+filter_related_fields_map = {"name": FilterRelatedField(join=None, column=FailureType.name, use_exists=False)}
+sorting_related_fields_map = {"name": SortingRelatedField(join=None, column=FailureType.name)}
+
+class FailureTypeRepository(CRUDRepository[FailureType]):
+    def __init__(self):
+        super().__init__(
+            FailureType,
+            filter_callback=apply_filters_wrapper(apply_filters, filter_related_fields_map),
+            sorting_callback=apply_sorting_wrapper(apply_sorting, sorting_related_fields_map),
+        )
+
+    async def delete(self, id_: int, database: AsyncSession) -> int:
+        result = await database.execute(delete(FailureType).where(FailureType.id == id_))
+        if result.rowcount == 0:
+            raise DomainError(code=DomainErrorCode.not_entity, field="")
+
+        await delete_failure_type_stats(database, id_)
+        await database.commit()
+        count_cache.clear()
+        statistics_cache.clear()
+        return id_
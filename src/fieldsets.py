@@ -0,0 +1,53 @@
+from functools import lru_cache
+from typing import Type
+
+from pydantic import BaseModel, create_model
+from sqlalchemy import inspect
+from sqlalchemy.orm import InstrumentedAttribute
+
+from src.responses import ORJSONResponse
+
+
+class InvalidFieldsError(ValueError):
+    def __init__(self, message: str, field: str | None = None):
+        super().__init__(message)
+        self.field = field
+
+def parse_fields(fields: str | None, model_type: Type[BaseModel]) -> tuple[str, ...] | None:
+    if not fields:
+        return None
+
+    names = tuple(dict.fromkeys(name.strip() for name in fields.split(",") if name.strip()))
+    for name in names:
+        if name not in model_type.model_fields:
+            raise InvalidFieldsError(f"Unknown field '{name}'", name)
+
+    return names or None
+
+@lru_cache(maxsize=256)
+def build_fields_model(model_type: Type[BaseModel], fields: tuple[str, ...]) -> Type[BaseModel]:
+    return create_model(
+        f"{model_type.__name__}Fields",
+        __config__=model_type.model_config,
+        **{name: (model_type.model_fields[name].annotation, model_type.model_fields[name]) for name in fields},
+    )
+
+def build_projection(model, fields: tuple[str, ...], preloads: list[str]) -> tuple[list[InstrumentedAttribute], list[str]]:
+    # Primary keys are always loaded, relationships also need their local foreign keys.
+    mapper = inspect(model)
+    keys = [mapper.get_property_by_column(column).key for column in mapper.primary_key]
+    relations = set()
+
+    for name in fields:
+        if name in mapper.column_attrs:
+            keys.append(name)
+        elif name in mapper.relationships:
+            relations.add(name)
+            keys += [mapper.get_property_by_column(column).key for column in mapper.relationships[name].local_columns]
+
+    preloads = [preload for preload in preloads if preload.split(".")[0].split(":")[0] in relations]
+    return [getattr(model, key) for key in dict.fromkeys(keys)], preloads
+
+def fields_response(page: BaseModel) -> ORJSONResponse:
+    # Trimmed pages do not match the endpoint's response_model, so they skip it.
+    return ORJSONResponse(content=page)
@@ -0,0 +1,174 @@
+import json
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Iterator, Mapping
+import dataclasses
+
+OPERATORS = {
+    "eq": lambda col, val: col == val,
+    "ne": lambda col, val: col != val,
+    "lt": lambda col, val: col < val,
+    "lte": lambda col, val: col <= val,
+    "gt": lambda col, val: col > val,
+    "gte": lambda col, val: col >= val,
+    "like": lambda col, val: col.like(f"%{val}%"),
+    "ilike": lambda col, val: col.ilike(f"%{val}%"),
+    "in": lambda col, val: col.in_(val),
+    "notin": lambda col, val: ~col.in_(val),
+    "isnull": lambda col, val: col.is_(None) if val else col.is_not(None),
+}
+LIST_OPERATORS = {"in", "notin"}
+
+TRUE_VALUES = ("1", "true", "yes")
+FALSE_VALUES = ("0", "false", "no")
+
+Scalar = str | int | float | bool
+
+
+class InvalidFilterError(ValueError):
+    def __init__(self, message: str, field: str | None = None):
+        super().__init__(message)
+        self.field = field
+
+@dataclasses.dataclass(frozen=True)
+class FilterCondition:
+    field: str
+    operator: str
+    value: Any
+
+class FilterPlan(Mapping[str, Any]):
+    """
+    Validated filters. Every field is pre-cast into `conditions`, custom filter
+    callbacks look theirs up with `condition`. Mapping access keeps the raw values.
+    """
+
+    def __init__(self, raw: dict[str, Any], conditions: tuple[FilterCondition, ...], canonical: str):
+        self.raw = raw
+        self.conditions = conditions
+        self.canonical = canonical
+        self.by_field = {condition.field: condition for condition in conditions}
+
+    def condition(self, field: str) -> FilterCondition | None:
+        return self.by_field.get(field)
+
+    def __getitem__(self, key: str) -> Any:
+        return self.raw[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.raw)
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+    def __repr__(self) -> str:
+        return f"FilterPlan({self.canonical})"
+
+EMPTY_PLAN = FilterPlan({}, (), "{}")
+
+class FilterParser:
+    def __init__(self, related_fields: Mapping[str, Any], max_size: int = 512):
+        self.related_fields = related_fields
+        self.max_size = max_size
+        self.plans: OrderedDict[str, FilterPlan] = OrderedDict()
+
+    def parse(self, filters: FilterPlan | dict[str, Any] | str | None) -> FilterPlan:
+        if isinstance(filters, FilterPlan):
+            return filters
+        if not filters:
+            return EMPTY_PLAN
+
+        if isinstance(filters, str):
+            try:
+                filters = json.loads(filters)
+            except ValueError:
+                raise InvalidFilterError("Filters must be a JSON object")
+
+        if not isinstance(filters, dict):
+            raise InvalidFilterError("Filters must be a JSON object")
+
+        canonical = json.dumps(filters, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        plan = self.plans.get(canonical)
+        if plan is not None:
+            self.plans.move_to_end(canonical)
+            return plan
+
+        plan = self.build(filters, canonical)
+        self.plans[canonical] = plan
+        if len(self.plans) > self.max_size:
+            self.plans.popitem(last=False)
+        return plan
+
+    def build(self, filters: dict[str, Any], canonical: str) -> FilterPlan:
+        conditions = []
+        for field, value in filters.items():
+            if field not in self.related_fields:
+                raise InvalidFilterError(f"Unknown filter field '{field}'", field)
+            if value is None:
+                continue
+
+            operator, raw_value = split_operator(field, value)
+            related_field = self.related_fields[field]
+            operators = getattr(related_field, "operators", None)
+            if operators is not None and operator not in operators:
+                raise InvalidFilterError(f"Unsupported operator '{operator}' for filter '{field}'", field)
+
+            value = cast_condition_value(related_field.column, field, operator, raw_value)
+            conditions.append(FilterCondition(field=field, operator=operator, value=value))
+
+        return FilterPlan(filters, tuple(conditions), canonical)
+
+def split_operator(field: str, value: Any) -> tuple[str, Any]:
+    if isinstance(value, dict):
+        if len(value) != 1:
+            raise InvalidFilterError(f"Filter '{field}' must have exactly one operator", field)
+        operator, raw_value = next(iter(value.items()))
+        if operator not in OPERATORS:
+            raise InvalidFilterError(f"Unknown operator '{operator}' for filter '{field}'", field)
+    else:
+        operator, raw_value = "eq", value
+
+    if isinstance(raw_value, list):
+        if operator not in LIST_OPERATORS or not all(isinstance(v, Scalar) for v in raw_value):
+            raise InvalidFilterError(f"Invalid value for filter '{field}'", field)
+    elif not isinstance(raw_value, Scalar):
+        raise InvalidFilterError(f"Invalid value for filter '{field}'", field)
+
+    return operator, raw_value
+
+def cast_condition_value(column, field: str, operator: str, value: Any) -> Any:
+    if operator == "isnull":
+        return cast_bool(field, value)
+
+    if operator in LIST_OPERATORS:
+        values = value if isinstance(value, list) else str(value).split(",")
+        return [cast_scalar(column, field, v) for v in values]
+
+    return cast_scalar(column, field, value)
+
+def cast_scalar(column, field: str, value: Scalar) -> Any:
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    try:
+        if issubclass(python_type, bool):
+            return cast_bool(field, value)
+        if issubclass(python_type, datetime):
+            return datetime.fromisoformat(str(value))
+        if issubclass(python_type, date):
+            return date.fromisoformat(str(value))
+        return python_type(value)
+    except (ValueError, TypeError):
+        raise InvalidFilterError(f"Invalid value '{value}' for filter '{field}'", field)
+
+def cast_bool(field: str, value: Scalar) -> bool:
+    if isinstance(value, bool):
+        return value
+
+    normalized = str(value).lower()
+    if normalized in TRUE_VALUES:
+        return True
+    if normalized in FALSE_VALUES:
+        return False
+    raise InvalidFilterError(f"Invalid boolean '{value}' for filter '{field}'", field)
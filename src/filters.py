@@ -1,22 +1,9 @@
 import dataclasses
-from enum import Enum
 from typing import Callable, Any
 from sqlalchemy import and_, Select, exists, select, ColumnElement
 from sqlalchemy.orm import InstrumentedAttribute
 
-OPERATORS = {
-    "eq": lambda col, val: col == val,
-    "ne": lambda col, val: col != val,
-    "lt": lambda col, val: col < val,
-    "lte": lambda col, val: col <= val,
-    "gt": lambda col, val: col > val,
-    "gte": lambda col, val: col >= val,
-    "like": lambda col, val: col.like(f"%{val}%"),
-    "ilike": lambda col, val: col.ilike(f"%{val}%"),
-    "in": lambda col, val: col.in_(val),
-    "notin": lambda col, val: ~col.in_(val),
-    "isnull": lambda col, val: col.is_(None) if val else col.is_not(None),
-}
+from src.filter_dsl import OPERATORS, FilterParser, FilterPlan, FilterCondition
 
 @dataclasses.dataclass
 class FilterRelatedField:
@@ -27,24 +14,37 @@ class FilterRelatedField:
     join: InstrumentedAttribute | None = None
     exists_condition: Callable[[Any], InstrumentedAttribute] | None = None
 
-FilterRelatedFieldsMap = dict[str, FilterRelatedField | None]
+@dataclasses.dataclass
+class FilterCustomField:
+    """
+    A field applied by the repository's own filter callback. Its value is cast like
+    `column` and only the given operators are accepted, all of them when None.
+    """
+    column: InstrumentedAttribute
+
+    operators: frozenset[str] | None = None
+
+SEARCH_OPERATORS = frozenset({"eq"})
+
+FilterRelatedFieldsMap = dict[str, FilterRelatedField | FilterCustomField]
 Filters =  dict[str, str | dict[str, str]]
 
-FilterCallback = Callable[[Select, Filters], Select]
-FilterWrapperCallback = Callable[[Select, Filters, FilterRelatedFieldsMap], Select]
+FilterCallback = Callable[[Select, FilterPlan], Select]
+FilterWrapperCallback = Callable[[Select, FilterPlan, FilterRelatedFieldsMap], Select]
 
 def apply_filters_wrapper(filter_callback: FilterWrapperCallback, related_fields: FilterRelatedFieldsMap) -> FilterCallback:
-    def wrapper(stmt: Select, filters: Filters) -> Select:
+    def wrapper(stmt: Select, filters: FilterPlan) -> Select:
         return filter_callback(stmt, filters, related_fields)
+    wrapper.parser = FilterParser(related_fields)
     return wrapper
 
-def apply_filters(stmt: Select, filters: Filters, related_fields: FilterRelatedFieldsMap) -> Select:
+def apply_filters(stmt: Select, filters: FilterPlan, related_fields: FilterRelatedFieldsMap) -> Select:
     conditions = []
     joins = set()
 
-    for field, value in filters.items():
-        related_field = related_fields.get(field)
-        if not related_field or value is None:
+    for condition in filters.conditions:
+        related_field = related_fields.get(condition.field)
+        if not isinstance(related_field, FilterRelatedField):
             continue
 
         column = related_field.column
@@ -64,77 +64,12 @@ def apply_filters(stmt: Select, filters: Filters, related_fields: FilterRelatedF
             stmt = stmt.where(exists(subq))
             continue
 
-        if isinstance(value, dict):
-            condition = build_operator(column, value)
-        else:
-            condition = column == cast_filter_value(column, value)
-
-        conditions.append(condition)
+        conditions.append(OPERATORS[condition.operator](column, condition.value))
 
     if conditions:
         stmt = stmt.where(and_(*conditions))
 
     return stmt
 
-def get_filter_value(
-    value: str | dict[str, str] | None,
-    *,
-    column: InstrumentedAttribute | None = None,
-    enum: type[Enum] | None = None,
-):
-    if value is None:
-        return None
-
-    if isinstance(value, dict):
-        operator, raw_value = next(iter(value.items()))
-    else:
-        operator, raw_value = "eq", value
-
-    if operator == "isnull":
-        return str(raw_value).lower() in ("1", "true", "yes")
-
-    if enum is not None:
-        try:
-            return enum(raw_value).value
-        except ValueError:
-            raise ValueError(f"Invalid enum value '{raw_value}'")
-
-    if column is not None:
-        return cast_filter_value(column, raw_value)
-
-    return raw_value
-
-
-def build_operator(column, value_dict):
-    operators = list(value_dict.keys())
-    if not operators:
-        return column
-
-    op = operators[0]
-    if op not in OPERATORS:
-        return column
-
-    raw_value = value_dict.get(op)
-
-    value = cast_filter_value(column, raw_value)
-
-    return OPERATORS[op](column, value)
-
-def cast_filter_value(column: InstrumentedAttribute, value):
-    if value is None:
-        return None
-
-    try:
-        python_type = column.type.python_type
-    except NotImplementedError:
-        return value
-
-    if isinstance(value, str) and "," in value:
-        return [python_type(v) for v in value.split(",")]
-
-    try:
-        return python_type(value)
-    except (ValueError, TypeError):
-        raise ValueError(
-            f"Invalid value '{value}' for column '{column.key}'"
-        )
+def condition_clause(condition: FilterCondition, column: ColumnElement) -> ColumnElement:
+    return OPERATORS[condition.operator](column, condition.value)
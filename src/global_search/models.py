@@ -0,0 +1,20 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class SearchHitType(str, Enum):
+    equipment = "equipment"
+    institution = "institution"
+    spare_part = "spare_part"
+    repair_request = "repair_request"
+
+class SearchHit(BaseModel):
+    type: SearchHitType
+    id: int
+    title: str
+    subtitle: str | None = None
+    rank: float
+
+class SearchResponse(BaseModel):
+    items: list[SearchHit]
@@ -0,0 +1,76 @@
+from typing import Callable
+
+from sqlalchemy import Select, String, cast, literal, null, or_, select
+
+from src.equipment.schemas import Equipment
+from src.equipment_model.schemas import EquipmentModel
+from src.global_search.models import SearchHitType
+from src.institution.schemas import Institution
+from src.repair_request.schemas import RepairRequest
+from src.search import best_rank, contains, match_rank
+from src.spare_part.schemas import SparePart
+
+
+def equipment_hits(term: str, dialect: str) -> Select:
+    rank = best_rank(dialect, match_rank(Equipment.serial_number, term, dialect), match_rank(EquipmentModel.name, term, dialect))
+    return (
+        select(
+            literal(SearchHitType.equipment.value).label("type"),
+            Equipment.id.label("id"),
+            Equipment.serial_number.label("title"),
+            EquipmentModel.name.label("subtitle"),
+            rank.label("rank"),
+        )
+        .outerjoin(EquipmentModel, EquipmentModel.id == Equipment.equipment_model_id)
+        .where(
+            or_(
+                contains(Equipment.serial_number, term),
+                Equipment.equipment_model_id.in_(select(EquipmentModel.id).where(contains(EquipmentModel.name, term))),
+            )
+        )
+    )
+
+def institution_hits(term: str, dialect: str) -> Select:
+    rank = best_rank(dialect, match_rank(Institution.name, term, dialect), match_rank(Institution.address, term, dialect))
+    return (
+        select(
+            literal(SearchHitType.institution.value).label("type"),
+            Institution.id.label("id"),
+            Institution.name.label("title"),
+            Institution.address.label("subtitle"),
+            rank.label("rank"),
+        )
+        .where(or_(contains(Institution.name, term), contains(Institution.address, term)))
+    )
+
+def spare_part_hits(term: str, dialect: str) -> Select:
+    return (
+        select(
+            literal(SearchHitType.spare_part.value).label("type"),
+            SparePart.id.label("id"),
+            SparePart.name.label("title"),
+            cast(null(), String).label("subtitle"),
+            match_rank(SparePart.name, term, dialect).label("rank"),
+        )
+        .where(contains(SparePart.name, term))
+    )
+
+def repair_request_hits(term: str, dialect: str) -> Select:
+    return (
+        select(
+            literal(SearchHitType.repair_request.value).label("type"),
+            RepairRequest.id.label("id"),
+            RepairRequest.issue.label("title"),
+            Equipment.serial_number.label("subtitle"),
+            match_rank(RepairRequest.issue, term, dialect).label("rank"),
+        )
+        .outerjoin(Equipment, Equipment.id == RepairRequest.equipment_id)
+        .where(contains(RepairRequest.issue, term))
+    )
+
+SEARCH_QUERIES: dict[SearchHitType, Callable[[str, str], Select]] = {
+    SearchHitType.equipment: equipment_hits,
+    SearchHitType.institution: institution_hits,
+    SearchHitType.spare_part: spare_part_hits,
+    SearchHitType.repair_request: repair_request_hits,
+}
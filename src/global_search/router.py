@@ -0,0 +1,21 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+from fastapi.params import Depends
+
+from src.auth.dependencies import allowed
+from src.database import DatabaseSession
+from src.global_search.models import SearchResponse, SearchHitType
+from src.global_search.services import GlobalSearchServices
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+@router.get("", response_model=SearchResponse)
+async def search_endpoint(
+        database: DatabaseSession,
+        _: Annotated[None, Depends(allowed())],
+        q: str = Query(min_length=1, max_length=100),
+        limit: int = Query(5, ge=1, le=50),
+        types: list[SearchHitType] | None = Query(None),
+) -> SearchResponse:
+    return await GlobalSearchServices.search(database=database, term=q.strip(), limit=limit, types=types)
@@ -0,0 +1,27 @@
+from sqlalchemy import select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.global_search.models import SearchHitType, SearchResponse, SearchHit
+from src.global_search.queries import SEARCH_QUERIES
+
+
+class GlobalSearchServices:
+    @staticmethod
+    async def search(database: AsyncSession, term: str, limit: int, types: list[SearchHitType] | None = None) -> SearchResponse:
+        if not term:
+            return SearchResponse(items=[])
+
+        dialect = database.bind.dialect.name
+        branches = []
+        # Repeated types would run the same branch twice and return every hit twice.
+        for hit_type in dict.fromkeys(types or SearchHitType):
+            # Every type is limited on its own, so one busy table cannot crowd out the others.
+            hits = SEARCH_QUERIES[hit_type](term, dialect)
+            hits = hits.order_by(hits.selected_columns.rank.desc(), hits.selected_columns.id).limit(limit).subquery()
+            branches.append(select(hits))
+
+        union = union_all(*branches).subquery()
+        stmt = select(union).order_by(union.c.rank.desc(), union.c.type, union.c.id)
+
+        rows = (await database.execute(stmt)).mappings().all()
+        return SearchResponse(items=[SearchHit.model_validate(row) for row in rows])
@@ -1,19 +1,15 @@
-from sqlalchemy import Select, or_
+from sqlalchemy import Select
 
-from src.filters import Filters, FilterRelatedFieldsMap, apply_filters, get_filter_value
+from src.filters import FilterPlan, FilterRelatedFieldsMap, apply_filters
 from src.institution.schemas import Institution
+from src.search import contains_any
 
 
-def apply_institution_filters(stmt: Select, data: Filters, related_fields: FilterRelatedFieldsMap) -> Select:
+def apply_institution_filters(stmt: Select, data: FilterPlan, related_fields: FilterRelatedFieldsMap) -> Select:
     stmt = apply_filters(stmt, data, related_fields)
 
-    name_or_address = get_filter_value(data.get("name_or_address"), column=Institution.name)
+    name_or_address = data.condition("name_or_address")
     if name_or_address is not None:
-        stmt = stmt.where(
-            or_(
-                Institution.name.ilike(f"%{name_or_address}%"),
-                Institution.address.ilike(f"%{name_or_address}%"),
-            )
-        )
+        stmt = stmt.where(contains_any(name_or_address.value, Institution.name, Institution.address))
 
-    return stmt
\ No newline at end of file
+    return stmt
@@ -0,0 +1,52 @@
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.equipment.schemas import Equipment
+from src.exceptions import DomainError, DomainErrorCode
+from src.filters import apply_filters_wrapper, FilterCustomField, SEARCH_OPERATORS
+from src.institution.filters import apply_institution_filters
+from src.institution.schemas import Institution
+from src.repair_request.schemas import RepairRequest, UsedSparePart
+from src.repository import CRUDRepository, count_cache
+from src.spare_part.ledger import record_movements
+from src.spare_part.schemas import Location, StockMovementReason
+from src.spare_part.stock import lock_stock, refresh_stock
+from src.sorting import SortingRelatedField, apply_sorting_wrapper, apply_sorting
+from src.statistics.cache import statistics_cache
+from src.statistics.rollup import get_request_days, lock_equipment_request_days, refresh_days
+
+filterRelatedFieldsMap = {"name_or_address": FilterCustomField(column=Institution.name, operators=SEARCH_OPERATORS)}
+
+sortingRelatedFieldsMap = {"name": SortingRelatedField(join=None, column=Institution.name)}
+
+class InstitutionRepository(CRUDRepository[Institution]):
+    def __init__(self):
+        super().__init__(
+            Institution,
+            filter_callback=apply_filters_wrapper(apply_institution_filters, filterRelatedFieldsMap),
+            sorting_callback=apply_sorting_wrapper(apply_sorting, sortingRelatedFieldsMap),
+        )
+
+    async def delete(self, id_: int, database: AsyncSession) -> int:
+        # The delete cascades to the institution's equipment with their requests, to
+        # the spare parts used from its stock by other institutions' requests and to
+        # its stock locations.
+        days = await lock_equipment_request_days(database, Equipment.institution_id == id_)
+        days += await get_request_days(
+            database,
+            RepairRequest.id.in_(select(UsedSparePart.repair_request_id).where(UsedSparePart.institution_id == id_)),
+        )
+        spare_part_ids = (await database.execute(select(Location.spare_part_id).where(Location.institution_id == id_))).scalars().all()
+        previous = await lock_stock(database, spare_part_ids, [(spare_part_id, id_) for spare_part_id in spare_part_ids])
+
+        result = await database.execute(delete(Institution).where(Institution.id == id_))
+        if result.rowcount == 0:
+            raise DomainError(code=DomainErrorCode.not_entity, field="")
+
+        await record_movements(database, {key: -quantity for key, quantity in previous.items()}, StockMovementReason.deletion)
+        await refresh_days(database, days)
+        await refresh_stock(database, spare_part_ids)
+        await database.commit()
+        count_cache.clear()
+        statistics_cache.clear()
+        return id_
@@ -1,9 +1,14 @@
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 from src.database import BaseDatabaseModel
+from src.search import trigram_index
 
 
 class Institution(BaseDatabaseModel):
     __tablename__ = "institution"
+    __table_args__ = (
+        trigram_index("ix_institution_name_trgm", "name"),
+        trigram_index("ix_institution_address_trgm", "address"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(unique=True)
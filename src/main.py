@@ -13,8 +13,12 @@ import src.auth.models as auth_models
 import src.auth.schemas as auth_schemas
 
 from src.mailer.subscriber import on_low_stock, on_repair_request_created # need
-from src.middlewares import error_handler, validation_exception_handler
+from src.fieldsets import InvalidFieldsError
+from src.filter_dsl import InvalidFilterError
+from src.pagination import InvalidCursorError
+from src.middlewares import error_handler, validation_exception_handler, invalid_filter_exception_handler, invalid_fields_exception_handler, invalid_cursor_exception_handler
 
+from src.responses import ORJSONResponse
 from src.router import router
 
 @asynccontextmanager
@@ -37,11 +41,14 @@ async def lifespan(_: FastAPI):
         await auth_service.create_if_not_exists(data=superuser.model_dump(exclude_none=True), database=session)
     yield
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 app.include_router(router)
 
 app.middleware("http")(error_handler)
 app.exception_handler(RequestValidationError)(validation_exception_handler)
+app.exception_handler(InvalidFilterError)(invalid_filter_exception_handler)
+app.exception_handler(InvalidFieldsError)(invalid_fields_exception_handler)
+app.exception_handler(InvalidCursorError)(invalid_cursor_exception_handler)
 
 app.add_middleware(
     CORSMiddleware,
@@ -1,4 +1,3 @@
-import json
 from typing import Annotated
 
 from fastapi import APIRouter
@@ -26,10 +25,12 @@ async def get_manufacturer_list_endpoint(
         pagination: Pagination = Depends(),
         sorting: Sorting = Depends(),
         filters: str | None = Query(None),
+        fields: str | None = Query(None),
 ) -> PaginationResponse[ManufacturerInfo]:
     return await services.paginate(
         database=database,
-        filters=json.loads(filters) if filters else None,
+        filters=services.parse_filters(filters),
+        fields=services.parse_fields(fields),
         pagination=pagination,
         sorting=None if sorting.sort_by == "" else sorting,
     )
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+
+
+class CacheCounters(BaseModel):
+    hits: int
+    misses: int
+    size: int
+
+class CompiledCacheCounters(BaseModel):
+    hits: int
+    misses: int
+    uncached: int
+
+class StatementCacheMetrics(BaseModel):
+    statements: CacheCounters
+    compiled: CompiledCacheCounters
+
+class ResultCacheMetrics(BaseModel):
+    hits: int
+    misses: int
+    size: int
+    hit_ratio: float
@@ -0,0 +1,19 @@
+from typing import Annotated
+
+from fastapi import APIRouter
+from fastapi.params import Depends
+
+from src.auth.dependencies import allowed
+from src.auth.schemas import Role
+from src.metrics.models import StatementCacheMetrics, ResultCacheMetrics
+from src.metrics.services import MetricsServices
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("/statement-cache", response_model=StatementCacheMetrics)
+async def get_statement_cache_metrics_endpoint(_: Annotated[None, Depends(allowed(role=Role.manager))]) -> StatementCacheMetrics:
+    return MetricsServices.get_statement_cache()
+
+@router.get("/statistics-cache", response_model=ResultCacheMetrics)
+async def get_statistics_cache_metrics_endpoint(_: Annotated[None, Depends(allowed(role=Role.manager))]) -> ResultCacheMetrics:
+    return MetricsServices.get_statistics_cache()
@@ -0,0 +1,35 @@
+from src.cache import TTLCache
+from src.metrics.models import StatementCacheMetrics, CacheCounters, CompiledCacheCounters, ResultCacheMetrics
+from src.statement_cache import statement_cache, compiled_cache_counter
+from src.statistics.cache import statistics_cache
+
+
+class MetricsServices:
+    @staticmethod
+    def get_statement_cache() -> StatementCacheMetrics:
+        return StatementCacheMetrics(
+            statements=CacheCounters(
+                hits=statement_cache.hits,
+                misses=statement_cache.misses,
+                size=len(statement_cache.entries),
+            ),
+            compiled=CompiledCacheCounters(
+                hits=compiled_cache_counter.hits,
+                misses=compiled_cache_counter.misses,
+                uncached=compiled_cache_counter.uncached,
+            ),
+        )
+
+    @staticmethod
+    def get_statistics_cache() -> ResultCacheMetrics:
+        return MetricsServices.get_result_cache(statistics_cache)
+
+    @staticmethod
+    def get_result_cache(cache: TTLCache) -> ResultCacheMetrics:
+        lookups = cache.hits + cache.misses
+        return ResultCacheMetrics(
+            hits=cache.hits,
+            misses=cache.misses,
+            size=len(cache),
+            hit_ratio=cache.hits / lookups if lookups else 0.0,
+        )
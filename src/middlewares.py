@@ -3,6 +3,9 @@ from fastapi.exceptions import RequestValidationError
 from starlette.responses import JSONResponse
 
 from src.exceptions import ErrorMap, ApiErrorCode, ApiError, DomainErrorCode
+from src.fieldsets import InvalidFieldsError
+from src.filter_dsl import InvalidFilterError
+from src.pagination import InvalidCursorError
 
 Pydantic_ERROR_MAP = {
     "value_error.contact_email": ErrorMap(code=ApiErrorCode.invalid_email_format, message="Невалідний формат email"),
@@ -36,3 +39,24 @@ async def validation_exception_handler(_: Request, exc: RequestValidationError):
     mapper = Pydantic_ERROR_MAP.get(key, Pydantic_ERROR_MAP[""])
     return JSONResponse(status_code=422, content={"code": mapper.code, "message": mapper.message})
 
+async def invalid_filter_exception_handler(_: Request, exc: InvalidFilterError):
+    return JSONResponse(status_code=422, content={
+        "code": ApiErrorCode.invalid_value,
+        "message": "Невалідний фільтр",
+        "fields": exc.field,
+    })
+
+async def invalid_fields_exception_handler(_: Request, exc: InvalidFieldsError):
+    return JSONResponse(status_code=422, content={
+        "code": ApiErrorCode.invalid_value,
+        "message": "Невалідні поля",
+        "fields": exc.field,
+    })
+
+
+async def invalid_cursor_exception_handler(_: Request, exc: InvalidCursorError):
+    return JSONResponse(status_code=422, content={
+        "code": ApiErrorCode.invalid_value,
+        "message": "Невалідний курсор",
+        "fields": exc.field,
+    })
\ No newline at end of file
@@ -1,10 +1,30 @@
-from typing import TypeVar, Generic
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from enum import Enum
+from typing import TypeVar, Generic, Any, NamedTuple
+
 from pydantic import BaseModel
+from sqlalchemy import ColumnElement, and_, or_, false
+
+
+class PaginationMode(str, Enum):
+    offset = "offset"
+    cursor = "cursor"
 
+class TotalMode(str, Enum):
+    exact = "exact"
+    estimate = "estimate"
+    none = "none"
 
 class Pagination(BaseModel):
     page: int = 1
     limit: int = 8
+    mode: PaginationMode = PaginationMode.offset
+    cursor: str | None = None
+    total: TotalMode = TotalMode.exact
 
     @property
     def offset(self) -> int:
@@ -14,8 +34,98 @@ ItemModelType = TypeVar("ItemModelType", bound=BaseModel)
 class PaginationResponse(BaseModel, Generic[ItemModelType]):
     page: int
     limit: int
-    total: int
-    pages: int
+    total: int | None
+    pages: int | None
     items: list[ItemModelType]
     has_next: bool
     has_prev: bool
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+KeysetKey = tuple[ColumnElement, bool]
+
+class InvalidCursorError(ValueError):
+    def __init__(self, message: str, field: str | None = "cursor"):
+        super().__init__(message)
+        self.field = field
+
+class Cursor(NamedTuple):
+    values: list[Any]
+    backwards: bool = False
+
+def encode_cursor(values: list[Any], backwards: bool = False) -> str:
+    def default(value: Any) -> Any:
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return str(value)
+
+    raw = json.dumps({"v": values, "b": backwards}, default=default, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, keys: list[KeysetKey]) -> Cursor:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        values, backwards = raw["v"], bool(raw["b"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, KeyError):
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'")
+
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursorError(f"Invalid cursor '{cursor}'")
+
+    return Cursor(values=[cast_cursor_value(column, value) for (column, _), value in zip(keys, values)], backwards=backwards)
+
+def cast_cursor_value(column: ColumnElement, value: Any) -> Any:
+    if value is None:
+        return None
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+
+    try:
+        if issubclass(python_type, datetime):
+            return datetime.fromisoformat(value)
+        if issubclass(python_type, date):
+            return date.fromisoformat(value)
+        if issubclass(python_type, Enum):
+            return python_type(value)
+        if issubclass(python_type, Decimal):
+            return Decimal(str(value))
+    except (ValueError, TypeError, InvalidOperation):
+        raise InvalidCursorError(f"Invalid cursor value '{value}'")
+
+    # The driver would reject a mismatched type only once the query runs.
+    if python_type is float and isinstance(value, int) and not isinstance(value, bool):
+        return float(value)
+    if python_type in (int, float, str, bool) and type(value) is not python_type:
+        raise InvalidCursorError(f"Invalid cursor value '{value}'")
+
+    return value
+
+def keyset_condition(keys: list[KeysetKey], values: list[Any]) -> ColumnElement:
+    # Rows strictly after `values` in the (column, descending) order, assuming
+    # Postgres defaults: NULLS LAST for ascending and NULLS FIRST for descending.
+    conditions = []
+    for i, (column, descending) in enumerate(keys):
+        value = values[i]
+        nullable = getattr(column, "nullable", False)
+
+        if value is None:
+            after = column.is_not(None) if descending else None
+        elif descending:
+            after = column < value
+        else:
+            after = or_(column > value, column.is_(None)) if nullable else column > value
+
+        if after is None:
+            continue
+
+        equals = [
+            prev_column.is_(None) if prev_value is None else prev_column == prev_value
+            for (prev_column, _), prev_value in zip(keys[:i], values[:i])
+        ]
+        conditions.append(and_(*equals, after))
+
+    return or_(*conditions) if conditions else false()
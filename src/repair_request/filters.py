@@ -3,37 +3,36 @@ from sqlalchemy.orm import aliased
 
 from src.equipment.schemas import Equipment
 from src.equipment_model.schemas import EquipmentModel
-from src.filters import apply_filters, FilterRelatedFieldsMap, Filters, get_filter_value
+from src.filters import apply_filters, FilterRelatedFieldsMap, FilterPlan, condition_clause
 from src.repair_request.schemas import RepairRequest
+from src.search import contains
 
 
-def apply_repair_request_filters(stmt: Select, filters: Filters, related_fields: FilterRelatedFieldsMap) -> Select:
-    or_conditions = get_filter_value(filters.get("equipment_serial_number_or_equipment_equipment_model_name", None))
-    equipment_category_id = get_filter_value(filters.get("equipment_category_id", None))
-    equipment_institution_id = get_filter_value(filters.get("equipment_institution_id", None))
+def apply_repair_request_filters(stmt: Select, filters: FilterPlan, related_fields: FilterRelatedFieldsMap) -> Select:
+    search = filters.condition("equipment_serial_number_or_equipment_equipment_model_name")
+    equipment_category_id = filters.condition("equipment_category_id")
+    equipment_institution_id = filters.condition("equipment_institution_id")
 
     stmt = apply_filters(stmt, filters, related_fields)
-    if or_conditions:
-        stmt = (
-            stmt
-            .join(Equipment, Equipment.id == RepairRequest.equipment_id)
-            .join(EquipmentModel, EquipmentModel.id == Equipment.equipment_model_id)
-            .where(
-                or_(
-                    Equipment.serial_number.ilike(f"%{or_conditions}%"),
-                    EquipmentModel.name.ilike(f"%{or_conditions}%")
-                )
+    if search is not None and search.value:
+        matching_equipment = select(Equipment.id).where(
+            or_(
+                contains(Equipment.serial_number, search.value),
+                Equipment.equipment_model_id.in_(
+                    select(EquipmentModel.id).where(contains(EquipmentModel.name, search.value))
+                ),
             )
         )
+        stmt = stmt.where(RepairRequest.equipment_id.in_(matching_equipment))
 
     equipment_alias = aliased(Equipment)
-    if equipment_institution_id or equipment_category_id:
+    if equipment_institution_id is not None or equipment_category_id is not None:
         stmt = stmt.join(equipment_alias, equipment_alias.id == RepairRequest.equipment_id)
 
-    if equipment_institution_id:
-        stmt = stmt.where(equipment_alias.institution_id == equipment_institution_id)
+    if equipment_institution_id is not None:
+        stmt = stmt.where(condition_clause(equipment_institution_id, equipment_alias.institution_id))
 
-    if equipment_category_id:
-        stmt = stmt.where(equipment_alias.equipment_category_id == equipment_category_id)
+    if equipment_category_id is not None:
+        stmt = stmt.where(condition_clause(equipment_category_id, equipment_alias.equipment_category_id))
 
     return stmt
@@ -7,20 +7,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
 from src.auth.schemas import User
-from src.decorators import integrity_errors
+from src.decorators import integrity_errors, serialization_retries
 from src.equipment.schemas import Equipment
+from src.equipment.status import refresh_equipment_status
 from src.equipment_category.schemas import EquipmentCategory
 from src.exceptions import DomainError, DomainErrorCode
-from src.failure_type.schemas import FailureType, FailureTypeRepairRequest
-from src.filters import FilterRelatedField, apply_filters_wrapper
+from src.failure_type.schemas import FailureType
+from src.filters import FilterRelatedField, FilterCustomField, SEARCH_OPERATORS, apply_filters_wrapper
 from src.repair_request.filters import apply_repair_request_filters
 from src.repair_request.models import RepairRequestUpdate
 from src.repair_request.schemas import RepairRequest, RepairRequestStatus, File, RepairRequestStatusRecord, UsedSparePart
 from src.repair_request.sorting import apply_repair_request_sorting
-from src.repository import CRUDRepository
+from src.repository import CRUDRepository, sync_association, count_cache
 from src.sorting import SortingRelatedField, apply_sorting_wrapper
-from src.spare_part.schemas import Location
-from src.utils import build_relation
+from src.statistics.cache import statistics_cache
+from src.spare_part.schemas import StockMovementReason
+from src.spare_part.stock import refresh_stock, apply_location_deltas
+from src.statistics.rollup import refresh_repair_request_day, get_repair_request_day, refresh_daily_stats
 
 
 filter_related_fields_map = {
@@ -29,9 +32,9 @@ filter_related_fields_map = {
     "equipment_id": FilterRelatedField(column=RepairRequest.equipment_id),
     "urgency": FilterRelatedField(column=RepairRequest.urgency),
 
-    "equipment_category_id": None,
-    "equipment_institution_id": None,
-    "equipment_serial_number_or_equipment_equipment_model_name": None,
+    "equipment_category_id": FilterCustomField(column=Equipment.equipment_category_id),
+    "equipment_institution_id": FilterCustomField(column=Equipment.institution_id),
+    "equipment_serial_number_or_equipment_equipment_model_name": FilterCustomField(column=Equipment.serial_number, operators=SEARCH_OPERATORS),
 }
 
 sorting_related_fields_map = {
@@ -66,6 +69,7 @@ class RepairRequestRepository(CRUDRepository[RepairRequest]):
             created_at=func.now(),
             last_status=RepairRequestStatus.not_taken
         ).returning(RepairRequest.id))).scalar()
+        await refresh_equipment_status(database, [data.get("equipment_id")])
 
         await database.execute(insert(RepairRequestStatusRecord).values(
             repair_request_id=row_id,
@@ -79,14 +83,14 @@ class RepairRequestRepository(CRUDRepository[RepairRequest]):
             for new_filename in new_filenames:
                 await database.execute(insert(File).values(repair_request_id=row_id, file_path=new_filename))
 
+        await refresh_repair_request_day(database, row_id)
         await database.commit()
-
-        options = build_relation(RepairRequest, preloads)
-        stmt = (select(RepairRequest).options(*options).where(RepairRequest.id == row_id))
-        result = await database.execute(stmt)
-        return result.scalars().first()
+        statistics_cache.clear()
+        count_cache.clear()
+        return await self.get(row_id, database, preloads)
 
     @integrity_errors()
+    @serialization_retries()
     async def update(self, id_: int, data: dict, database: AsyncSession, preloads: list[str] | None = None) -> RepairRequest:
         data_model = RepairRequestUpdate.model_validate(data)
 
@@ -102,12 +106,7 @@ class RepairRequestRepository(CRUDRepository[RepairRequest]):
             raise DomainError(code=DomainErrorCode.not_entity)
 
         if data_model.failure_types_ids:
-            await database.execute(delete(FailureTypeRepairRequest).where(FailureTypeRepairRequest.repair_request_id == id_))
-            for failure_type_id in data_model.failure_types_ids:
-                await database.execute(insert(FailureTypeRepairRequest).values(
-                    repair_request_id=id_,
-                    failure_type_id=failure_type_id,
-                ))
+            await sync_association(database, RepairRequest.failure_types.property, id_, data_model.failure_types_ids)
 
         if data_model.status_history:
             await database.execute(insert(RepairRequestStatusRecord).values(
@@ -117,78 +116,60 @@ class RepairRequestRepository(CRUDRepository[RepairRequest]):
                 status=data_model.status_history.status,
             ))
             completed_at = func.now() if data_model.status_history.status == RepairRequestStatus.finished else None
-            await database.execute(update(RepairRequest).where(RepairRequest.id == id_).values(
+            equipment_id = (await database.execute(update(RepairRequest).where(RepairRequest.id == id_).values(
                 last_status=data_model.status_history.status,
                 completed_at=completed_at
-            ))
+            ).returning(RepairRequest.equipment_id))).scalar()
+            await refresh_equipment_status(database, [equipment_id])
 
         if data_model.used_spare_parts is not None:
-            used_spare_parts = (await database.execute(select(UsedSparePart).where(UsedSparePart.repair_request_id == id_))).scalars().all()
-            old_parts = {(usp.spare_part_id, usp.institution_id): usp for usp in used_spare_parts}
-            new_parts = {(usp.spare_part_id, usp.institution_id): usp for usp in data_model.used_spare_parts}
-
-            for key, old_usp in old_parts.items():
-                spare_part_id, institution_id = key
-                old_qty = old_usp.quantity
-                new_qty = new_parts.get(key, None).quantity if key in new_parts else 0
-                diff = old_qty - new_qty
-
-                if diff > 0:
-                    stmt = insert(Location).values(
-                        spare_part_id=spare_part_id,
-                        institution_id=institution_id,
-                        quantity=diff
-                    ).on_conflict_do_update(
-                        index_elements=[
-                            Location.spare_part_id,
-                            Location.institution_id,
-                        ],
-                        set_={
-                            "quantity": Location.quantity + diff,
-                        }
-                    )
-                    await database.execute(stmt)
-
-
-            for key, new_usp in new_parts.items():
-                spare_part_id, institution_id = key
-                old_qty = old_parts.get(key).quantity if key in old_parts else 0
-                diff = new_usp.quantity - old_qty
-
-                if diff > 0:
-                    stmt = insert(Location).values(
-                        spare_part_id=spare_part_id,
-                        institution_id=institution_id,
-                        quantity=diff
-                    ).on_conflict_do_update(
-                        index_elements=[
-                            Location.spare_part_id,
-                            Location.institution_id,
-                        ],
-                        set_={
-                            "quantity": Location.quantity - diff,
-                        }
-                    ).returning(Location.id, Location.quantity)
-                    row = (await database.execute(stmt)).first()
-                    if row is not None and row.quantity == 0:
-                        await database.execute(delete(Location).where(Location.id == row.id))
-
-            await database.execute(delete(UsedSparePart).where(UsedSparePart.repair_request_id == id_))
-            for usp in data_model.used_spare_parts:
-                await database.execute(insert(UsedSparePart).values(
-                    repair_request_id=id_,
-                    spare_part_id=usp.spare_part_id,
-                    institution_id=usp.institution_id,
-                    quantity=usp.quantity,
-                    note=usp.note,
-                ))
+            used_spare_parts = (await database.execute(
+                delete(UsedSparePart)
+                .where(UsedSparePart.repair_request_id == id_)
+                .returning(UsedSparePart.spare_part_id, UsedSparePart.institution_id, UsedSparePart.quantity)
+            )).all()
+            if data_model.used_spare_parts:
+                await database.execute(insert(UsedSparePart).values([
+                    {
+                        "repair_request_id": id_,
+                        "spare_part_id": usp.spare_part_id,
+                        "institution_id": usp.institution_id,
+                        "quantity": usp.quantity,
+                        "note": usp.note,
+                    }
+                    for usp in data_model.used_spare_parts
+                ]))
+
+            # Parts given back return to their location, newly used ones are taken from it.
+            old_parts = {(usp.spare_part_id, usp.institution_id): usp.quantity for usp in used_spare_parts}
+            new_parts = {(usp.spare_part_id, usp.institution_id): usp.quantity for usp in data_model.used_spare_parts}
+            await apply_location_deltas(
+                database,
+                {key: old_parts.get(key, 0) - new_parts.get(key, 0) for key in old_parts.keys() | new_parts.keys()},
+                StockMovementReason.used_spare_part,
+                repair_request_id=id_,
+            )
 
-        await database.commit()
+            await refresh_stock(database, [spare_part_id for spare_part_id, _ in old_parts.keys() | new_parts.keys()])
 
-        options = build_relation(RepairRequest, preloads)
-        stmt = select(RepairRequest).options(*options).where(RepairRequest.id == id_)
-        result = await database.execute(stmt)
-        return result.scalars().first()
+        await refresh_repair_request_day(database, id_)
+        await database.commit()
+        statistics_cache.clear()
+        count_cache.clear()
+        return await self.get(id_, database, preloads)
+
+    async def delete(self, id_: int, database: AsyncSession) -> int:
+        day = await get_repair_request_day(database, id_)
+        row = (await database.execute(delete(RepairRequest).where(RepairRequest.id == id_).returning(RepairRequest.equipment_id))).first()
+        if row is None:
+            raise DomainError(code=DomainErrorCode.not_entity, field="")
+
+        await refresh_equipment_status(database, [row.equipment_id])
+        await refresh_daily_stats(database, day, day)
+        await database.commit()
+        statistics_cache.clear()
+        count_cache.clear()
+        return id_
 
 class FileRepository(CRUDRepository[File]):
     def __init__(self):
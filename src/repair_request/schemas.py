@@ -1,10 +1,11 @@
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, DateTime, func
+from sqlalchemy import ForeignKey, DateTime, func, Index
 from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from src.database import BaseDatabaseModel
+from src.search import trigram_index
 from src.failure_type.schemas import FailureType, FailureTypeRepairRequest
 
 
@@ -42,6 +43,9 @@ class File(BaseDatabaseModel):
 
 class UsedSparePart(BaseDatabaseModel):
     __tablename__ = "used_spare_part"
+    __table_args__ = (
+        Index("ix_used_spare_part_repair_request_id", "repair_request_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     quantity: Mapped[int] = mapped_column()
@@ -59,6 +63,11 @@ class UsedSparePart(BaseDatabaseModel):
 
 class RepairRequest(BaseDatabaseModel):
     __tablename__ = "repair_request"
+    __table_args__ = (
+        trigram_index("ix_repair_request_issue_trgm", "issue"),
+        Index("ix_repair_request_created_at", "created_at"),
+        Index("ix_repair_request_equipment_id_created_at", "equipment_id", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     issue: Mapped[str] = mapped_column()
@@ -1,21 +1,23 @@
 import uuid
 import os
-from math import ceil
 from typing import Any
 
 import magic
 
-from fastapi import UploadFile, BackgroundTasks
+from fastapi import UploadFile, BackgroundTasks, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.repository import AuthRepository
 from src.exceptions import DomainError, DomainErrorCode
+from src.conversion import to_models, to_model
+from src.fieldsets import build_fields_model, fields_response
+from src.filter_dsl import FilterPlan
 from src.sorting import Sorting
 from src.auth.schemas import User
 from src.event import emit, EventTypes
 from src.mailer.smtp import MailerService
 from src.mailer.models import RepairRequestCreatedMessagePayload
-from src.pagination import Pagination, PaginationResponse
+from src.pagination import Pagination, PaginationResponse, PaginationMode
 from src.repair_request.models import RepairRequestInfo, RepairRequestUpdate
 from src.repair_request.repository import RepairRequestRepository, FileRepository
 from src.repair_request.schemas import RepairRequest, File
@@ -23,6 +25,7 @@ from src.repository import CRUDRepository
 from src.services import GenericServices
 from src.spare_part.repository import SparePartRepository
 from src.spare_part.services import SparePartServices
+from src.summary.services import summary_cache
 
 ALLOWED_PHOTO_EXTENSIONS = {"jpg", "jpeg", "png", "webp", "bmp", "gif", "tiff", "tif"}
 ALLOWED_PHOTO_MIME = {"image/jpeg", "image/png", "image/webp", "image/gif"}
@@ -31,6 +34,8 @@ def form_url_to_file(static_dir: str, filename: str) -> str:
     return os.path.join(static_dir, filename)
 
 class RepairRequestServices(GenericServices[RepairRequest, RepairRequestInfo]):
+    caches = (summary_cache,)
+
     def __init__(self, proxy_url_to_static_files_dir: str, static_files_dir: str):
         super().__init__(RepairRequestRepository(), RepairRequestInfo)
         self.spare_parts_services = SparePartServices()
@@ -44,10 +49,11 @@ class RepairRequestServices(GenericServices[RepairRequest, RepairRequestInfo]):
             self,
             database: AsyncSession,
             pagination: Pagination,
-            filters: dict[str, Any] | Any = None,
+            filters: FilterPlan | None = None,
             sorting: Sorting | None = None,
             preloads: list[str] | None = None,
-    ) -> PaginationResponse[RepairRequestInfo]:
+            fields: tuple[str, ...] | None = None,
+    ) -> PaginationResponse[RepairRequestInfo] | Response:
         result = await self.repo.fetch(
             database=database,
             limit=pagination.limit,
@@ -55,23 +61,21 @@ class RepairRequestServices(GenericServices[RepairRequest, RepairRequestInfo]):
             filters=filters,
             sorting=sorting,
             preloads=preloads,
+            keyset=pagination.mode == PaginationMode.cursor,
+            cursor=pagination.cursor,
+            total_mode=pagination.total,
+            fields=fields,
         )
 
-        models = [self.return_type.model_validate(x.__dict__, from_attributes=True) for x in result[0]]
+        return_type = build_fields_model(self.return_type, fields) if fields else self.return_type
+        models = to_models(return_type, result.items)
         for model in models:
-            for photo in model.photos:
+            for photo in getattr(model, "photos", None) or []:
                 photo.file_path = form_url_to_file(self.proxy_url_to_static_files_dir, photo.file_path)
 
-        total_pages = max(1, ceil(result[1] / pagination.limit))
-        return PaginationResponse.model_validate({
-            "items": models,
-            "total": result[1],
-            "page": pagination.page,
-            "pages": total_pages,
-            "limit": pagination.limit,
-            "has_next": pagination.page < total_pages,
-            "has_prev": pagination.page > 1,
-        })
+        if fields:
+            return fields_response(self.build_pagination_response(models, result, pagination, return_type))
+        return self.build_pagination_response(models, result, pagination, return_type)
 
     async def create(
             self,
@@ -120,8 +124,9 @@ class RepairRequestServices(GenericServices[RepairRequest, RepairRequestInfo]):
             preloads=preloads,
             validate_photos_callback=validate_photos,
         )
+        self.invalidate_caches()
 
-        repair_request = RepairRequestInfo.model_validate(repair_request_obj.__dict__, from_attributes=True)
+        repair_request = to_model(RepairRequestInfo, repair_request_obj)
         for photo in repair_request.photos:
             photo.file_path = form_url_to_file(self.proxy_url_to_static_files_dir, photo.file_path)
 
@@ -166,6 +171,7 @@ class RepairRequestServices(GenericServices[RepairRequest, RepairRequestInfo]):
             database=database,
             preloads=preloads,
         )
+        self.invalidate_caches()
 
         if model.used_spare_parts:
             spare_part_ids = [x.spare_part_id for x in model.used_spare_parts]
@@ -1,19 +1,39 @@
-from typing import Generic, TypeVar, Type
+from typing import Generic, TypeVar, Type, NamedTuple
 
-from sqlalchemy import select, func, inspect, insert, delete, update, distinct
+from sqlalchemy import select, func, inspect, delete, update, distinct, bindparam, Select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import RelationshipProperty, load_only
 
-from src.sorting import Sorting, apply_sorting_wrapper, apply_sorting
+from src.cache import TTLCache
+from src.pagination import decode_cursor, encode_cursor, keyset_condition, TotalMode
+from src.sorting import Sorting, apply_sorting_wrapper, apply_sorting, get_sorting_keys
 from src.decorators import integrity_errors
+from src.fieldsets import build_projection
 from src.exceptions import DomainError, DomainErrorCode
 from src.filters import apply_filters, apply_filters_wrapper
 from src.sorting import SortingCallback
-from src.utils import build_relation
+from src.statement_cache import statement_cache
+from src.utils import build_relation, estimate_rows
 from src.filters import FilterCallback, Filters
+from src.filter_dsl import FilterPlan
 
 
 ModelType = TypeVar("ModelType")
 
+# Planner estimates are only trusted for large results, small ones are cheap to count exactly.
+ESTIMATE_EXACT_THRESHOLD = 1000
+# Exact counts behind `total=estimate`, cleared after every write since a write can
+# cascade into other tables.
+count_cache: TTLCache[tuple[str, str], int] = TTLCache(ttl=30)
+
+class FetchResult(NamedTuple, Generic[ModelType]):
+    items: list[ModelType]
+    total: int | None
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    has_next: bool | None = None
+
 class CRUDRepository(Generic[ModelType]):
     def __init__(
             self,
@@ -28,42 +48,139 @@ class CRUDRepository(Generic[ModelType]):
     async def fetch(
             self,
             database: AsyncSession,
-            filters: Filters | None = None,
+            filters: FilterPlan | Filters | None = None,
             preloads: list[str] | None = None,
             sorting: Sorting | None = None,
             offset: int | None = None,
             limit: int | None = None,
-    ) -> tuple[list[ModelType], int]:
-        filters = filters or {}
+            keyset: bool = False,
+            cursor: str | None = None,
+            total_mode: TotalMode = TotalMode.exact,
+            fields: tuple[str, ...] | None = None,
+    ) -> FetchResult[ModelType]:
+        filters = self.parse_filters(filters)
         preloads = preloads or []
 
-        stmt = select(self.model)
+        # Sorting and preloads carry no values, so their part of the statement is built once per shape.
+        # The filter shape (keys and operators) is deliberately not part of the key: the custom filter
+        # callbacks branch on values (`isnull`, empty lists, search terms), so a statement cached per
+        # shape could carry the wrong SQL. Filters are applied on top instead, their values become bound
+        # parameters and SQLAlchemy's compiled cache reuses the SQL string per filter shape
+        # (`compiled_cache_counter` reports it).
+        sorting_key = (sorting.sort_by, sorting.sort_order) if sorting else None
+        stmt = statement_cache.get_or_build(
+            ("fetch", self.model, sorting_key, tuple(preloads), fields),
+            lambda: self.build_fetch_statement(sorting, preloads, fields),
+        )
         stmt = self.filter_callback(stmt, filters)
 
+        total = await self.count(database, filters, total_mode)
+
+        if keyset and limit is not None and limit != -1:
+            return await self.fetch_keyset(database, stmt, total, limit, cursor)
+
+        # Without an exact total has_next is detected by reading one extra row.
+        probe_next = total_mode != TotalMode.exact and limit is not None and limit != -1
+        if limit is not None and limit != -1:
+            stmt = stmt.offset(offset or 0).limit(limit + 1 if probe_next else limit)
+
+        result = await database.execute(stmt)
+        items = list(result.unique().scalars().all())
+
+        if probe_next:
+            return FetchResult(items[:limit], total, has_next=len(items) > limit)
+
+        return FetchResult(items, total)
+
+    def build_fetch_statement(self, sorting: Sorting | None, preloads: list[str], fields: tuple[str, ...] | None = None) -> Select:
+        stmt = select(self.model)
+        if fields:
+            columns, preloads = build_projection(self.model, fields, preloads)
+            stmt = stmt.options(load_only(*columns))
+
         if sorting:
             stmt = self.sorting_callback(stmt, sorting)
+            stmt = stmt.order_by(self.model.id)
 
         if preloads:
             options = build_relation(self.model, preloads)
             stmt = stmt.options(*options)
 
+        return stmt
+
+    def parse_filters(self, filters: FilterPlan | Filters | str | None) -> FilterPlan:
+        return self.filter_callback.parser.parse(filters)
+
+    async def count(self, database: AsyncSession, filters: FilterPlan, total_mode: TotalMode = TotalMode.exact) -> int | None:
+        if total_mode == TotalMode.none:
+            return None
+
+        cache_key = (self.model.__tablename__, filters.canonical)
+        if total_mode == TotalMode.estimate:
+            estimate_stmt = self.filter_callback(select(self.model.id).select_from(self.model), filters)
+            estimate = await estimate_rows(estimate_stmt, database)
+            if estimate is not None and estimate >= ESTIMATE_EXACT_THRESHOLD:
+                return estimate
+
+            cached = count_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         count_stmt = select(func.count(distinct(self.model.id))).select_from(self.model)
         count_stmt = self.filter_callback(count_stmt, filters)
-
         total = (await database.execute(count_stmt)).scalar() or 0
 
-        if limit is not None and limit != -1:
-            stmt = stmt.offset(offset or 0).limit(limit)
+        if total_mode == TotalMode.estimate:
+            count_cache.set(cache_key, total)
 
-        result = await database.execute(stmt)
-        items = result.unique().scalars().all()
+        return total
+
+    async def fetch_keyset(self, database: AsyncSession, stmt, total: int | None, limit: int, cursor: str | None) -> FetchResult[ModelType]:
+        keys = get_sorting_keys(stmt, self.model.id)
+        position = decode_cursor(cursor, keys) if cursor else None
+        backwards = position is not None and position.backwards
+
+        # Walking backwards reads the page in reversed order and flips it afterwards.
+        keys_order = [(column, descending != backwards) for column, descending in keys]
+        stmt = stmt.order_by(None).order_by(*[column.desc() if descending else column.asc() for column, descending in keys_order])
+        if position is not None:
+            stmt = stmt.where(keyset_condition(keys_order, position.values))
+
+        stmt = stmt.add_columns(*[column.label(f"keyset_{i}") for i, (column, _) in enumerate(keys)]).limit(limit + 1)
+        rows = (await database.execute(stmt)).unique().all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        if backwards:
+            rows.reverse()
 
-        return list(items), total
+        items = [row[0] for row in rows]
+        if not rows:
+            return FetchResult(items, total)
+
+        first_values, last_values = list(rows[0][1:]), list(rows[-1][1:])
+        has_next = has_more if not backwards else True
+        has_prev = position is not None if not backwards else has_more
+
+        return FetchResult(
+            items,
+            total,
+            next_cursor=encode_cursor(last_values) if has_next else None,
+            prev_cursor=encode_cursor(first_values, backwards=True) if has_prev else None,
+        )
 
     async def get(self, id_: int, database: AsyncSession, preloads: list[str] | None = None) -> ModelType:
-        options = build_relation(self.model, preloads or [])
-        stmt = select(self.model).options(*options).where(self.model.id == id_)
-        obj = (await database.execute(stmt)).unique().scalars().first()
+        preloads = preloads or []
+        stmt = statement_cache.get_or_build(
+            ("get", self.model, tuple(preloads)),
+            lambda: (
+                select(self.model)
+                .options(*build_relation(self.model, preloads))
+                .where(self.model.id == bindparam("id_"))
+                .execution_options(populate_existing=True)
+            ),
+        )
+        obj = (await database.execute(stmt, {"id_": id_})).unique().scalars().first()
 
         if obj is None:
             raise DomainError(code=DomainErrorCode.not_entity)
@@ -73,64 +190,53 @@ class CRUDRepository(Generic[ModelType]):
     @integrity_errors()
     async def create(self, data: dict, database: AsyncSession, preloads: list[str] | None = None) -> ModelType:
         preloads = preloads or []
+        associations = self.pop_associations(data)
 
         obj = self.model(**data)
         database.add(obj)
         await database.flush()
 
-        association_inserts = []
-        for field in inspect(self.model).relationships:
-            if field.secondary is None:
-                continue
-
-            if field.key not in data:
-                continue
-
-            ids = data[field.key]
-            left_col, right_col = list(field.secondary.c)
-
-            association_inserts.extend([
-                {left_col.name: obj.id, right_col.name: related_id} for related_id in ids
-            ])
-
-            if association_inserts:
-                stmt = insert(field.secondary).values(association_inserts)
-                await database.execute(stmt)
+        for field, ids in associations:
+            await sync_association(database, field, obj.id, ids, replace=False)
 
         await database.commit()
+        count_cache.clear()
         return await self.get(obj.id, database, preloads)
 
     @integrity_errors()
     async def update(self, id_: int, data: dict, database: AsyncSession, preloads: list[str] | None = None) -> ModelType:
         preloads = preloads or []
+        associations = self.pop_associations(data)
 
-        rows = await database.execute(update(self.model).where(self.model.id == id_).values(data))
-        if rows.rowcount == 0:
-            raise DomainError(code=DomainErrorCode.not_entity, field="")
-
-        association_inserts = []
-        for field in inspect(self.model).relationships:
-            if field.secondary is not None:
-                continue
-
-            if field.key not in data:
-                continue
-
-            ids = data[field.key]
-            left_col, right_col = list(field.secondary.c)
-            delete_stmt = (delete(field.secondary).where(left_col == id_))
-            await database.execute(delete_stmt)
+        if data:
+            rows = await database.execute(update(self.model).where(self.model.id == id_).values(data))
+            found = rows.rowcount != 0
+        else:
+            found = (await database.execute(select(self.model.id).where(self.model.id == id_))).first() is not None
 
-            association_inserts.extend([{left_col.name: id_, right_col.name: related_id} for related_id in ids])
+        if not found:
+            raise DomainError(code=DomainErrorCode.not_entity, field="")
 
-            if association_inserts:
-                stmt = insert(field.secondary).values(association_inserts)
-                await database.execute(stmt)
+        for field, ids in associations:
+            await sync_association(database, field, id_, ids, replace=True)
 
         await database.commit()
+        count_cache.clear()
 
         return await self.get(id_, database, preloads)
 
+    def pop_associations(self, data: dict) -> list[tuple[RelationshipProperty, list[int]]]:
+        associations = []
+        for field in inspect(self.model).relationships:
+            if field.secondary is None:
+                continue
+
+            for key in (field.key, f"{field.key}_ids"):
+                if key in data:
+                    associations.append((field, data.pop(key)))
+                    break
+
+        return associations
 
     async def delete(self, id_: int, database: AsyncSession) -> int:
         stmt = delete(self.model).where(self.model.id == id_)
@@ -139,5 +245,32 @@ class CRUDRepository(Generic[ModelType]):
             raise DomainError(code=DomainErrorCode.not_entity, field="")
 
         await database.commit()
+        count_cache.clear()
         return id_
 
+async def sync_association(
+        database: AsyncSession,
+        field: RelationshipProperty,
+        owner_id: int,
+        ids: list[int],
+        replace: bool = True,
+) -> None:
+    # One DELETE for the rows that are no longer wanted and one multi-row INSERT
+    # for the rest, regardless of how many ids are passed.
+    (_, owner_column), = field.synchronize_pairs
+    (_, related_column), = field.secondary_synchronize_pairs
+    ids = list(dict.fromkeys(ids))
+
+    if replace:
+        stmt = delete(field.secondary).where(owner_column == owner_id)
+        if ids:
+            stmt = stmt.where(related_column.not_in(ids))
+        await database.execute(stmt)
+
+    if ids:
+        stmt = (
+            insert(field.secondary)
+            .values([{owner_column.name: owner_id, related_column.name: related_id} for related_id in ids])
+            .on_conflict_do_nothing()
+        )
+        await database.execute(stmt)
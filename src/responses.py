@@ -0,0 +1,20 @@
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.encoders import decimal_encoder
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+
+def default(value: Any) -> Any:
+    # orjson handles datetimes, enums and dataclasses itself.
+    if isinstance(value, Decimal):
+        return decimal_encoder(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=default, option=orjson.OPT_NON_STR_KEYS)
@@ -12,6 +12,8 @@ from src.failure_type.router import router as failure_type_router
 from src.summary.router import router as summary_router
 from src.auth.router import router as auth_router
 from src.statistics.router import router as statistics_router
+from src.metrics.router import router as metrics_router
+from src.global_search.router import router as global_search_router
 
 router = APIRouter(prefix="/api")
 
@@ -27,3 +29,5 @@ router.include_router(repair_request_router)
 router.include_router(failure_type_router)
 router.include_router(summary_router)
 router.include_router(statistics_router)
+router.include_router(metrics_router)
+router.include_router(global_search_router)
@@ -0,0 +1,40 @@
+from sqlalchemy import ColumnElement, DDL, Index, event, or_, func, case
+
+from src.database import BaseDatabaseModel
+
+# pg_trgm GIN indexes serve `ILIKE '%term%'` on Postgres. Other dialects run the
+# same predicate without them.
+event.listen(
+    BaseDatabaseModel.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+def trigram_index(name: str, column: str) -> Index:
+    return Index(name, column, postgresql_using="gin", postgresql_ops={column: "gin_trgm_ops"})
+
+def escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def contains(column: ColumnElement, term: str) -> ColumnElement:
+    return column.ilike(f"%{escape_like(str(term))}%", escape="\\")
+
+def contains_any(term: str, *columns: ColumnElement) -> ColumnElement:
+    return or_(*[contains(column, term) for column in columns])
+
+def match_rank(column: ColumnElement, term: str, dialect: str) -> ColumnElement:
+    if dialect == "postgresql":
+        return func.coalesce(func.word_similarity(term, column), 0)
+
+    # Without pg_trgm exact matches rank first, then prefixes, then any other hit.
+    lowered, needle = func.lower(column), term.lower()
+    return case(
+        (lowered == needle, 1.0),
+        (lowered.startswith(needle, autoescape=True), 0.5),
+        else_=0.1,
+    )
+
+def best_rank(dialect: str, *ranks: ColumnElement) -> ColumnElement:
+    if len(ranks) == 1:
+        return ranks[0]
+    return func.greatest(*ranks) if dialect == "postgresql" else func.max(*ranks)
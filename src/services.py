@@ -2,14 +2,22 @@ from math import ceil
 from typing import Generic, TypeVar, Type
 
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
 
+from src.cache import TTLCache
 from src.sorting import Sorting
-from src.pagination import PaginationResponse, Pagination
-from src.repository import CRUDRepository
+from src.pagination import PaginationResponse, Pagination, PaginationMode
+from src.conversion import to_models, to_model
+from src.fieldsets import parse_fields, build_fields_model, fields_response
+from src.filter_dsl import FilterPlan
+from src.repository import CRUDRepository, FetchResult
 
 ModelType = TypeVar("ModelType")
 InfoType = TypeVar("InfoType")
 class GenericServices(Generic[ModelType, InfoType]):
+    # Caches derived from this entity's rows, cleared after every write.
+    caches: tuple[TTLCache, ...] = ()
+
     def __init__(self, repository: CRUDRepository[ModelType], return_type: Type[InfoType]):
         self.repo = repository
         self.return_type = return_type
@@ -18,10 +26,11 @@ class GenericServices(Generic[ModelType, InfoType]):
             self,
             database: AsyncSession,
             pagination: Pagination,
-            filters: str | None = None,
+            filters: FilterPlan | None = None,
             preloads: list[str] | None = None,
             sorting: Sorting | None = None,
-    ) -> PaginationResponse[InfoType]:
+            fields: tuple[str, ...] | None = None,
+    ) -> PaginationResponse[InfoType] | Response:
         result = await self.repo.fetch(
             database=database,
             limit=pagination.limit,
@@ -29,31 +38,69 @@ class GenericServices(Generic[ModelType, InfoType]):
             filters=filters,
             preloads=preloads,
             sorting=sorting,
+            keyset=pagination.mode == PaginationMode.cursor,
+            cursor=pagination.cursor,
+            total_mode=pagination.total,
+            fields=fields,
         )
 
-        models = [self.return_type.model_validate(x.__dict__, from_attributes=True) for x in result[0]]
-        total_pages = max(1, ceil(result[1] / pagination.limit))
-        return PaginationResponse.model_validate({
-            "items": models,
-            "total": result[1],
-            "page": pagination.page,
-            "pages": total_pages,
-            "limit": pagination.limit,
-            "has_next": pagination.page < total_pages,
-            "has_prev": pagination.page > 1,
-        })
+        if fields:
+            fields_type = build_fields_model(self.return_type, fields)
+            models = to_models(fields_type, result.items)
+            return fields_response(self.build_pagination_response(models, result, pagination, fields_type))
+
+        models = to_models(self.return_type, result.items)
+        return self.build_pagination_response(models, result, pagination, self.return_type)
+
+    def parse_filters(self, filters: str | None) -> FilterPlan:
+        return self.repo.parse_filters(filters)
+
+    def parse_fields(self, fields: str | None) -> tuple[str, ...] | None:
+        return parse_fields(fields, self.return_type)
+
+    @staticmethod
+    def build_pagination_response(models: list, result: FetchResult, pagination: Pagination, item_type: type) -> PaginationResponse:
+        total_pages = max(1, ceil(result.total / pagination.limit)) if result.total is not None else None
+        if pagination.mode == PaginationMode.cursor:
+            has_next, has_prev = result.next_cursor is not None, result.prev_cursor is not None
+        elif result.has_next is not None:
+            has_next, has_prev = result.has_next, pagination.page > 1
+        else:
+            has_next, has_prev = pagination.page < total_pages, pagination.page > 1
+
+        # Items are already validated, building the exact response_model class
+        # lets FastAPI skip validating the page a second time.
+        return PaginationResponse[item_type].model_construct(
+            items=models,
+            total=result.total,
+            page=pagination.page,
+            pages=total_pages,
+            limit=pagination.limit,
+            has_next=has_next,
+            has_prev=has_prev,
+            next_cursor=result.next_cursor,
+            prev_cursor=result.prev_cursor,
+        )
 
     async def create(self, data: dict, database: AsyncSession, preloads: list[str] | None = None) -> InfoType:
         obj = await self.repo.create(data=data, database=database, preloads=preloads)
-        return self.return_type.model_validate(obj.__dict__, from_attributes=True)
+        self.invalidate_caches()
+        return to_model(self.return_type, obj)
 
     async def update(self, id_: int, data: dict, database: AsyncSession, preloads: list[str] | None = None) -> InfoType:
         obj = await self.repo.update(id_=id_, data=data, database=database, preloads=preloads)
-        return self.return_type.model_validate(obj.__dict__, from_attributes=True)
+        self.invalidate_caches()
+        return to_model(self.return_type, obj)
 
     async def delete(self, id_: int, database: AsyncSession) -> int:
-        return await self.repo.delete(id_=id_, database=database)
+        deleted = await self.repo.delete(id_=id_, database=database)
+        self.invalidate_caches()
+        return deleted
 
     async def get(self, id_: int, database: AsyncSession, preloads: list[str] | None = None) -> InfoType:
         result = await self.repo.get(id_=id_, database=database, preloads=preloads)
-        return self.return_type.model_validate(result.__dict__, from_attributes=True)
\ No newline at end of file
+        return to_model(self.return_type, result)
+
+    def invalidate_caches(self) -> None:
+        for cache in self.caches:
+            cache.clear()
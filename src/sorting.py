@@ -3,8 +3,9 @@ from enum import Enum
 from typing import Callable
 
 from pydantic import BaseModel
-from sqlalchemy import Select
+from sqlalchemy import Select, ColumnElement, UnaryExpression
 from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql import operators
 
 
 class SortOrder(str, Enum):
@@ -41,3 +42,16 @@ def apply_sorting(stmt: Select, sorting: Sorting, related_fields: SortingRelated
         stmt = stmt.join(related_field.join)
 
     return stmt.order_by(related_field.column.desc() if sorting.sort_order == SortOrder.descending else related_field.column.asc())
+
+def get_sorting_keys(stmt: Select, tie_breaker: InstrumentedAttribute) -> list[tuple[ColumnElement, bool]]:
+    keys = []
+    for clause in stmt._order_by_clauses:
+        if isinstance(clause, UnaryExpression) and clause.modifier in (operators.asc_op, operators.desc_op):
+            keys.append((clause.element, clause.modifier == operators.desc_op))
+        else:
+            keys.append((clause, False))
+
+    if not keys or not keys[-1][0].compare(tie_breaker.expression):
+        keys.append((tie_breaker.expression, False))
+
+    return keys
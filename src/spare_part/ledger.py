@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime
+from typing import NamedTuple
+
+from sqlalchemy import select, insert, func, union_all, literal, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import session_factory
+from src.spare_part.schemas import Location, StockMovement, StockMovementReason, StockSnapshot
+
+
+class StockLevel(NamedTuple):
+    spare_part_id: int
+    institution_id: int | None
+    quantity: int
+
+
+async def record_movements(
+        database: AsyncSession,
+        deltas: dict[tuple[int, int], int],
+        reason: StockMovementReason,
+        repair_request_id: int | None = None,
+) -> None:
+    rows = [(key, delta) for key, delta in deltas.items() if delta != 0]
+    if not rows:
+        return
+
+    # clock_timestamp() rather than the transaction start, the movement is stamped
+    # after the location rows were written, which take_stock_snapshot relies on.
+    await database.execute(insert(StockMovement).values([
+        {
+            "spare_part_id": spare_part_id,
+            "institution_id": institution_id,
+            "delta": delta,
+            "reason": reason,
+            "repair_request_id": repair_request_id,
+            "created_at": func.clock_timestamp(),
+        }
+        for (spare_part_id, institution_id), delta in rows
+    ]))
+
+async def take_stock_snapshot(database: AsyncSession) -> datetime:
+    # SHARE mode waits for the transactions writing locations or movements and keeps
+    # new ones out, so every movement is either stamped before taken_at and included
+    # in the copied quantities, or stamped after it.
+    await database.execute(text("LOCK TABLE location, stock_movement IN SHARE MODE"))
+    taken_at = (await database.execute(select(func.clock_timestamp(type_=StockSnapshot.taken_at.type)))).scalar()
+    await database.execute(insert(StockSnapshot).from_select(
+        ["taken_at", "spare_part_id", "institution_id", "quantity"],
+        select(literal(taken_at, StockSnapshot.taken_at.type), Location.spare_part_id, Location.institution_id, Location.quantity),
+    ))
+    await database.commit()
+    return taken_at
+
+async def get_stock_at(
+        database: AsyncSession,
+        at: datetime,
+        spare_part_id: int | None = None,
+        institution_id: int | None = None,
+) -> list[StockLevel]:
+    """
+    Stock of every location at the given moment, replayed from the nearest snapshot
+    taken before it. Locations holding nothing are left out.
+    """
+    def located(stmt, model):
+        if spare_part_id is not None:
+            stmt = stmt.where(model.spare_part_id == spare_part_id)
+        if institution_id is not None:
+            stmt = stmt.where(model.institution_id == institution_id)
+        return stmt
+
+    snapshot_at = (await database.execute(select(func.max(StockSnapshot.taken_at)).where(StockSnapshot.taken_at <= at))).scalar()
+
+    movements = located(
+        select(StockMovement.spare_part_id, StockMovement.institution_id, StockMovement.delta.label("quantity"))
+        .where(StockMovement.created_at <= at),
+        StockMovement,
+    )
+    parts = [movements]
+    if snapshot_at is not None:
+        parts = [
+            movements.where(StockMovement.created_at > snapshot_at),
+            located(
+                select(StockSnapshot.spare_part_id, StockSnapshot.institution_id, StockSnapshot.quantity)
+                .where(StockSnapshot.taken_at == snapshot_at),
+                StockSnapshot,
+            ),
+        ]
+
+    levels = union_all(*parts).subquery("levels")
+    quantity = func.sum(levels.c.quantity)
+    rows = (await database.execute(
+        select(levels.c.spare_part_id, levels.c.institution_id, quantity)
+        .group_by(levels.c.spare_part_id, levels.c.institution_id)
+        .having(quantity != 0)
+        .order_by(levels.c.spare_part_id, levels.c.institution_id)
+    )).all()
+    return [StockLevel(*row) for row in rows]
+
+async def main() -> None:
+    async with session_factory() as session:
+        taken_at = await take_stock_snapshot(session)
+    print(f"Took stock snapshot at {taken_at.isoformat()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 from src.equipment_model.models import EquipmentModelInfo
@@ -44,5 +46,10 @@ class SparePartUpdate(BaseModel):
     institution_id: int | None = None
     spare_part_category_id: int | None = None
 
+class StockLevelInfo(BaseModel):
+    spare_part_id: int
+    institution_id: int | None
+    quantity: int
+
 class SparePartDelete(BaseModel):
     id: int
@@ -1,27 +1,35 @@
-from sqlalchemy import update, delete, insert
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.decorators import integrity_errors
+from src.decorators import integrity_errors, serialization_retries
 from src.sorting import apply_sorting_wrapper, SortingRelatedField
+from src.equipment_model.schemas import EquipmentModel
 from src.exceptions import DomainError, DomainErrorCode
-from src.repository import CRUDRepository
+from src.repair_request.schemas import RepairRequest, UsedSparePart
+from src.repository import CRUDRepository, sync_association, count_cache
 from src.spare_part.filters import apply_spare_parts_filters
-from src.spare_part.models import SparePartCreate, SparePartUpdate
-from src.spare_part.schemas import SparePart, EquipmentModelSparePart, Location
+from src.spare_part.models import SparePartCreate, SparePartUpdate, CreateLocation
+from src.spare_part.ledger import record_movements
+from src.spare_part.schemas import SparePart, Location, StockMovementReason
 from src.spare_part.sorting import apply_spare_parts_sorting
-from src.filters import apply_filters_wrapper, FilterRelatedField
+from src.spare_part.stock import refresh_stock, lock_stock
+from src.filters import apply_filters_wrapper, FilterRelatedField, FilterCustomField
+from src.statistics.cache import statistics_cache
+from src.statistics.rollup import get_request_days, refresh_days
 
 filter_related_fields_map = {
+    "id": FilterRelatedField(column=SparePart.id),
     "name": FilterRelatedField(column=SparePart.name),
     "spare_part_category_id": FilterRelatedField(column=SparePart.spare_part_category_id),
-    "compatible_model_id": None,
-    "institution_id": None,
-    "stock_status": None,
+    "compatible_model_id": FilterCustomField(column=EquipmentModel.id, operators=frozenset({"eq", "in"})),
+    "institution_id": FilterCustomField(column=Location.institution_id, operators=frozenset({"eq", "in"})),
+    "stock_status": FilterRelatedField(column=SparePart.stock_status),
 }
 
 sorting_related_fields_map = {
     "name": SortingRelatedField(column=SparePart.name),
-    "quantity": None,
+    "quantity": SortingRelatedField(column=SparePart.total_quantity),
     "stock_status": None,
 }
 
@@ -40,16 +48,15 @@ class SparePartRepository(CRUDRepository[SparePart]):
 
         row_id = (await database.execute(insert(SparePart).values(data).returning(SparePart.id))).scalar()
 
-        for compatible_model_id in data_model.compatible_models_ids:
-            await database.execute(insert(EquipmentModelSparePart).values({
-                "equipment_model_id": compatible_model_id,
-                "spare_part_id": row_id,
-            }))
+        await sync_association(database, SparePart.compatible_models.property, row_id, data_model.compatible_models_ids, replace=False)
 
+        await refresh_stock(database, [row_id])
         await database.commit()
+        count_cache.clear()
         return await self.get(row_id, database, preloads)
 
     @integrity_errors()
+    @serialization_retries()
     async def update(self, id_: int, data: dict, database: AsyncSession, preloads: list[str] | None = None) -> SparePart:
         data_model = SparePartUpdate.model_validate(data)
 
@@ -59,23 +66,65 @@ class SparePartRepository(CRUDRepository[SparePart]):
             raise DomainError(DomainErrorCode.not_entity)
 
         if data_model.compatible_models_ids is not None:
-            await database.execute(delete(EquipmentModelSparePart).where(EquipmentModelSparePart.spare_part_id == id_))
-            for compatible_model_id in data_model.compatible_models_ids:
-                await database.execute(insert(EquipmentModelSparePart).values({
-                    "equipment_model_id": compatible_model_id,
-                    "spare_part_id": id_,
-                }))
+            await sync_association(database, SparePart.compatible_models.property, id_, data_model.compatible_models_ids)
 
         if data_model.locations is not None:
-            await database.execute(delete(Location).where(Location.spare_part_id == id_))
-            for location in data_model.locations:
-                await database.execute(insert(Location).values({
-                    "quantity": location.quantity,
-                    "institution_id": location.institution_id,
-                    "spare_part_id": id_,
-                }))
+            await self.sync_locations(database, id_, data_model.locations)
 
+        await refresh_stock(database, [id_])
         await database.commit()
+        count_cache.clear()
         return await self.get(id_, database, preloads)
 
+    async def delete(self, id_: int, database: AsyncSession) -> int:
+        # The used spare parts cascade with it and leave the rollup's quantities, its
+        # locations leave the stock ledger.
+        days = await get_request_days(
+            database,
+            RepairRequest.id.in_(select(UsedSparePart.repair_request_id).where(UsedSparePart.spare_part_id == id_)),
+        )
+        previous = await lock_stock(database, [id_])
+        result = await database.execute(delete(SparePart).where(SparePart.id == id_))
+        if result.rowcount == 0:
+            raise DomainError(code=DomainErrorCode.not_entity, field="")
+
+        await record_movements(database, {key: -quantity for key, quantity in previous.items()}, StockMovementReason.deletion)
+        await refresh_days(database, days)
+        await database.commit()
+        count_cache.clear()
+        statistics_cache.clear()
+        return id_
+
+    @staticmethod
+    async def sync_locations(database: AsyncSession, id_: int, locations: list[CreateLocation]) -> None:
+        # Kept locations are updated in place so their ids survive, only the
+        # institutions missing from the new list lose their row.
+        institution_ids = [location.institution_id for location in locations]
+        if len(set(institution_ids)) != len(institution_ids):
+            raise DomainError(DomainErrorCode.duplication, "institution_id, spare_part_id")
 
+        previous = await lock_stock(database, [id_])
+
+        stmt = delete(Location).where(Location.spare_part_id == id_)
+        if institution_ids:
+            stmt = stmt.where(Location.institution_id.not_in(institution_ids))
+        await database.execute(stmt)
+
+        if locations:
+            stmt = insert(Location).values([
+                {"spare_part_id": id_, "institution_id": location.institution_id, "quantity": location.quantity}
+                for location in sorted(locations, key=lambda location: location.institution_id)
+            ])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Location.institution_id, Location.spare_part_id],
+                set_={"quantity": stmt.excluded.quantity},
+                where=Location.quantity != stmt.excluded.quantity,
+            )
+            await database.execute(stmt)
+
+        current = {(id_, location.institution_id): location.quantity for location in locations}
+        await record_movements(
+            database,
+            {key: current.get(key, 0) - previous.get(key, 0) for key in previous.keys() | current.keys()},
+            StockMovementReason.location_edit,
+        )
@@ -1,4 +1,4 @@
-import json
+from datetime import datetime
 from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks
@@ -12,7 +12,7 @@ from src.auth.dependencies import allowed
 from src.pagination import PaginationResponse
 from src.mailer.dependencies import MailerServiceDep
 from src.spare_part.errors import errors_map
-from src.spare_part.models import SparePartInfo, SparePartCreate, SparePartUpdate
+from src.spare_part.models import SparePartInfo, SparePartCreate, SparePartUpdate, StockLevelInfo
 from src.spare_part.services import SparePartServices
 
 router = APIRouter(prefix="/spare-parts", tags=["Spare Parts"])
@@ -25,11 +25,13 @@ async def get_spare_part_list_endpoint(
         pagination: Pagination = Depends(),
         sorting: Sorting = Depends(),
         filters: str | None = Query(None),
+        fields: str | None = Query(None),
 ) -> PaginationResponse[SparePartInfo]:
     return await services.paginate(
         database=database,
         pagination=pagination,
-        filters=json.loads(filters) if filters else None,
+        filters=services.parse_filters(filters),
+        fields=services.parse_fields(fields),
         sorting=None if sorting.sort_by == "" else sorting,
         preloads=[
             "compatible_models",
@@ -39,6 +41,16 @@ async def get_spare_part_list_endpoint(
         ]
     )
 
+@router.get("/stock-history", response_model=list[StockLevelInfo])
+async def get_stock_history_endpoint(
+        database: DatabaseSession,
+        _: Annotated[None, Depends(allowed())],
+        at: datetime,
+        spare_part_id: int | None = Query(None),
+        institution_id: int | None = Query(None),
+) -> list[StockLevelInfo]:
+    return await services.get_stock_at(database=database, at=at, spare_part_id=spare_part_id, institution_id=institution_id)
+
 @router.post("/", response_model=SparePartInfo)
 @domain_errors(errors_map)
 async def create_spare_part_endpoint(model: SparePartCreate, database: DatabaseSession, _: Annotated[None, Depends(allowed())]) -> SparePartInfo:
@@ -1,9 +1,11 @@
+from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import ForeignKey, UniqueConstraint, CheckConstraint, func, select, case, and_
-from sqlalchemy.orm import Mapped, relationship, mapped_column, column_property
+from sqlalchemy import ForeignKey, UniqueConstraint, CheckConstraint, Index, DateTime, func
+from sqlalchemy.orm import Mapped, relationship, mapped_column
 
 from src.database import BaseDatabaseModel
+from src.search import trigram_index
 from src.institution.schemas import Institution
 from src.repair_request.schemas import RepairRequestStatus
 
@@ -12,7 +14,16 @@ class StockStatus(str, Enum):
     low_stock = "low_stock"
     out_of_stock = "out_of_stock"
 
+class StockMovementReason(str, Enum):
+    used_spare_part = "used_spare_part"
+    location_edit = "location_edit"
+    deletion = "deletion"
+
 class Location(BaseDatabaseModel):
+    """
+    Current quantity of a spare part in an institution, a projection of the
+    stock_movement ledger that is kept up to date in the same transaction.
+    """
     __tablename__ = "location"
     __table_args__ = (
         UniqueConstraint("institution_id", "spare_part_id"),
@@ -31,36 +42,20 @@ class Location(BaseDatabaseModel):
 
 class SparePart(BaseDatabaseModel):
     __tablename__ = "spare_part"
+    __table_args__ = (
+        trigram_index("ix_spare_part_name_trgm", "name"),
+        Index("ix_spare_part_total_quantity", "total_quantity"),
+        Index("ix_spare_part_stock_status", "stock_status"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
-    total_quantity_expr = (
-        select(func.coalesce(func.sum(Location.quantity), 0))
-        .where(Location.spare_part_id == id)
-        .correlate_except(Location)
-        .scalar_subquery()
-    )
-
     name: Mapped[str] = mapped_column(unique=True)
     min_quantity: Mapped[int] = mapped_column()
-    total_quantity: Mapped[int] = column_property(total_quantity_expr)
-
-    stock_status: Mapped[RepairRequestStatus] = column_property(
-        case(
-            (
-                total_quantity_expr >= min_quantity,
-                StockStatus.in_stock,
-            ),
-            (
-                and_(
-                    total_quantity_expr < min_quantity,
-                    total_quantity_expr > 0,
-                ),
-                StockStatus.low_stock,
-            ),
-            else_=StockStatus.out_of_stock,
-        )
-    )
+
+    # Kept in sync with the locations, see src/spare_part/stock.py.
+    total_quantity: Mapped[int] = mapped_column(default=0, server_default="0")
+    stock_status: Mapped[StockStatus] = mapped_column(default=StockStatus.out_of_stock, server_default=StockStatus.out_of_stock.value)
 
     spare_part_category_id: Mapped[int | None] = mapped_column(ForeignKey("spare_part_category.id", ondelete="SET NULL"), nullable=True)
     spare_part_category: Mapped["SparePartCategory"] = relationship(back_populates="spare_parts", lazy="noload")
@@ -85,3 +80,36 @@ class EquipmentModelSparePart(BaseDatabaseModel):
     spare_part_id: Mapped[int] = mapped_column(ForeignKey("spare_part.id", ondelete="CASCADE"), primary_key=True)
     equipment_model_id: Mapped[int] = mapped_column(ForeignKey("equipment_model.id", ondelete="CASCADE"), primary_key=True)
 
+class StockMovement(BaseDatabaseModel):
+    """
+    Append-only ledger of location quantity changes, see src/spare_part/ledger.py.
+    """
+    __tablename__ = "stock_movement"
+    __table_args__ = (
+        Index("ix_stock_movement_created_at", "created_at"),
+        Index("ix_stock_movement_location", "spare_part_id", "institution_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    delta: Mapped[int] = mapped_column()
+    reason: Mapped[StockMovementReason] = mapped_column()
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    # Plain ids rather than foreign keys, the history of deleted spare parts and
+    # institutions stays in the ledger.
+    spare_part_id: Mapped[int] = mapped_column()
+    institution_id: Mapped[int | None] = mapped_column(nullable=True)
+    repair_request_id: Mapped[int | None] = mapped_column(ForeignKey("repair_request.id", ondelete="SET NULL"), nullable=True)
+
+class StockSnapshot(BaseDatabaseModel):
+    __tablename__ = "stock_snapshot"
+    __table_args__ = (
+        UniqueConstraint("taken_at", "spare_part_id", "institution_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    taken_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    quantity: Mapped[int] = mapped_column()
+
+    spare_part_id: Mapped[int] = mapped_column()
+    institution_id: Mapped[int | None] = mapped_column(nullable=True)
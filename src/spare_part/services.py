@@ -1,17 +1,24 @@
+from datetime import datetime
+
 from fastapi import BackgroundTasks
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.auth.repository import AuthRepository
+from src.conversion import to_model
 from src.event import emit, EventTypes
 from src.services import GenericServices
 from src.mailer.smtp import MailerService
 from src.mailer.models import LowStockMessagePayload
-from src.spare_part.models import SparePartInfo
+from src.spare_part.ledger import get_stock_at
+from src.spare_part.models import SparePartInfo, StockLevelInfo
 from src.spare_part.repository import SparePartRepository
 from src.spare_part.schemas import SparePart
+from src.summary.services import summary_cache
 
 
 class SparePartServices(GenericServices[SparePart, SparePartInfo]):
+    caches = (summary_cache,)
+
     def __init__(self):
         super().__init__(SparePartRepository(), SparePartInfo)
         self.auth_repo = AuthRepository()
@@ -29,12 +36,23 @@ class SparePartServices(GenericServices[SparePart, SparePartInfo]):
             preloads: list[str] | None = None,
     ) -> SparePartInfo:
         spare_part = await self.repo.update(id_=id_, data=data, database=database, preloads=preloads)
+        self.invalidate_caches()
         await self.check_quantity(ids=[spare_part.id], database=database, background_tasks=background_tasks, mailer=mailer)
 
-        return SparePartInfo.model_validate(spare_part.__dict__, from_attributes=True)
+        return to_model(SparePartInfo, spare_part)
+
+    @staticmethod
+    async def get_stock_at(
+            database: AsyncSession,
+            at: datetime,
+            spare_part_id: int | None = None,
+            institution_id: int | None = None,
+    ) -> list[StockLevelInfo]:
+        levels = await get_stock_at(database, at, spare_part_id=spare_part_id, institution_id=institution_id)
+        return [StockLevelInfo.model_validate(level._asdict()) for level in levels]
 
     async def check_quantity(self, ids: list[int], database: AsyncSession, background_tasks: BackgroundTasks, mailer: MailerService) -> None:
-        spare_parts = (await self.repo.fetch(database, filters={"id": { "in": str(ids) }}))[0]
+        spare_parts = (await self.repo.fetch(database, filters={"id": {"in": ids}}))[0]
         for spare_part in spare_parts:
             if spare_part.total_quantity <= spare_part.min_quantity:
                 receivers = (await self.auth_repo.fetch(database=database, filters={"receive_low_stock_notification": "true"}))[0]
@@ -1,42 +1,12 @@
-from sqlalchemy import Select, select
+from sqlalchemy import Select
 
 from src.sorting import Sorting, SortingRelatedFieldsMap, SortOrder, apply_sorting
-from src.spare_part.schemas import SparePart, Location
+from src.spare_part.schemas import SparePart
 
 
-from sqlalchemy import case, and_, func
 def apply_spare_parts_sorting(stmt: Select, sorting: Sorting, related_fields: SortingRelatedFieldsMap) -> Select:
-    total_quantity_subq = (
-        select(
-            Location.spare_part_id.label("spare_part_id"),
-            func.coalesce(func.sum(Location.quantity), 0).label("total_quantity")
-        )
-        .group_by(Location.spare_part_id)
-        .subquery()
-    )
-
-    total_qty_col = func.coalesce(total_quantity_subq.c.total_quantity, 0)
-
-    if sorting.sort_by == "quantity":
-        return stmt.outerjoin(
-            total_quantity_subq,
-            SparePart.id == total_quantity_subq.c.spare_part_id
-        ).order_by(
-            total_qty_col.desc() if sorting.sort_order == SortOrder.descending else total_qty_col.asc()
-        )
-
-
     if sorting.sort_by == "stock_status":
-        status_expr = case(
-            (total_qty_col > SparePart.min_quantity, 2),
-            (and_(total_qty_col > 0, total_qty_col <= SparePart.min_quantity), 1),
-            else_=0
-        )
-
-        return (
-            stmt
-            .outerjoin(total_quantity_subq, SparePart.id == total_quantity_subq.c.spare_part_id)
-            .order_by(status_expr.desc() if sorting.sort_order == SortOrder.descending else status_expr.asc())
-        )
+        # The enum is declared from in_stock to out_of_stock, ascending stock goes the other way.
+        return stmt.order_by(SparePart.stock_status.asc() if sorting.sort_order == SortOrder.descending else SparePart.stock_status.desc())
 
     return apply_sorting(stmt, sorting, related_fields)
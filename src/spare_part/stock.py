@@ -0,0 +1,162 @@
+import asyncio
+from typing import Iterable
+
+from sqlalchemy import select, update, delete, case, cast, func, values, column, literal_column, tuple_, ColumnElement
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import session_factory
+from src.spare_part.ledger import record_movements
+from src.spare_part.schemas import SparePart, Location, StockStatus, StockMovementReason
+
+location_total = (
+    select(func.coalesce(func.sum(Location.quantity), 0))
+    .where(Location.spare_part_id == SparePart.id)
+    .correlate_except(Location)
+    .scalar_subquery()
+)
+
+def stock_status_case(total_quantity: ColumnElement, min_quantity: ColumnElement) -> ColumnElement:
+    return cast(
+        case(
+            (total_quantity >= min_quantity, StockStatus.in_stock),
+            (total_quantity > 0, StockStatus.low_stock),
+            else_=StockStatus.out_of_stock,
+        ),
+        SparePart.stock_status.type,
+    )
+
+
+async def refresh_stock(database: AsyncSession, spare_part_ids: Iterable[int | None]) -> None:
+    ids = sorted({id_ for id_ in spare_part_ids if id_ is not None})
+    if not ids:
+        return
+
+    # Locking the rows first serializes concurrent refreshes of the same spare part,
+    # the sum then sees every committed location. FOR NO KEY UPDATE, see lock_stock.
+    await database.execute(
+        select(SparePart.id).where(SparePart.id.in_(ids)).order_by(SparePart.id).with_for_update(key_share=True)
+    )
+    await database.execute(update(SparePart).where(SparePart.id.in_(ids)).values(total_quantity=location_total))
+    await database.execute(
+        update(SparePart)
+        .where(SparePart.id.in_(ids))
+        .values(stock_status=stock_status_case(SparePart.total_quantity, SparePart.min_quantity))
+    )
+
+async def lock_stock(
+        database: AsyncSession,
+        spare_part_ids: Iterable[int],
+        locations: Iterable[tuple[int, int]] | None = None,
+) -> dict[tuple[int, int], int]:
+    """
+    Locks the spare parts and then their locations, all of them or only the given
+    (spare_part_id, institution_id) keys, in key order. Returns the quantities of
+    the locked locations.
+    """
+    # Every writer of stock takes the locks in the same order, so concurrent updates
+    # of the same parts queue behind each other instead of deadlocking. The parts are
+    # locked FOR NO KEY UPDATE, a used spare part insert already holds KEY SHARE on
+    # them through its foreign key and would deadlock against FOR UPDATE.
+    ids = sorted(set(spare_part_ids))
+    if not ids:
+        return {}
+
+    await database.execute(
+        select(SparePart.id).where(SparePart.id.in_(ids)).order_by(SparePart.id).with_for_update(key_share=True)
+    )
+
+    stmt = select(Location.spare_part_id, Location.institution_id, Location.quantity).where(Location.spare_part_id.in_(ids))
+    if locations is not None:
+        stmt = stmt.where(tuple_(Location.spare_part_id, Location.institution_id).in_(sorted(set(locations))))
+    rows = await database.execute(stmt.order_by(Location.spare_part_id, Location.institution_id).with_for_update())
+    return {(spare_part_id, institution_id): quantity for spare_part_id, institution_id, quantity in rows}
+
+async def apply_location_deltas(
+        database: AsyncSession,
+        deltas: dict[tuple[int, int], int],
+        reason: StockMovementReason,
+        repair_request_id: int | None = None,
+) -> None:
+    """
+    Adds signed quantities to the locations keyed by (spare_part_id, institution_id)
+    with one upsert, locations emptied by the change are removed. The resulting
+    changes are recorded in the stock ledger.
+    """
+    rows = sorted((spare_part_id, institution_id, delta) for (spare_part_id, institution_id), delta in deltas.items() if delta != 0)
+    if not rows:
+        return
+
+    previous = await lock_stock(database, [row[0] for row in rows], [row[:2] for row in rows])
+
+    # CHECK constraints apply to the proposed row before the conflict is detected, so
+    # the insert carries the absolute quantity and the update reads the signed delta back.
+    # The excluded row is referenced by name, as a column object it would be pulled into
+    # the subquery's FROM instead of being correlated.
+    changes = (
+        select(values(
+            column("spare_part_id", Location.spare_part_id.type),
+            column("institution_id", Location.institution_id.type),
+            column("delta", Location.quantity.type),
+            name="changes",
+        ).data(rows))
+        .cte("location_changes")
+    )
+    stmt = insert(Location).from_select(
+        ["spare_part_id", "institution_id", "quantity"],
+        select(changes.c.spare_part_id, changes.c.institution_id, func.abs(changes.c.delta))
+        .order_by(changes.c.spare_part_id, changes.c.institution_id),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Location.spare_part_id, Location.institution_id],
+        set_={
+            "quantity": Location.quantity + (
+                select(changes.c.delta)
+                .where(
+                    changes.c.spare_part_id == literal_column("excluded.spare_part_id"),
+                    changes.c.institution_id == literal_column("excluded.institution_id"),
+                )
+                .scalar_subquery()
+            ),
+        },
+    ).add_cte(changes, nest_here=True).returning(Location.id, Location.spare_part_id, Location.institution_id, Location.quantity)
+
+    changed = (await database.execute(stmt)).all()
+    emptied = [row.id for row in changed if row.quantity == 0]
+    if emptied:
+        await database.execute(delete(Location).where(Location.id.in_(emptied)))
+
+    # The ledger gets what the locations went through, a location created by a
+    # consumption received the absolute quantity.
+    await record_movements(
+        database,
+        {
+            (row.spare_part_id, row.institution_id): row.quantity - previous.get((row.spare_part_id, row.institution_id), 0)
+            for row in changed
+        },
+        reason,
+        repair_request_id,
+    )
+
+async def reconcile_stock(database: AsyncSession, batch_size: int = 1000) -> int:
+    refreshed = 0
+    last_id = 0
+    while True:
+        ids = (await database.execute(
+            select(SparePart.id).where(SparePart.id > last_id).order_by(SparePart.id).limit(batch_size)
+        )).scalars().all()
+        if not ids:
+            return refreshed
+
+        await refresh_stock(database, ids)
+        await database.commit()
+        refreshed += len(ids)
+        last_id = ids[-1]
+
+async def main() -> None:
+    async with session_factory() as session:
+        refreshed = await reconcile_stock(session)
+    print(f"Reconciled stock of {refreshed} spare part(s)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
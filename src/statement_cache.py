@@ -0,0 +1,49 @@
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from sqlalchemy import event, Executable
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+from src.database import engine
+
+
+class StatementCache:
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self.entries: OrderedDict[Hashable, Executable] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Executable]) -> Executable:
+        stmt = self.entries.get(key)
+        if stmt is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return stmt
+
+        self.misses += 1
+        stmt = build()
+        self.entries[key] = stmt
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+        return stmt
+
+class CompiledCacheCounter:
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.uncached = 0
+
+    def on_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CACHE_HIT:
+            self.hits += 1
+        elif cache_hit is CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+statement_cache = StatementCache()
+compiled_cache_counter = CompiledCacheCounter()
+
+event.listen(engine.sync_engine, "after_cursor_execute", compiled_cache_counter.on_execute)
@@ -0,0 +1,22 @@
+from src.cache import TTLCache
+from src.statistics.filters import time_frame_bounds
+from src.statistics.models import StatisticsFilters, StatisticsResponse
+
+StatisticsCacheKey = tuple
+
+statistics_cache: TTLCache[StatisticsCacheKey, StatisticsResponse] = TTLCache(ttl=60, max_size=256)
+
+
+def statistics_cache_key(data: StatisticsFilters, limit: int) -> StatisticsCacheKey:
+    # Filters that select the same rows share an entry: ids are order-free sets and
+    # dates only matter up to the periods they fall into.
+    lower, upper = time_frame_bounds(data.time_frame)
+    return (
+        data.time_frame.step,
+        lower,
+        upper,
+        tuple(sorted(set(data.institution_ids))),
+        tuple(sorted(set(data.equipment_model_ids))),
+        tuple(sorted(set(data.failure_type_ids))),
+        limit,
+    )
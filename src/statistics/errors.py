@@ -0,0 +1,7 @@
+from src.exceptions import DomainErrorCode, ErrorMap
+
+error_map: dict[DomainErrorCode, dict[str, ErrorMap]] = {
+    DomainErrorCode.not_entity: {
+        "": ErrorMap(code="not found", message="Експорту з таким id не існує")
+    },
+}
@@ -0,0 +1,142 @@
+import csv
+import io
+import shutil
+import tempfile
+import zipfile
+from datetime import datetime
+from typing import Any, AsyncIterator, BinaryIO, NamedTuple
+
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from starlette.concurrency import run_in_threadpool
+
+from src.statistics.models import ExportFormat
+
+EXPORT_BATCH_SIZE = 1000
+FILE_CHUNK_SIZE = 64 * 1024
+MIN_COLUMN_WIDTH = 12
+
+
+class Sheet(NamedTuple):
+    columns: list[str]
+    types: list[type]
+    rows: AsyncIterator[tuple[Any, ...]]
+
+class ChunkBuffer(io.RawIOBase):
+    # Unseekable sink, zipfile falls back to data descriptors and the written
+    # bytes can be drained between rows.
+    def __init__(self):
+        super().__init__()
+        self.chunks: list[bytes] = []
+        self.size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        self.size = 0
+        return data
+
+async def batches(rows: AsyncIterator[tuple[Any, ...]]) -> AsyncIterator[list[tuple[Any, ...]]]:
+    batch = []
+    async for row in rows:
+        batch.append(row)
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def append_rows(worksheet, rows: list[tuple[Any, ...]]) -> None:
+    for row in rows:
+        worksheet.append(row)
+
+async def write_xlsx(sheets: dict[str, Sheet], file: BinaryIO) -> None:
+    # Write-only worksheets flush appended rows to temporary files instead of
+    # keeping cells in memory, the zip is assembled into `file` on save. Rows are
+    # serialized and the workbook saved in the threadpool, off the event loop.
+    workbook = Workbook(write_only=True)
+    for name, sheet in sheets.items():
+        worksheet = workbook.create_sheet(name)
+        for i, column in enumerate(sheet.columns, start=1):
+            worksheet.column_dimensions[get_column_letter(i)].width = max(len(column), MIN_COLUMN_WIDTH) + 2
+
+        worksheet.append(sheet.columns)
+        async for batch in batches(sheet.rows):
+            await run_in_threadpool(append_rows, worksheet, batch)
+
+    await run_in_threadpool(workbook.save, file)
+
+async def iterate_file(file: BinaryIO) -> AsyncIterator[bytes]:
+    try:
+        file.seek(0)
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            yield chunk
+    finally:
+        file.close()
+
+async def stream_csv_zip(sheets: dict[str, Sheet]) -> AsyncIterator[bytes]:
+    buffer = ChunkBuffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, sheet in sheets.items():
+            with archive.open(f"{name}.csv", "w", force_zip64=True) as entry:
+                text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+                writer = csv.writer(text)
+                writer.writerow(sheet.columns)
+                async for row in sheet.rows:
+                    writer.writerow(row)
+                    if buffer.size >= FILE_CHUNK_SIZE:
+                        yield buffer.drain()
+                text.flush()
+                text.detach()
+            yield buffer.drain()
+    yield buffer.drain()
+
+async def write_parquet_zip(sheets: dict[str, Sheet], file: BinaryIO) -> None:
+    # pyarrow is only needed by this format, so it is imported on demand.
+    import pyarrow
+    import pyarrow.parquet
+
+    arrow_types = {
+        int: pyarrow.int64(),
+        float: pyarrow.float64(),
+        str: pyarrow.string(),
+        datetime: pyarrow.timestamp("us"),
+    }
+
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, sheet in sheets.items():
+            schema = pyarrow.schema([(column, arrow_types[type_]) for column, type_ in zip(sheet.columns, sheet.types)])
+
+            def record_batch(rows: list[tuple[Any, ...]]) -> pyarrow.RecordBatch:
+                columns = zip(*rows)
+                return pyarrow.record_batch([pyarrow.array(values, type=field.type) for values, field in zip(columns, schema)], schema=schema)
+
+            def copy_into_archive(output: BinaryIO) -> None:
+                output.seek(0)
+                with archive.open(f"{name}.parquet", "w", force_zip64=True) as entry:
+                    shutil.copyfileobj(output, entry, FILE_CHUNK_SIZE)
+
+            with tempfile.TemporaryFile() as output:
+                with pyarrow.parquet.ParquetWriter(output, schema) as writer:
+                    async for batch in batches(sheet.rows):
+                        await run_in_threadpool(lambda: writer.write_batch(record_batch(batch)))
+
+                await run_in_threadpool(copy_into_archive, output)
+
+async def write_csv_zip(sheets: dict[str, Sheet], file: BinaryIO) -> None:
+    async for chunk in stream_csv_zip(sheets):
+        file.write(chunk)
+
+EXPORT_WRITERS = {
+    ExportFormat.xlsx: (write_xlsx, "xlsx"),
+    ExportFormat.csv: (write_csv_zip, "zip"),
+    ExportFormat.parquet: (write_parquet_zip, "zip"),
+}
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import ColumnElement
+
+from src.statistics.models import StatisticsTimeStep, TimeFrame, StatisticsFilters
+from src.statistics.schemas import RepairRequestDailyStat
+
+
+def truncate(value: datetime, step: StatisticsTimeStep) -> datetime:
+    # Mirrors Postgres date_trunc, weeks start on Monday.
+    value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if step == StatisticsTimeStep.week:
+        return value - timedelta(days=value.weekday())
+    if step == StatisticsTimeStep.month:
+        return value.replace(day=1)
+    if step == StatisticsTimeStep.year:
+        return value.replace(month=1, day=1)
+    return value
+
+def next_period(value: datetime, step: StatisticsTimeStep) -> datetime:
+    if step == StatisticsTimeStep.day:
+        return value + timedelta(days=1)
+    if step == StatisticsTimeStep.week:
+        return value + timedelta(weeks=1)
+    if step == StatisticsTimeStep.month:
+        return value.replace(year=value.year + value.month // 12, month=value.month % 12 + 1)
+    return value.replace(year=value.year + 1)
+
+def time_frame_bounds(time_frame: TimeFrame) -> tuple[datetime | None, datetime | None]:
+    # [start of the first whole period, start of the period after the last one). A from_date
+    # inside a period leaves that partial period out.
+    lower = None
+    if time_frame.from_date:
+        lower = truncate(time_frame.from_date, time_frame.step)
+        if lower != time_frame.from_date:
+            lower = next_period(lower, time_frame.step)
+    upper = next_period(truncate(time_frame.to_date, time_frame.step), time_frame.step) if time_frame.to_date else None
+    return lower, upper
+
+def time_frame_conditions(column: ColumnElement, time_frame: TimeFrame) -> list[ColumnElement]:
+    lower, upper = time_frame_bounds(time_frame)
+    conditions = []
+    if lower is not None:
+        conditions.append(column >= lower)
+    if upper is not None:
+        conditions.append(column < upper)
+    return conditions
+
+def daily_stat_conditions(data: StatisticsFilters, by_failure_type: bool = False) -> list[ColumnElement]:
+    # Totals rows count every request once, per failure type rows are used when
+    # the widget groups or filters by failure type.
+    lower, upper = time_frame_bounds(data.time_frame)
+    conditions = []
+    if lower is not None:
+        conditions.append(RepairRequestDailyStat.day >= lower.date())
+    if upper is not None:
+        conditions.append(RepairRequestDailyStat.day < upper.date())
+
+    if data.institution_ids:
+        conditions.append(RepairRequestDailyStat.institution_id.in_(data.institution_ids))
+    if data.equipment_model_ids:
+        conditions.append(RepairRequestDailyStat.equipment_model_id.in_(data.equipment_model_ids))
+
+    if data.failure_type_ids:
+        conditions.append(RepairRequestDailyStat.failure_type_id.in_(data.failure_type_ids))
+    elif by_failure_type:
+        conditions.append(RepairRequestDailyStat.failure_type_id.is_not(None))
+    else:
+        conditions.append(RepairRequestDailyStat.failure_type_id.is_(None))
+    return conditions
@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator
+
+from fastapi import BackgroundTasks
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import session_factory
+from src.exceptions import DomainError, DomainErrorCode
+from src.repair_request.services import form_url_to_file
+from src.statistics.export import EXPORT_BATCH_SIZE, EXPORT_WRITERS
+from src.statistics.models import StatisticsFilters, ExportFormat, ExportJobInfo, ExportJobStatus
+from src.statistics.schemas import ExportJob, ACTIVE_EXPORT_JOB
+from src.statistics.services import StatisticsServices
+
+
+ACTIVE_STATUSES = (ExportJobStatus.pending, ExportJobStatus.running)
+
+class ExportJobServices:
+    def __init__(self, static_files_dir: str, proxy_url_to_static_files_dir: str, ttl: int, heartbeat_timeout: int = 300):
+        self.static_files_dir = static_files_dir
+        self.proxy_url_to_static_files_dir = proxy_url_to_static_files_dir
+        self.ttl = timedelta(seconds=ttl)
+        self.heartbeat_timeout = timedelta(seconds=heartbeat_timeout)
+
+    @staticmethod
+    def filters_hash(export_format: ExportFormat) -> str:
+        # The sheets are written in full whatever the filters, as in the synchronous
+        # export, so only the format decides what ends up in the file.
+        return hashlib.sha256(json.dumps([export_format.value]).encode()).hexdigest()
+
+    def to_info(self, job: ExportJob) -> ExportJobInfo:
+        finished = job.status == ExportJobStatus.finished
+        return ExportJobInfo(
+            id=job.id,
+            status=job.status,
+            format=job.format,
+            rows_written=job.rows_written,
+            download_url=form_url_to_file(self.proxy_url_to_static_files_dir, job.file_name) if finished else None,
+            error=job.error,
+            created_at=job.created_at,
+            finished_at=job.finished_at,
+            expires_at=job.expires_at,
+        )
+
+    async def enqueue(
+            self,
+            database: AsyncSession,
+            filters: StatisticsFilters,
+            export_format: ExportFormat,
+            background_tasks: BackgroundTasks,
+    ) -> ExportJobInfo:
+        await self.expire(database)
+        await self.fail_stale(database)
+
+        # Requests for the same file reuse a running or finished export instead of building it again.
+        filters_hash = self.filters_hash(export_format)
+        job = await self.find_reusable(database, filters_hash)
+        if job is not None:
+            return self.to_info(job)
+
+        # Concurrent requests for the same file meet on the partial unique index of
+        # active jobs, the ones that lose the race get the winner's job.
+        _, extension = EXPORT_WRITERS[export_format]
+        now = datetime.now(timezone.utc)
+        job = (await database.execute(
+            insert(ExportJob)
+            .values(
+                filters_hash=filters_hash,
+                filters=filters.model_dump(mode="json"),
+                format=export_format,
+                status=ExportJobStatus.pending,
+                rows_written=0,
+                file_name=f"statistics-{uuid.uuid4().hex}.{extension}",
+                created_at=now,
+                expires_at=now + self.ttl,
+                heartbeat_at=now,
+            )
+            .on_conflict_do_nothing(index_elements=[ExportJob.filters_hash], index_where=ACTIVE_EXPORT_JOB)
+            .returning(ExportJob)
+        )).scalar()
+        await database.commit()
+
+        if job is None:
+            return self.to_info(await self.find_reusable(database, filters_hash))
+
+        background_tasks.add_task(self.run, job.id)
+        return self.to_info(job)
+
+    @staticmethod
+    async def find_reusable(database: AsyncSession, filters_hash: str) -> ExportJob | None:
+        return (await database.execute(
+            select(ExportJob)
+            .where(ExportJob.filters_hash == filters_hash, ExportJob.status != ExportJobStatus.failed)
+            .order_by(ExportJob.id.desc())
+            .limit(1)
+        )).scalar()
+
+    async def get(self, database: AsyncSession, id_: int) -> ExportJobInfo:
+        await self.expire(database)
+        await self.fail_stale(database)
+        job = await database.get(ExportJob, id_)
+        if job is None:
+            raise DomainError(code=DomainErrorCode.not_entity)
+        return self.to_info(job)
+
+    async def expire(self, database: AsyncSession) -> None:
+        expired = (await database.execute(
+            delete(ExportJob)
+            .where(ExportJob.expires_at < datetime.now(timezone.utc))
+            .returning(ExportJob.file_name)
+        )).scalars().all()
+        await database.commit()
+
+        for file_name in expired:
+            self.remove_file(file_name)
+
+    async def fail_stale(self, database: AsyncSession) -> None:
+        # Jobs whose worker died with the process (a restart, a crash) stop sending
+        # heartbeats, they are failed so that they are no longer reused.
+        now = datetime.now(timezone.utc)
+        await database.execute(
+            update(ExportJob)
+            .where(ExportJob.status.in_(ACTIVE_STATUSES), ExportJob.heartbeat_at < now - self.heartbeat_timeout)
+            .values(status=ExportJobStatus.failed, error="The export stopped responding", finished_at=now)
+        )
+        await database.commit()
+
+    def remove_file(self, file_name: str) -> None:
+        try:
+            os.remove(os.path.join(self.static_files_dir, file_name))
+        except FileNotFoundError:
+            pass
+
+    async def run(self, job_id: int) -> None:
+        # The export streams on one connection, progress is committed through another
+        # so that it is visible while the export is still running.
+        async with session_factory() as database, session_factory() as progress:
+            job = await progress.get(ExportJob, job_id)
+            if job is None:
+                return
+
+            await self.set_state(progress, job_id, status=ExportJobStatus.running)
+            path = os.path.join(self.static_files_dir, job.file_name)
+            write, _ = EXPORT_WRITERS[job.format]
+
+            try:
+                rows_written = 0
+
+                async def count_rows(rows: AsyncIterator[tuple]) -> AsyncIterator[tuple]:
+                    nonlocal rows_written
+                    async for row in rows:
+                        yield row
+                        rows_written += 1
+                        if rows_written % EXPORT_BATCH_SIZE == 0:
+                            await self.set_state(progress, job_id, rows_written=rows_written)
+
+                sheets = StatisticsServices.generate_sheets(database)
+                sheets = {name: sheet._replace(rows=count_rows(sheet.rows)) for name, sheet in sheets.items()}
+
+                with open(f"{path}.part", "wb") as file:
+                    await write(sheets, file)
+                os.replace(f"{path}.part", path)
+            except Exception as e:
+                self.remove_file(f"{job.file_name}.part")
+                await progress.rollback()
+                await self.set_state(progress, job_id, status=ExportJobStatus.failed, error=str(e), finished_at=datetime.now(timezone.utc))
+                return
+
+            finished_at = datetime.now(timezone.utc)
+            updated = await self.set_state(
+                progress,
+                job_id,
+                status=ExportJobStatus.finished,
+                rows_written=rows_written,
+                finished_at=finished_at,
+                expires_at=finished_at + self.ttl,
+            )
+            if not updated:
+                # The job expired while it was running.
+                self.remove_file(job.file_name)
+
+    @staticmethod
+    async def set_state(database: AsyncSession, job_id: int, **values: Any) -> bool:
+        result = await database.execute(
+            update(ExportJob)
+            .where(ExportJob.id == job_id)
+            .values(heartbeat_at=datetime.now(timezone.utc), **values)
+        )
+        await database.commit()
+        return result.rowcount > 0
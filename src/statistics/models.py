@@ -10,9 +10,20 @@ class StatisticsTimeStep(str, Enum):
     year = "year"
 
 
+class ExportFormat(str, Enum):
+    xlsx = "xlsx"
+    csv = "csv"
+    parquet = "parquet"
+
+class ExportJobStatus(str, Enum):
+    pending = "pending"
+    running = "running"
+    finished = "finished"
+    failed = "failed"
+
 class TimeFrame(BaseModel):
-    from_date: datetime
-    to_date: datetime
+    from_date: datetime | None = None
+    to_date: datetime | None = None
     step: StatisticsTimeStep
 
 class StatisticsFilters(BaseModel):
@@ -64,3 +75,14 @@ class StatisticsResponse(BaseModel):
     equipment_breakdowns: list[EquipmentBreakdownItem]
     used_spare_parts: list[CategoricalChartDataItem]
 
+
+class ExportJobInfo(BaseModel):
+    id: int
+    status: ExportJobStatus
+    format: ExportFormat
+    rows_written: int
+    download_url: str | None
+    error: str | None
+    created_at: datetime
+    finished_at: datetime | None
+    expires_at: datetime
@@ -0,0 +1,160 @@
+import asyncio
+from datetime import date, datetime, time, timedelta
+from typing import Iterable
+
+from sqlalchemy import select, func, delete, insert, union_all, cast, null, Integer, ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.database import session_factory
+from src.equipment.schemas import Equipment
+from src.failure_type.schemas import FailureTypeRepairRequest
+from src.repair_request.schemas import RepairRequest, UsedSparePart
+from src.statistics.models import StatisticsTimeStep
+from src.statistics.schemas import RepairRequestDailyStat
+
+ROLLUP_STEPS = {StatisticsTimeStep.day, StatisticsTimeStep.week, StatisticsTimeStep.month, StatisticsTimeStep.year}
+
+request_day = func.date(RepairRequest.created_at, type_=RepairRequestDailyStat.day.type)
+
+# Namespace of the per-day advisory locks, the second key is the day's ordinal.
+ROLLUP_LOCK_NAMESPACE = 15_001
+
+
+def day_conditions(first_day: date, last_day: date) -> list[ColumnElement]:
+    # The widened created_at range keeps the index usable whatever the session
+    # time zone is, the exact day comes from the same expression as the rollup.
+    lower = datetime.combine(first_day - timedelta(days=1), time())
+    upper = datetime.combine(last_day + timedelta(days=2), time())
+    return [
+        RepairRequest.created_at >= lower,
+        RepairRequest.created_at < upper,
+        request_day >= first_day,
+        request_day <= last_day,
+    ]
+
+def build_rollup_query(first_day: date, last_day: date):
+    used_quantity = (
+        select(func.coalesce(func.sum(UsedSparePart.quantity), 0))
+        .where(UsedSparePart.repair_request_id == RepairRequest.id)
+        .scalar_subquery()
+    )
+    requests = (
+        select(
+            RepairRequest.id.label("id"),
+            request_day.label("day"),
+            Equipment.institution_id.label("institution_id"),
+            Equipment.equipment_model_id.label("equipment_model_id"),
+            (func.extract("epoch", RepairRequest.completed_at) - func.extract("epoch", RepairRequest.created_at)).label("repair_seconds"),
+            used_quantity.label("spare_part_quantity"),
+        )
+        .outerjoin(Equipment, Equipment.id == RepairRequest.equipment_id)
+        .where(*day_conditions(first_day, last_day))
+        .subquery("requests")
+    )
+
+    def aggregate(failure_type_id: ColumnElement):
+        return select(
+            requests.c.day,
+            requests.c.institution_id,
+            requests.c.equipment_model_id,
+            failure_type_id.label("failure_type_id"),
+            func.count().label("request_count"),
+            func.count(requests.c.repair_seconds).label("completed_count"),
+            func.coalesce(func.sum(requests.c.repair_seconds), 0).label("repair_seconds"),
+            func.coalesce(func.sum(requests.c.spare_part_quantity), 0).label("spare_part_quantity"),
+        )
+
+    dimensions = [requests.c.day, requests.c.institution_id, requests.c.equipment_model_id]
+    totals = aggregate(cast(null(), Integer)).group_by(*dimensions)
+    by_failure_type = (
+        aggregate(FailureTypeRepairRequest.failure_type_id)
+        .join(FailureTypeRepairRequest, FailureTypeRepairRequest.repair_request_id == requests.c.id)
+        .group_by(*dimensions, FailureTypeRepairRequest.failure_type_id)
+    )
+    return union_all(totals, by_failure_type)
+
+async def lock_days(database: AsyncSession, first_day: date, last_day: date) -> None:
+    # Two transactions rebuilding the same day under READ COMMITTED could both delete
+    # nothing and both insert, the lock makes the second one wait and see the first one's
+    # rows. generate_series locks the days in ascending order, so overlapping ranges cannot
+    # deadlock.
+    if database.bind.dialect.name != "postgresql":
+        return
+
+    days = func.generate_series(first_day.toordinal(), last_day.toordinal()).table_valued("ordinal").render_derived()
+    await database.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_NAMESPACE, cast(days.c.ordinal, Integer))))
+
+async def refresh_daily_stats(database: AsyncSession, first_day: date, last_day: date) -> None:
+    # Rebuilds the rows of the given days inside the caller's transaction.
+    await lock_days(database, first_day, last_day)
+    query = build_rollup_query(first_day, last_day)
+    await database.execute(
+        delete(RepairRequestDailyStat)
+        .where(RepairRequestDailyStat.day >= first_day, RepairRequestDailyStat.day <= last_day)
+    )
+    await database.execute(
+        insert(RepairRequestDailyStat).from_select([column.name for column in query.selected_columns], query)
+    )
+
+async def get_request_days(database: AsyncSession, *conditions: ColumnElement) -> list[date]:
+    return list((await database.execute(select(request_day).where(*conditions).distinct().order_by(request_day))).scalars())
+
+async def lock_equipment_request_days(database: AsyncSession, *conditions: ColumnElement) -> list[date]:
+    # Locking the equipment first keeps new requests off it until the caller commits,
+    # so the days read here are all the days the caller's write can change.
+    equipment_ids = (await database.execute(
+        select(Equipment.id).where(*conditions).order_by(Equipment.id).with_for_update()
+    )).scalars().all()
+    if not equipment_ids:
+        return []
+    return await get_request_days(database, RepairRequest.equipment_id.in_(equipment_ids))
+
+async def refresh_days(database: AsyncSession, days: Iterable[date]) -> None:
+    # Consecutive days are rebuilt as one range.
+    days = sorted(set(days))
+    start = 0
+    for i, day in enumerate(days):
+        if i + 1 == len(days) or days[i + 1] != day + timedelta(days=1):
+            await refresh_daily_stats(database, days[start], day)
+            start = i + 1
+
+async def delete_failure_type_stats(database: AsyncSession, failure_type_id: int) -> None:
+    # The per failure type rows of a deleted type, its links to requests are gone with it.
+    await database.execute(delete(RepairRequestDailyStat).where(RepairRequestDailyStat.failure_type_id == failure_type_id))
+
+async def get_repair_request_day(database: AsyncSession, repair_request_id: int) -> date | None:
+    return (await database.execute(select(request_day).where(RepairRequest.id == repair_request_id))).scalar()
+
+async def refresh_repair_request_day(database: AsyncSession, repair_request_id: int) -> None:
+    day = await get_repair_request_day(database, repair_request_id)
+    if day is not None:
+        await refresh_daily_stats(database, day, day)
+
+async def backfill_daily_stats(database: AsyncSession, chunk_days: int = 31) -> int:
+    first_day, last_day = (await database.execute(select(func.min(request_day), func.max(request_day)))).one()
+    if first_day is None:
+        await database.execute(delete(RepairRequestDailyStat))
+        await database.commit()
+        return 0
+
+    await database.execute(
+        delete(RepairRequestDailyStat)
+        .where((RepairRequestDailyStat.day < first_day) | (RepairRequestDailyStat.day > last_day))
+    )
+
+    chunks = 0
+    while first_day <= last_day:
+        chunk_end = min(first_day + timedelta(days=chunk_days - 1), last_day)
+        await refresh_daily_stats(database, first_day, chunk_end)
+        await database.commit()
+        first_day = chunk_end + timedelta(days=1)
+        chunks += 1
+    return chunks
+
+async def main() -> None:
+    async with session_factory() as session:
+        chunks = await backfill_daily_stats(session)
+    print(f"Rebuilt repair request daily statistics in {chunks} chunk(s)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
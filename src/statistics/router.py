@@ -1,25 +1,37 @@
-from datetime import date, datetime
+from datetime import datetime
 from typing import Annotated, Optional, List
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, Query
 from starlette.responses import StreamingResponse
 
 from src.auth.dependencies import allowed
 from src.auth.schemas import Role
+from src.config import SettingsDep, get_settings
 from src.database import DatabaseSession
-from src.statistics.models import StatisticsTimeStep, TimeFrame, StatisticsResponse, StatisticsFilters
+from src.decorators import domain_errors
+from src.statistics.errors import error_map
+from src.statistics.jobs import ExportJobServices
+from src.statistics.models import StatisticsTimeStep, TimeFrame, StatisticsResponse, StatisticsFilters, ExportFormat, ExportJobInfo
 from src.statistics.services import StatisticsServices
 
 router = APIRouter(prefix="/statistics", tags=["Statistics"])
 
+settings = get_settings()
+export_jobs = ExportJobServices(
+    static_files_dir=settings.static_files_dir,
+    proxy_url_to_static_files_dir=settings.proxy_url_to_static_files_dir,
+    ttl=settings.statistics_export_ttl,
+    heartbeat_timeout=settings.statistics_export_heartbeat_timeout,
+)
+
 def get_time_frame(
         from_date: Optional[datetime] = Query(None),
         to_date: Optional[datetime] = Query(None),
         step: StatisticsTimeStep = Query(default=StatisticsTimeStep.month),
 ) -> TimeFrame:
     return TimeFrame(
-        from_date=from_date or date.min,
-        to_date=to_date or date.max,
+        from_date=from_date,
+        to_date=to_date,
         step=step,
     )
 
@@ -39,13 +51,44 @@ def get_filters(
 @router.get("/", response_model=StatisticsResponse)
 async def get_statistics_endpoint(
         database: DatabaseSession,
+        settings: SettingsDep,
         filters: Annotated[StatisticsFilters, Depends(get_filters)]
 ) -> StatisticsResponse:
-    return await StatisticsServices.get_dashboard(database=database, data=filters)
+    return await StatisticsServices.get_dashboard(
+        database=database,
+        data=filters,
+        max_connections=settings.statistics_dashboard_connections,
+    )
 
 @router.get("/export-excel")
 async def export_statistics_excel(
         database: DatabaseSession,
-        filters: Annotated[StatisticsFilters, Depends(get_filters)]
+        filters: Annotated[StatisticsFilters, Depends(get_filters)],
+        export_format: ExportFormat = Query(default=ExportFormat.xlsx, alias="format"),
 ) -> StreamingResponse:
-    return await StatisticsServices.export_statistics_excel(database=database, filters=filters)
+    return await StatisticsServices.export_statistics(database=database, filters=filters, export_format=export_format)
+
+
+@router.post("/exports", response_model=ExportJobInfo, status_code=202)
+async def create_export_job_endpoint(
+        database: DatabaseSession,
+        background_tasks: BackgroundTasks,
+        _: Annotated[None, Depends(allowed(role=Role.manager))],
+        filters: Annotated[StatisticsFilters, Depends(get_filters)],
+        export_format: ExportFormat = Query(default=ExportFormat.xlsx, alias="format"),
+) -> ExportJobInfo:
+    return await export_jobs.enqueue(
+        database=database,
+        filters=filters,
+        export_format=export_format,
+        background_tasks=background_tasks,
+    )
+
+@router.get("/exports/{id_}", response_model=ExportJobInfo)
+@domain_errors(error_map)
+async def get_export_job_endpoint(
+        id_: int,
+        database: DatabaseSession,
+        _: Annotated[None, Depends(allowed(role=Role.manager))],
+) -> ExportJobInfo:
+    return await export_jobs.get(database=database, id_=id_)
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+from typing import Any
+
+from sqlalchemy import Index, JSON, DateTime, func, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.database import BaseDatabaseModel
+from src.statistics.models import ExportFormat, ExportJobStatus
+
+
+class RepairRequestDailyStat(BaseDatabaseModel):
+    """
+    Repair requests pre-aggregated per (day, institution, equipment model, failure type).
+    Rows with an empty failure type hold the totals for every request once, rows with
+    a failure type repeat the request for each of its failure types.
+    """
+    __tablename__ = "repair_request_daily_stat"
+    __table_args__ = (
+        Index("ix_repair_request_daily_stat_day", "day", "failure_type_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    day: Mapped[date] = mapped_column()
+
+    institution_id: Mapped[int | None] = mapped_column(nullable=True)
+    equipment_model_id: Mapped[int | None] = mapped_column(nullable=True)
+    failure_type_id: Mapped[int | None] = mapped_column(nullable=True)
+
+    request_count: Mapped[int] = mapped_column()
+    completed_count: Mapped[int] = mapped_column()
+    repair_seconds: Mapped[float] = mapped_column()
+    spare_part_quantity: Mapped[int] = mapped_column()
+
+# Jobs that are still being built, at most one per filters hash.
+ACTIVE_EXPORT_JOB = text("status IN ('pending', 'running')")
+
+class ExportJob(BaseDatabaseModel):
+    __tablename__ = "statistics_export_job"
+    __table_args__ = (
+        Index("ix_statistics_export_job_filters_hash", "filters_hash"),
+        Index("uq_statistics_export_job_active_filters_hash", "filters_hash", unique=True, postgresql_where=ACTIVE_EXPORT_JOB),
+        Index("ix_statistics_export_job_expires_at", "expires_at"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    filters_hash: Mapped[str] = mapped_column()
+    filters: Mapped[dict[str, Any]] = mapped_column(JSON)
+    format: Mapped[ExportFormat] = mapped_column()
+    status: Mapped[ExportJobStatus] = mapped_column()
+
+    rows_written: Mapped[int] = mapped_column(default=0)
+    file_name: Mapped[str] = mapped_column(unique=True)
+    error: Mapped[str | None] = mapped_column(nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    # Moved forward by every state change and progress update of the worker.
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
@@ -1,14 +1,15 @@
+import asyncio
 import datetime
 import math
-from io import BytesIO
-from typing import Any
+import tempfile
+from typing import Any, AsyncIterator, Awaitable, Callable
 
-import pandas
-from sqlalchemy import select, func, desc, and_
+from sqlalchemy import select, func, desc, and_, Select, Row
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from starlette.responses import StreamingResponse
 
+from src.database import session_factory
 from src.equipment.schemas import Equipment, EquipmentStatus
 from src.equipment_category.schemas import EquipmentCategory
 from src.equipment_model.schemas import EquipmentModel
@@ -18,7 +19,12 @@ from src.manufacturer.schemas import Manufacturer
 from src.repair_request.schemas import RepairRequest, UsedSparePart, Urgency, RepairRequestStatus
 from src.spare_part.schemas import SparePart, StockStatus, Location
 from src.spare_part_category.schemas import SparePartCategory
-from src.statistics.models import StatisticsResponse, EquipmentBreakdownItem, CategoricalChartDataItem, TimelinePoint, StatisticsFilters
+from src.statistics.cache import statistics_cache, statistics_cache_key
+from src.statistics.export import EXPORT_BATCH_SIZE, Sheet, write_xlsx, iterate_file, stream_csv_zip, write_parquet_zip
+from src.statistics.filters import time_frame_conditions, daily_stat_conditions
+from src.statistics.rollup import ROLLUP_STEPS
+from src.statistics.schemas import RepairRequestDailyStat
+from src.statistics.models import StatisticsResponse, EquipmentBreakdownItem, CategoricalChartDataItem, TimelinePoint, StatisticsFilters, ExportFormat
 
 class StatisticsServices:
     @staticmethod
@@ -30,9 +36,7 @@ class StatisticsServices:
             .join(RepairRequest, RepairRequest.equipment_id == Equipment.id)
         )
 
-        from_date = func.date_trunc(data.time_frame.step, data.time_frame.from_date)
-        to_date = func.date_trunc(data.time_frame.step, data.time_frame.to_date)
-        filters = [func.date_trunc(data.time_frame.step, RepairRequest.created_at).between(from_date, to_date)]
+        filters = time_frame_conditions(RepairRequest.created_at, data.time_frame)
 
         if data.institution_ids:
             filters.append(Institution.id.in_(data.institution_ids))
@@ -47,7 +51,7 @@ class StatisticsServices:
             filters.append(FailureType.id.in_(data.failure_type_ids))
 
         query = query.where(*filters)
-        query = query.group_by(Institution.id).order_by(desc("breakdown_count")).limit(limit)
+        query = query.group_by(Institution.id).order_by(desc("breakdown_count"), Institution.id).limit(limit)
         query_institution = await database.execute(query)
 
         return [CategoricalChartDataItem(label=row[0], value=row[1]) for row in query_institution.all()]
@@ -61,9 +65,7 @@ class StatisticsServices:
             .join(RepairRequest, FailureTypeRepairRequest.repair_request_id == RepairRequest.id)
         )
 
-        from_date = func.date_trunc(data.time_frame.step, data.time_frame.from_date)
-        to_date = func.date_trunc(data.time_frame.step, data.time_frame.to_date)
-        filters = [func.date_trunc(data.time_frame.step, RepairRequest.created_at).between(from_date, to_date)]
+        filters = time_frame_conditions(RepairRequest.created_at, data.time_frame)
 
         if data.institution_ids or data.equipment_model_ids:
             query = query.join(Equipment, Equipment.id == RepairRequest.equipment_id)
@@ -80,7 +82,7 @@ class StatisticsServices:
             filters.append(FailureType.id.in_(data.failure_type_ids))
 
         query = query.where(*filters)
-        query = query.group_by(FailureType.id).order_by(desc("count")).limit(limit)
+        query = query.group_by(FailureType.id).order_by(desc("count"), FailureType.id).limit(limit)
         query_failure_types = await database.execute(query)
 
         return [CategoricalChartDataItem(label=row[0], value=row[1]) for row in query_failure_types.all()]
@@ -94,9 +96,7 @@ class StatisticsServices:
             .join(RepairRequest, Equipment.id == RepairRequest.equipment_id)
         )
 
-        from_date = func.date_trunc(data.time_frame.step, data.time_frame.from_date)
-        to_date = func.date_trunc(data.time_frame.step, data.time_frame.to_date)
-        filters = [func.date_trunc(data.time_frame.step, RepairRequest.created_at).between(from_date, to_date)]
+        filters = time_frame_conditions(RepairRequest.created_at, data.time_frame)
 
         if data.institution_ids:
             query = query.join(Institution, Institution.id == Equipment.institution_id)
@@ -111,7 +111,7 @@ class StatisticsServices:
             filters.append(FailureType.id.in_(data.failure_type_ids))
 
         query = query.where(*filters)
-        query = query.group_by(EquipmentModel.id).order_by(desc("count")).limit(limit)
+        query = query.group_by(EquipmentModel.id).order_by(desc("count"), EquipmentModel.id).limit(limit)
         query_equipment_models = await database.execute(query)
 
         return [CategoricalChartDataItem(label=row[0], value=row[1]) for row in query_equipment_models.all()]
@@ -125,9 +125,7 @@ class StatisticsServices:
             .join(RepairRequest, UsedSparePart.repair_request_id == RepairRequest.id)
         )
 
-        from_date = func.date_trunc(data.time_frame.step, data.time_frame.from_date)
-        to_date = func.date_trunc(data.time_frame.step, data.time_frame.to_date)
-        filters = [func.date_trunc(data.time_frame.step, RepairRequest.created_at).between(from_date, to_date)]
+        filters = time_frame_conditions(RepairRequest.created_at, data.time_frame)
 
         if data.institution_ids or data.equipment_model_ids:
             query = query.join(Equipment, Equipment.id == RepairRequest.equipment_id)
@@ -146,7 +144,7 @@ class StatisticsServices:
             filters.append(FailureType.id.in_(data.failure_type_ids))
 
         query = query.where(*filters)
-        query = query.group_by(SparePart.name).order_by(desc("count")).limit(limit)
+        query = query.group_by(SparePart.name).order_by(desc("count"), SparePart.name).limit(limit)
         query_used_spare_parts = await database.execute(query)
 
         return [CategoricalChartDataItem(label=row[0], value=row[1]) for row in query_used_spare_parts]
@@ -156,9 +154,7 @@ class StatisticsServices:
         time_col = func.date_trunc(data.time_frame.step, RepairRequest.created_at)
         query = (select(time_col.label("time_slot"), func.count(RepairRequest.id)))
 
-        from_date = func.date_trunc(data.time_frame.step, data.time_frame.from_date)
-        to_date = func.date_trunc(data.time_frame.step, data.time_frame.to_date)
-        filters = [func.date_trunc(data.time_frame.step, RepairRequest.created_at).between(from_date, to_date)]
+        filters = time_frame_conditions(RepairRequest.created_at, data.time_frame)
 
         if data.institution_ids or data.equipment_model_ids:
             query = query.join(Equipment, Equipment.id == RepairRequest.equipment_id)
@@ -194,11 +190,8 @@ class StatisticsServices:
             .join(RepairRequest, RepairRequest.equipment_id == Equipment.id)
         )
 
-        from_date = func.date_trunc(data.time_frame.step, data.time_frame.from_date)
-        to_date = func.date_trunc(data.time_frame.step, data.time_frame.to_date)
-
         filters = [
-            func.date_trunc(data.time_frame.step, RepairRequest.created_at).between(from_date, to_date),
+            *time_frame_conditions(RepairRequest.created_at, data.time_frame),
             RepairRequest.completed_at.is_not(None)
         ]
 
@@ -215,7 +208,7 @@ class StatisticsServices:
             filters.append(FailureType.id.in_(data.failure_type_ids))
 
         query = query.where(*filters)
-        query = query.group_by(Institution.name).order_by(desc("average")).limit(limit)
+        query = query.group_by(Institution.name).order_by(desc("average"), Institution.name).limit(limit)
         result = await database.execute(query)
         return [CategoricalChartDataItem(label=row[0], value=row[1].total_seconds()) for row in result.all()]
 
@@ -235,9 +228,7 @@ class StatisticsServices:
             .join(RepairRequest, RepairRequest.equipment_id == Equipment.id)
         )
 
-        from_date = func.date_trunc(data.time_frame.step, data.time_frame.from_date)
-        to_date = func.date_trunc(data.time_frame.step, data.time_frame.to_date)
-        filters = [func.date_trunc(data.time_frame.step, RepairRequest.created_at).between(from_date, to_date)]
+        filters = time_frame_conditions(RepairRequest.created_at, data.time_frame)
 
         if data.institution_ids:
             filters.append(Institution.id.in_(data.institution_ids))
@@ -251,7 +242,7 @@ class StatisticsServices:
             filters.append(FailureType.id.in_(data.failure_type_ids))
 
         query = query.where(*filters)
-        query = query.group_by(Equipment.id, Equipment.serial_number, EquipmentModel.name, Institution.name).order_by(desc("breakdown_count")).limit(limit)
+        query = query.group_by(Equipment.id, Equipment.serial_number, EquipmentModel.name, Institution.name).order_by(desc("breakdown_count"), Equipment.id).limit(limit)
         result = await database.execute(query)
         return [
             EquipmentBreakdownItem(
@@ -265,20 +256,137 @@ class StatisticsServices:
         ]
 
     @staticmethod
-    async def get_dashboard(database: AsyncSession, data: StatisticsFilters, limit: int = 7) -> StatisticsResponse:
-        return StatisticsResponse(
-            institution_breakdown=await StatisticsServices.get_institution(database, data, limit),
-            failure_types=await StatisticsServices.get_failure_types(database, data, limit),
-            used_spare_parts=await StatisticsServices.get_used_spare_parts(database, data, limit),
-            model_breakdowns=await StatisticsServices.get_equipment_models(database, data, limit),
-            time_dynamics=await StatisticsServices.get_time_dynamic(database, data, limit),
-            average_repair_time=await StatisticsServices.get_average_repair_time(database, data, limit),
-            equipment_breakdowns=await StatisticsServices.get_equipment_breakdowns(database, data, limit),
-            time_frame=data.time_frame,
+    async def get_institution_from_rollup(database: AsyncSession, data: StatisticsFilters, limit: int) -> list[CategoricalChartDataItem]:
+        query = (
+            select(Institution.name, func.sum(RepairRequestDailyStat.request_count).label("breakdown_count"))
+            .select_from(RepairRequestDailyStat)
+            .join(Institution, Institution.id == RepairRequestDailyStat.institution_id)
+            .where(*daily_stat_conditions(data))
+            .group_by(Institution.id)
+            .order_by(desc("breakdown_count"), Institution.id)
+            .limit(limit)
+        )
+        result = await database.execute(query)
+        return [CategoricalChartDataItem(label=row[0], value=row[1]) for row in result.all()]
+
+    @staticmethod
+    async def get_failure_types_from_rollup(database: AsyncSession, data: StatisticsFilters, limit: int) -> list[CategoricalChartDataItem]:
+        query = (
+            select(FailureType.name, func.sum(RepairRequestDailyStat.request_count).label("count"))
+            .select_from(RepairRequestDailyStat)
+            .join(FailureType, FailureType.id == RepairRequestDailyStat.failure_type_id)
+            .where(*daily_stat_conditions(data, by_failure_type=True))
+            .group_by(FailureType.id)
+            .order_by(desc("count"), FailureType.id)
+            .limit(limit)
+        )
+        result = await database.execute(query)
+        return [CategoricalChartDataItem(label=row[0], value=row[1]) for row in result.all()]
+
+    @staticmethod
+    async def get_equipment_models_from_rollup(database: AsyncSession, data: StatisticsFilters, limit: int) -> list[CategoricalChartDataItem]:
+        query = (
+            select(EquipmentModel.name, func.sum(RepairRequestDailyStat.request_count).label("count"))
+            .select_from(RepairRequestDailyStat)
+            .join(EquipmentModel, EquipmentModel.id == RepairRequestDailyStat.equipment_model_id)
+            .where(*daily_stat_conditions(data))
+            .group_by(EquipmentModel.id)
+            .order_by(desc("count"), EquipmentModel.id)
+            .limit(limit)
+        )
+        result = await database.execute(query)
+        return [CategoricalChartDataItem(label=row[0], value=row[1]) for row in result.all()]
+
+    @staticmethod
+    async def get_time_dynamic_from_rollup(database: AsyncSession, data: StatisticsFilters, limit: int) -> list[TimelinePoint]:
+        time_col = func.date_trunc(data.time_frame.step, RepairRequestDailyStat.day)
+        query = (
+            select(time_col.label("time_slot"), func.sum(RepairRequestDailyStat.request_count))
+            .where(*daily_stat_conditions(data))
+            .group_by("time_slot")
+            .order_by("time_slot")
+        )
+        result = await database.execute(query)
+        return [TimelinePoint(period=row[0], count=row[1]) for row in result.all()]
+
+    @staticmethod
+    async def get_average_repair_time_from_rollup(database: AsyncSession, data: StatisticsFilters, limit: int) -> list[CategoricalChartDataItem]:
+        average = func.sum(RepairRequestDailyStat.repair_seconds) / func.sum(RepairRequestDailyStat.completed_count)
+        query = (
+            select(Institution.name, average.label("average"))
+            .select_from(RepairRequestDailyStat)
+            .join(Institution, Institution.id == RepairRequestDailyStat.institution_id)
+            .where(*daily_stat_conditions(data), RepairRequestDailyStat.completed_count > 0)
+            .group_by(Institution.name)
+            .order_by(desc("average"), Institution.name)
+            .limit(limit)
         )
+        result = await database.execute(query)
+        return [CategoricalChartDataItem(label=row[0], value=row[1]) for row in result.all()]
+
+    @staticmethod
+    async def get_dashboard(database: AsyncSession, data: StatisticsFilters, limit: int = 7, max_connections: int = 1) -> StatisticsResponse:
+        key = statistics_cache_key(data, limit)
+        cached = statistics_cache.get(key)
+        if cached is not None:
+            return cached.model_copy(update={"time_frame": data.time_frame})
+
+        widgets = {
+            "institution_breakdown": StatisticsServices.get_institution,
+            "failure_types": StatisticsServices.get_failure_types,
+            "used_spare_parts": StatisticsServices.get_used_spare_parts,
+            "model_breakdowns": StatisticsServices.get_equipment_models,
+            "time_dynamics": StatisticsServices.get_time_dynamic,
+            "average_repair_time": StatisticsServices.get_average_repair_time,
+            "equipment_breakdowns": StatisticsServices.get_equipment_breakdowns,
+        }
+
+        # Spare parts and single equipment are not dimensions of the daily rollup,
+        # those widgets always read the raw tables.
+        if data.time_frame.step in ROLLUP_STEPS:
+            widgets.update({
+                "institution_breakdown": StatisticsServices.get_institution_from_rollup,
+                "failure_types": StatisticsServices.get_failure_types_from_rollup,
+                "model_breakdowns": StatisticsServices.get_equipment_models_from_rollup,
+                "time_dynamics": StatisticsServices.get_time_dynamic_from_rollup,
+                "average_repair_time": StatisticsServices.get_average_repair_time_from_rollup,
+            })
+
+        if max_connections > 1:
+            results = await StatisticsServices.run_widgets_concurrently(widgets, data, limit, max_connections)
+        else:
+            results = {name: await widget(database, data, limit) for name, widget in widgets.items()}
+
+        response = StatisticsResponse(**results, time_frame=data.time_frame)
+        statistics_cache.set(key, response)
+        return response
+
+    @staticmethod
+    async def run_widgets_concurrently(
+            widgets: dict[str, Callable[[AsyncSession, StatisticsFilters, int], Awaitable[Any]]],
+            data: StatisticsFilters,
+            limit: int,
+            max_connections: int,
+    ) -> dict[str, Any]:
+        # An AsyncSession cannot run queries in parallel, so every widget takes
+        # its own pooled connection, at most max_connections at a time.
+        semaphore = asyncio.Semaphore(max_connections)
+
+        async def run(widget: Callable[[AsyncSession, StatisticsFilters, int], Awaitable[Any]]) -> Any:
+            async with semaphore, session_factory() as session:
+                return await widget(session, data, limit)
+
+        results = await asyncio.gather(*(run(widget) for widget in widgets.values()))
+        return dict(zip(widgets, results))
+
+    @staticmethod
+    async def stream_rows(database: AsyncSession, query: Select) -> AsyncIterator[Row]:
+        result = await database.stream(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for row in result:
+            yield row
 
     @staticmethod
-    async def generate_repair_request_sheet(database: AsyncSession) -> Any:
+    def generate_repair_request_sheet(database: AsyncSession) -> Sheet:
         query = (
             select(
                 RepairRequest.id,
@@ -297,8 +405,6 @@ class StatisticsServices:
             .order_by(RepairRequest.created_at.desc())
         )
 
-        repair_requests = (await database.execute(query)).all()
-
         status_map = {
             RepairRequestStatus.not_taken.value: "Новий",
             RepairRequestStatus.in_progress.value: "У роботі",
@@ -306,27 +412,40 @@ class StatisticsServices:
             RepairRequestStatus.finished.value: "Виконано"
         }
 
-        return [
-            {
-                "ID": item[0],
-                "Модель обладнання": item[5],
-                "Серійний номер": item[8],
-                "Заклад": item[6],
-                "Локація": item[7],
-                "Пріоритет": "Звичайний" if item[1] == Urgency.non_critical.value else "Критичний",
-                "Статус": status_map.get(item[4], "Невідомо"),
-                "Дата створення": item[2].replace(tzinfo=None),
-                "Дата завершення": item[3].replace(tzinfo=None) if item[3] else None,
-                "Час ремонту (сек)": (
-                    math.floor((item[3] - item[2]).total_seconds())
-                    if item[2] and item[3]
-                    else None
+        async def rows() -> AsyncIterator[tuple]:
+            async for item in StatisticsServices.stream_rows(database, query):
+                yield (
+                    item[0],
+                    item[5],
+                    item[8],
+                    item[6],
+                    item[7],
+                    "Звичайний" if item[1] == Urgency.non_critical.value else "Критичний",
+                    status_map.get(item[4], "Невідомо"),
+                    item[2].replace(tzinfo=None),
+                    item[3].replace(tzinfo=None) if item[3] else None,
+                    math.floor((item[3] - item[2]).total_seconds()) if item[2] and item[3] else None,
                 )
-            } for item in repair_requests
-        ]
+
+        return Sheet(
+            columns=[
+                "ID",
+                "Модель обладнання",
+                "Серійний номер",
+                "Заклад",
+                "Локація",
+                "Пріоритет",
+                "Статус",
+                "Дата створення",
+                "Дата завершення",
+                "Час ремонту (сек)",
+            ],
+            types=[int, str, str, str, str, str, str, datetime.datetime, datetime.datetime, int],
+            rows=rows(),
+        )
 
     @staticmethod
-    async def generate_spare_part_sheet(database: AsyncSession) -> Any:
+    def generate_spare_part_sheet(database: AsyncSession) -> Sheet:
         query = (
             select(
                 SparePart.id,
@@ -342,25 +461,24 @@ class StatisticsServices:
             .order_by(SparePart.name)
         )
 
-        items = await database.execute(query)
-
         stock_status_map = {
             StockStatus.in_stock.value: "Є в наявності",
             StockStatus.low_stock.value: "Мало",
             StockStatus.out_of_stock.value: "Немає",
         }
 
-        return [{
-            "ID": item[0],
-            "Назва запчастини": item[1],
-            "Категорія": item[2],
-            "Загальна кількість": item[3],
-            "Мінімальна кількість": item[4],
-            "Статус складу": stock_status_map.get(item[5], "Невідомо"),
-        } for item in items.all()]
+        async def rows() -> AsyncIterator[tuple]:
+            async for item in StatisticsServices.stream_rows(database, query):
+                yield item[0], item[1], item[2], item[3], item[4], stock_status_map.get(item[5], "Невідомо")
+
+        return Sheet(
+            columns=["ID", "Назва запчастини", "Категорія", "Загальна кількість", "Мінімальна кількість", "Статус складу"],
+            types=[int, str, str, int, int, str],
+            rows=rows(),
+        )
 
     @staticmethod
-    async def generate_spare_part_locations_sheet(database: AsyncSession) -> Any:
+    def generate_spare_part_locations_sheet(database: AsyncSession) -> Sheet:
         query = (
             select(
                 SparePart.name,
@@ -372,15 +490,14 @@ class StatisticsServices:
             .order_by(SparePart.name, Location.quantity.desc())
         )
 
-        items = await database.execute(query)
-        return [{
-            "Запчастина": item[0],
-            "Заклад": item[2],
-            "Кількість": item[1],
-        } for item in items.all()]
+        async def rows() -> AsyncIterator[tuple]:
+            async for item in StatisticsServices.stream_rows(database, query):
+                yield item[0], item[2], item[1]
+
+        return Sheet(columns=["Запчастина", "Заклад", "Кількість"], types=[str, str, int], rows=rows())
 
     @staticmethod
-    async def generate_equipment_sheet(database: AsyncSession) -> Any:
+    def generate_equipment_sheet(database: AsyncSession) -> Sheet:
         query = (
             select(
                 Equipment.id,
@@ -399,57 +516,64 @@ class StatisticsServices:
             .order_by(EquipmentModel.name)
         )
 
-        items = await database.execute(query)
-
         equipment_status_map = {
             EquipmentStatus.working.value: "Робоче",
             EquipmentStatus.under_maintenance.value: "На обслуговуванні",
             EquipmentStatus.not_working.value: "Не працює",
         }
 
-        return [{
-            "ID": item[0],
-            "Модель": item[1],
-            "Серійний номер": item[2],
-            "Категорія": item[3],
-            "Виробник": item[4],
-            "Заклад": item[5],
-            "Локація": item[6],
-            "Статус": equipment_status_map.get(item[7], "Невідомий")
-        } for item in items]
+        async def rows() -> AsyncIterator[tuple]:
+            async for item in StatisticsServices.stream_rows(database, query):
+                yield *item[:7], equipment_status_map.get(item[7], "Невідомий")
 
-    @staticmethod
-    async def export_statistics_excel(database: AsyncSession, filters: StatisticsFilters) -> StreamingResponse:
-        dashboard = await StatisticsServices.get_dashboard(database, filters, limit=100)
+        return Sheet(
+            columns=["ID", "Модель", "Серійний номер", "Категорія", "Виробник", "Заклад", "Локація", "Статус"],
+            types=[int, str, str, str, str, str, str, str],
+            rows=rows(),
+        )
 
-        sheets = {
-            "Заявки": await StatisticsServices.generate_repair_request_sheet(database),
-            "Запчастини": await StatisticsServices.generate_spare_part_sheet(database),
-            "Запчастини розміщення": await StatisticsServices.generate_spare_part_locations_sheet(database),
-            "Обладнання": await StatisticsServices.generate_equipment_sheet(database),
+    @staticmethod
+    def generate_sheets(database: AsyncSession) -> dict[str, Sheet]:
+        return {
+            "Заявки": StatisticsServices.generate_repair_request_sheet(database),
+            "Запчастини": StatisticsServices.generate_spare_part_sheet(database),
+            "Запчастини розміщення": StatisticsServices.generate_spare_part_locations_sheet(database),
+            "Обладнання": StatisticsServices.generate_equipment_sheet(database),
         }
 
-        output = BytesIO()
+    @staticmethod
+    async def export_statistics_excel(database: AsyncSession, filters: StatisticsFilters) -> StreamingResponse:
+        # Rows go from server-side cursors into a write-only workbook backed by a
+        # temporary file, which is then sent in chunks.
+        output = tempfile.TemporaryFile()
+        try:
+            await write_xlsx(StatisticsServices.generate_sheets(database), output)
+        except BaseException:
+            output.close()
+            raise
 
-        with pandas.ExcelWriter(output, engine="openpyxl") as writer:
-            for sheet_name, data in sheets.items():
-                df = pandas.DataFrame(data)
+        return StreamingResponse(
+            iterate_file(output),
+            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            headers={"Content-Disposition": "attachment; filename=statistics.xlsx"}
+        )
 
-                for col in df.columns:
-                    if pandas.api.types.is_datetime64_any_dtype(df[col]):
-                        df[col] = df[col].dt.tz_localize(None)
+    @staticmethod
+    async def export_statistics(database: AsyncSession, filters: StatisticsFilters, export_format: ExportFormat) -> StreamingResponse:
+        if export_format == ExportFormat.xlsx:
+            return await StatisticsServices.export_statistics_excel(database, filters)
 
-                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        headers = {"Content-Disposition": f"attachment; filename=statistics-{export_format.value}.zip"}
+        sheets = StatisticsServices.generate_sheets(database)
 
-                worksheet = writer.sheets[sheet_name]
-                for i, col in enumerate(df.columns):
-                    max_len = max(df[col].astype(str).map(len).max(), len(col))
-                    worksheet.column_dimensions[worksheet.cell(row=1, column=i + 1).column_letter].width = max_len + 2
+        if export_format == ExportFormat.csv:
+            return StreamingResponse(stream_csv_zip(sheets), media_type="application/zip", headers=headers)
 
-        output.seek(0)
+        output = tempfile.TemporaryFile()
+        try:
+            await write_parquet_zip(sheets, output)
+        except BaseException:
+            output.close()
+            raise
 
-        return StreamingResponse(
-            output,
-            media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            headers={"Content-Disposition": "attachment; filename=statistics.xlsx"}
-        )
+        return StreamingResponse(iterate_file(output), media_type="application/zip", headers=headers)
@@ -1,63 +1,50 @@
-from sqlalchemy import select, func, and_, or_, case
-from sqlalchemy.orm import aliased
+from sqlalchemy import select, func
 
-from src.auth.schemas import User, Role
 from src.equipment.schemas import Equipment, EquipmentStatus
-from src.institution.schemas import Institution
-from src.repair_request.schemas import RepairRequestStatus, RepairRequestStatusRecord, RepairRequest
-from src.spare_part.schemas import SparePart, Location, StockStatus
-from src.summary.models import UserSummary, InstitutionSummary, EquipmentSummary, SparePartSummary, RepairRequestSummary
+from src.repair_request.schemas import RepairRequestStatus, RepairRequest
+from src.spare_part.schemas import SparePart, StockStatus
+from src.summary.models import EquipmentSummary, SparePartSummary, RepairRequestSummary
 
 
-equipment_rules = {
-    "total": lambda db: db.scalar(select(func.count()).select_from(Equipment)),
-    "working": lambda db: db.scalar(select(func.count()).select_from(Equipment).where(Equipment.status == EquipmentStatus.working.value)),
-    "under_maintenance": lambda db: db.scalar(select(func.count()).select_from(Equipment).where(Equipment.status == EquipmentStatus.under_maintenance.value)),
-    "not_working": lambda db: db.scalar(select(func.count()).select_from(Equipment).where(Equipment.status == EquipmentStatus.not_working.value)),
-}
-
-spare_part_rules = {
-    "total": lambda db: db.scalar(select(func.count()).select_from(SparePart)),
-    "in_stock": lambda db: db.scalar(select(func.count()).select_from(SparePart).where(SparePart.stock_status == StockStatus.in_stock.value)),
-    "low_stock": lambda db: db.scalar(select(func.count()).select_from(SparePart).where(SparePart.stock_status == StockStatus.low_stock.value)),
-    "out_of_stock": lambda db: db.scalar(select(func.count()).select_from(SparePart).where(SparePart.stock_status == StockStatus.out_of_stock.value)),
-}
+equipment_query = (
+    select(
+        func.count().label("total"),
+        func.count().filter(Equipment.status == EquipmentStatus.working).label("working"),
+        func.count().filter(Equipment.status == EquipmentStatus.under_maintenance).label("under_maintenance"),
+        func.count().filter(Equipment.status == EquipmentStatus.not_working).label("not_working"),
+    )
+    .select_from(Equipment)
+)
 
-repair_part_rules = {
-    "new": lambda db: db.scalar(
-        select(func.count())
-        .select_from(RepairRequest)
-        .where(RepairRequest.last_status == RepairRequestStatus.not_taken.value)
-    ),
-    "in_progress": lambda db: db.scalar(
-        select(func.count())
-        .select_from(RepairRequest)
-        .where(RepairRequest.last_status == RepairRequestStatus.in_progress.value)
-    ),
-    "waiting_spare_parts": lambda db: db.scalar(
-        select(func.count())
-        .select_from(RepairRequest)
-        .where(RepairRequest.last_status == RepairRequestStatus.waiting_spare_parts.value)
-    ),
-    "finished": lambda db: db.scalar(
-        select(func.count())
-        .select_from(RepairRequest)
-        .where(RepairRequest.last_status == RepairRequestStatus.finished.value)
+spare_part_query = (
+    select(
+        func.count().label("total"),
+        func.count().filter(SparePart.stock_status == StockStatus.in_stock).label("in_stock"),
+        func.count().filter(SparePart.stock_status == StockStatus.low_stock).label("low_stock"),
+        func.count().filter(SparePart.stock_status == StockStatus.out_of_stock).label("out_of_stock"),
     )
-}
+    .select_from(SparePart)
+)
+
+repair_request_query = select(
+    func.count().filter(RepairRequest.last_status == RepairRequestStatus.not_taken).label("new"),
+    func.count().filter(RepairRequest.last_status == RepairRequestStatus.in_progress).label("in_progress"),
+    func.count().filter(RepairRequest.last_status == RepairRequestStatus.waiting_spare_parts).label("waiting_spare_parts"),
+    func.count().filter(RepairRequest.last_status == RepairRequestStatus.finished).label("finished"),
+).select_from(RepairRequest)
 
 
 SUMMARY_RULES = {
     "repair-requests": {
         "response_model": RepairRequestSummary,
-        "rules": repair_part_rules,
+        "query": repair_request_query,
     },
     "spare-parts": {
         "response_model": SparePartSummary,
-        "rules": spare_part_rules,
+        "query": spare_part_query,
     },
     "equipment": {
         "response_model": EquipmentSummary,
-        "rules": equipment_rules,
+        "query": equipment_query,
     },
 }
@@ -1,8 +1,11 @@
+from src.cache import TTLCache
 from src.database import DatabaseSession
 from src.exceptions import DomainError, DomainErrorCode
 from src.summary.models import SummaryResponse
 from src.summary.queries import SUMMARY_RULES
 
+# Dashboards poll these constantly, write paths clear the cache through GenericServices.caches.
+summary_cache: TTLCache[str, SummaryResponse] = TTLCache(ttl=10)
 
 class SummaryServices:
     @staticmethod
@@ -10,10 +13,14 @@ class SummaryServices:
         if schema not in SUMMARY_RULES:
             raise DomainError(code=DomainErrorCode.not_entity)
 
-        rules = SUMMARY_RULES[schema]["rules"]
+        cached = summary_cache.get(schema)
+        if cached is not None:
+            return cached
+
+        query = SUMMARY_RULES[schema]["query"]
         response_model = SUMMARY_RULES[schema]["response_model"]
 
-        result = {}
-        for rule_name, rule_func in rules.items():
-            result[rule_name] = await rule_func(database)
-        return response_model.model_validate(result)
\ No newline at end of file
+        result = (await database.execute(query)).mappings().one()
+        summary = response_model.model_validate(dict(result))
+        summary_cache.set(schema, summary)
+        return summary
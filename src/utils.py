@@ -1,26 +1,46 @@
-from typing import Type, Any
+import json
+from typing import Type, Any, Callable
 
-from sqlalchemy import Sequence, or_, select, and_
+from sqlalchemy import Sequence, or_, select, and_, Select, Executable, ClauseElement
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import joinedload, selectinload
 
 
+LOADER_STRATEGIES = {
+    "joined": joinedload,
+    "select": selectinload,
+}
+
+def parse_relation_part(part: str) -> tuple[str, str | None]:
+    name, _, strategy = part.partition(":")
+    if strategy and strategy not in LOADER_STRATEGIES:
+        raise ValueError(f"Unknown loader strategy '{strategy}' for relation '{name}'")
+    return name, strategy or None
+
+def choose_loader(attr: Any, strategy: str | None) -> Callable:
+    # Collections are loaded with a separate IN query so that sibling collections
+    # do not multiply the rows of the main query, scalar relations are joined.
+    if strategy is None:
+        strategy = "select" if attr.property.uselist else "joined"
+    return LOADER_STRATEGIES[strategy]
+
 def build_relation(model_type: Type, preload: Sequence[str]) -> list[Any]:
     options = []
 
     for rel in preload:
-        parts = rel.split(".")
+        loaders = []
+        current_model = model_type
 
-        attr = getattr(model_type, parts[0])
-        loader = joinedload(attr)
+        for part in rel.split("."):
+            name, strategy = parse_relation_part(part)
+            attr = getattr(current_model, name)
+            loaders.append(choose_loader(attr, strategy)(attr))
+            current_model = attr.property.mapper.class_
 
-        current_loader = loader
-        current_model = attr.property.mapper.class_
-
-        for part in parts[1:]:
-            sub_attr = getattr(current_model, part)
-            current_loader = current_loader.joinedload(sub_attr)
-            current_model = sub_attr.property.mapper.class_
+        current_loader = loaders[-1]
+        for loader in reversed(loaders[:-1]):
+            current_loader = loader.options(current_loader)
 
         options.append(current_loader)
 
@@ -112,3 +132,22 @@ async def validate_uniqueness(
     result = await database.execute(stmt)
     obj = result.scalars().first()
     return not bool(obj)
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, stmt: Select):
+        self.statement = stmt
+
+@compiles(Explain, "postgresql")
+def compile_explain(element: Explain, compiler, **kw) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+async def estimate_rows(stmt: Select, database: AsyncSession) -> int | None:
+    if database.bind.dialect.name != "postgresql":
+        return None
+
+    plan = (await database.execute(Explain(stmt))).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.equipment.schemas import Equipment
+from src.equipment_model.schemas import EquipmentModel
+from src.failure_type.schemas import FailureType, FailureTypeRepairRequest
+from src.institution.schemas import Institution
+from src.repair_request.schemas import RepairRequest, RepairRequestStatus, Urgency, UsedSparePart, File, RepairRequestStatusRecord
+from src.spare_part.schemas import SparePart, Location
+
+# The preloads of the repair request list endpoint.
+REPAIR_REQUEST_LIST_PRELOADS = [
+    "equipment",
+    "equipment.institution",
+    "equipment.equipment_model",
+    "equipment.equipment_category",
+    "failure_types",
+    "used_spare_parts",
+    "used_spare_parts.institution",
+    "used_spare_parts.spare_part",
+    "photos",
+    "status_history",
+    "status_history.assigned_engineer",
+]
+
+
+async def insert_rows(database: AsyncSession, model, rows: list[dict]) -> list[int]:
+    ids = (await database.execute(insert(model).returning(model.id), rows)).scalars().all()
+    await database.commit()
+    return list(ids)
+
+async def create_institutions(database: AsyncSession, count: int) -> list[int]:
+    return await insert_rows(database, Institution, [
+        {"name": f"Institution {i}", "address": f"Street {i}", "contact_email": f"institution{i}@example.com", "contact_phone": "+380680000001"}
+        for i in range(count)
+    ])
+
+async def create_equipment_models(database: AsyncSession, count: int) -> list[int]:
+    return await insert_rows(database, EquipmentModel, [{"name": f"Model {i}"} for i in range(count)])
+
+async def create_failure_types(database: AsyncSession, count: int) -> list[int]:
+    return await insert_rows(database, FailureType, [{"name": f"Failure {i}"} for i in range(count)])
+
+async def create_spare_parts(database: AsyncSession, count: int, min_quantity: int = 1) -> list[int]:
+    return await insert_rows(database, SparePart, [{"name": f"Spare part {i}", "min_quantity": min_quantity} for i in range(count)])
+
+async def create_locations(database: AsyncSession, spare_part_id: int, quantities: dict[int, int]) -> list[int]:
+    return await insert_rows(database, Location, [
+        {"spare_part_id": spare_part_id, "institution_id": institution_id, "quantity": quantity}
+        for institution_id, quantity in quantities.items()
+    ])
+
+async def create_equipment(database: AsyncSession, institution_id: int, equipment_model_id: int, count: int = 1) -> list[int]:
+    return await insert_rows(database, Equipment, [
+        {
+            "location": "Room 1",
+            "serial_number": f"SN-{institution_id}-{equipment_model_id}-{i}",
+            "installed": datetime(2024, 1, 1, tzinfo=timezone.utc),
+            "institution_id": institution_id,
+            "equipment_model_id": equipment_model_id,
+        }
+        for i in range(count)
+    ])
+
+def repair_request_row(equipment_id: int, created_at: datetime, issue: str = "Issue") -> dict:
+    return {
+        "issue": issue,
+        "urgency": Urgency.non_critical,
+        "last_status": RepairRequestStatus.not_taken,
+        "manager_note": "",
+        "engineer_note": "",
+        "equipment_id": equipment_id,
+        "created_at": created_at,
+    }
+
+async def create_repair_requests(database: AsyncSession, equipment_id: int, created_at: list[datetime]) -> list[int]:
+    return await insert_rows(database, RepairRequest, [
+        repair_request_row(equipment_id, moment, f"Issue {i}") for i, moment in enumerate(created_at)
+    ])
+
+async def create_loaded_repair_requests(
+        database: AsyncSession,
+        engineer_id: int,
+        count: int,
+        failure_types: int = 2,
+        used_parts: int = 2,
+        photos: int = 3,
+        status_records: int = 4,
+) -> list[int]:
+    """Repair requests with every collection of the list endpoint filled."""
+    institution_id, = await create_institutions(database, 1)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_id, = await create_equipment(database, institution_id, model_id)
+    start = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+    request_ids = await create_repair_requests(database, equipment_id, [start + timedelta(hours=i) for i in range(count)])
+    failure_type_ids = await create_failure_types(database, failure_types)
+    spare_part_ids = await create_spare_parts(database, used_parts)
+
+    await database.execute(insert(FailureTypeRepairRequest), [
+        {"repair_request_id": request_id, "failure_type_id": failure_type_id}
+        for request_id in request_ids for failure_type_id in failure_type_ids
+    ])
+    await database.execute(insert(UsedSparePart), [
+        {"repair_request_id": request_id, "spare_part_id": spare_part_id, "institution_id": institution_id, "quantity": 1, "note": ""}
+        for request_id in request_ids for spare_part_id in spare_part_ids
+    ])
+    await database.execute(insert(File), [
+        {"repair_request_id": request_id, "file_path": f"{request_id}-{i}.jpg"}
+        for request_id in request_ids for i in range(photos)
+    ])
+    await database.execute(insert(RepairRequestStatusRecord), [
+        {"repair_request_id": request_id, "status": RepairRequestStatus.not_taken, "assigned_engineer_id": engineer_id}
+        for request_id in request_ids for _ in range(status_records)
+    ])
+    await database.commit()
+    return request_ids
@@ -0,0 +1,44 @@
+from src.equipment_model.schemas import EquipmentModel
+from src.repository import CRUDRepository
+from tests.factories import create_spare_parts, create_locations, create_institutions
+
+
+async def test_association_writes_are_constant_round_trips(database, statements):
+    spare_part_ids = await create_spare_parts(database, 300)
+    repo = CRUDRepository(EquipmentModel)
+
+    statements.reset()
+    model = await repo.create({"name": "Model", "spare_parts": spare_part_ids[:290]}, database, preloads=["spare_parts"])
+    create_statements = statements.count
+    # INSERT model, INSERT associations, then SELECT model and its preload.
+    assert create_statements == 4
+    assert len(model.spare_parts) == 290
+
+    statements.reset()
+    model = await repo.update(model.id, {"spare_parts": spare_part_ids[100:]}, database, preloads=["spare_parts"])
+    update_statements = statements.count
+    # SELECT id, DELETE, INSERT, then SELECT model and its preload.
+    assert update_statements == 5
+    assert sorted(part.id for part in model.spare_parts) == spare_part_ids[100:]
+
+    statements.reset()
+    small = await repo.create({"name": "Small model", "spare_parts": spare_part_ids[:2]}, database, preloads=["spare_parts"])
+    assert statements.count == create_statements
+
+    statements.reset()
+    await repo.update(small.id, {"spare_parts": spare_part_ids[1:3]}, database, preloads=["spare_parts"])
+    assert statements.count == update_statements
+
+async def test_list_endpoint_statements_do_not_grow_with_page(client, database, statements):
+    institution_ids = await create_institutions(database, 3)
+    spare_part_ids = await create_spare_parts(database, 40)
+    for spare_part_id in spare_part_ids:
+        await create_locations(database, spare_part_id, {institution_id: 1 for institution_id in institution_ids})
+
+    async def count_statements(limit: int) -> int:
+        statements.reset()
+        response = await client.get("/api/spare-parts/", params={"limit": limit})
+        assert len(response.json()["items"]) == limit
+        return statements.count
+
+    assert await count_statements(2) == await count_statements(40)
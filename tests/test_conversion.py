@@ -0,0 +1,82 @@
+import time
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import update, select
+
+from src.auth.models import UserInfo
+from src.auth.repository import AuthRepository
+from src.auth.schemas import User
+from src.conversion import construct_model, requires_validation, to_models
+from src.equipment.models import EquipmentInfo
+from src.equipment.repository import EquipmentRepository
+from src.institution.models import InstitutionInfo
+from src.institution.schemas import Institution
+from src.repair_request.models import RepairRequestInfo
+from src.repair_request.schemas import RepairRequest
+from src.spare_part.models import SparePartInfo
+from src.spare_part.repository import SparePartRepository
+from src.utils import build_relation
+from tests.factories import (
+    create_institutions, create_equipment_models, create_equipment, create_spare_parts, create_locations,
+    REPAIR_REQUEST_LIST_PRELOADS, create_loaded_repair_requests,
+)
+
+
+def validated(info_type, row):
+    return info_type.model_validate(row.__dict__, from_attributes=True)
+
+def test_requires_validation():
+    assert requires_validation(UserInfo)
+    assert requires_validation(InstitutionInfo)
+    assert not requires_validation(EquipmentInfo)
+    assert not requires_validation(SparePartInfo)
+
+async def test_normalizing_types_match_validation(database, manager):
+    institution_id, = await create_institutions(database, 1)
+    await database.execute(update(User).where(User.id == manager.id).values(phone_number="tel:+380-68-000-0001", workplace_id=institution_id))
+    await database.execute(update(Institution).values(contact_phone="tel:+380-68-000-0002"))
+    await database.commit()
+
+    row = await AuthRepository().get(manager.id, database, preloads=["workplace"])
+    user = construct_model(UserInfo, row)
+
+    assert user == validated(UserInfo, row)
+    assert user.phone_number == "+380680000001"
+    assert user.workplace.contact_phone == "+380680000002"
+
+async def test_constructed_models_match_validation(database):
+    institution_ids = await create_institutions(database, 2)
+    model_id, = await create_equipment_models(database, 1)
+    await create_equipment(database, institution_ids[0], model_id, count=2)
+    spare_part_ids = await create_spare_parts(database, 2)
+    await create_locations(database, spare_part_ids[0], {institution_ids[0]: 3, institution_ids[1]: 1})
+
+    equipment = (await EquipmentRepository().fetch(database, preloads=["equipment_model", "institution"])).items
+    assert to_models(EquipmentInfo, equipment) == [validated(EquipmentInfo, row) for row in equipment]
+
+    spare_parts = (await SparePartRepository().fetch(database, preloads=["compatible_models", "locations", "locations.institution", "spare_part_category"])).items
+    assert to_models(SparePartInfo, spare_parts) == [validated(SparePartInfo, row) for row in spare_parts]
+
+def best_time(convert, rows) -> tuple[list, float]:
+    timings = []
+    for _ in range(5):
+        started = time.perf_counter()
+        models = convert(rows)
+        timings.append(time.perf_counter() - started)
+    return models, min(timings)
+
+@pytest.mark.benchmark
+async def test_constructing_a_repair_request_page_beats_validation(database, manager):
+    await create_loaded_repair_requests(database, manager.id, 500)
+    rows = (await database.execute(
+        select(RepairRequest).options(*build_relation(RepairRequest, REPAIR_REQUEST_LIST_PRELOADS)).order_by(RepairRequest.id)
+    )).unique().scalars().all()
+    assert len(rows) == 500
+
+    constructed, constructed_time = best_time(lambda rows: to_models(RepairRequestInfo, rows), rows)
+    validated_models, validated_time = best_time(lambda rows: [validated(RepairRequestInfo, row) for row in rows], rows)
+
+    adapter = TypeAdapter(list[RepairRequestInfo])
+    assert adapter.dump_json(constructed) == adapter.dump_json(validated_models)
+    assert constructed_time < validated_time
@@ -0,0 +1,22 @@
+from sqlalchemy import text
+
+from src.manufacturer.schemas import Manufacturer
+from src.repository import count_cache
+
+
+async def test_estimated_total_follows_writes(client, database):
+    database.add_all([Manufacturer(name=f"Manufacturer {i}") for i in range(3)])
+    await database.commit()
+    # Without statistics the planner guesses a large table and the estimate is returned as is.
+    await database.execute(text("ANALYZE manufacturer"))
+
+    page = (await client.get("/api/manufacturers/", params={"total": "estimate"})).json()
+    assert page["total"] == 3
+    assert len(count_cache)
+
+    created = (await client.post("/api/manufacturers/", json={"name": "Manufacturer 3"})).json()
+    assert not len(count_cache)
+    assert (await client.get("/api/manufacturers/", params={"total": "estimate"})).json()["total"] == 4
+
+    assert (await client.delete(f"/api/manufacturers/{created['id']}")).status_code == 200
+    assert (await client.get("/api/manufacturers/", params={"total": "estimate"})).json()["total"] == 3
@@ -0,0 +1,34 @@
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import select, insert
+
+from src.database import session_factory
+from src.equipment.schemas import Equipment, EquipmentStatus
+from src.equipment.status import refresh_equipment_status
+from src.repair_request.schemas import RepairRequest
+from tests.factories import create_institutions, create_equipment_models, create_equipment, repair_request_row
+
+START = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+async def test_concurrent_inserts_and_refreshes_do_not_deadlock(database):
+    institution_id, = await create_institutions(database, 1)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_id, = await create_equipment(database, institution_id, model_id)
+
+    async with session_factory() as a, session_factory() as b:
+        # Both inserts hold KEY SHARE on the equipment row before either refresh locks it.
+        for session in (a, b):
+            await session.execute(insert(RepairRequest).values(repair_request_row(equipment_id, START)))
+
+        async def refresh(session):
+            await refresh_equipment_status(session, [equipment_id])
+            await session.commit()
+
+        results = await asyncio.gather(refresh(a), refresh(b), return_exceptions=True)
+        assert results == [None, None]
+
+    database.expire_all()
+    status = (await database.execute(select(Equipment.status).where(Equipment.id == equipment_id))).scalar()
+    assert status != EquipmentStatus.working
@@ -0,0 +1,72 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from src.filter_dsl import InvalidFilterError
+from src.repair_request.repository import RepairRequestRepository
+from src.spare_part.repository import SparePartRepository
+from tests.factories import (
+    create_institutions, create_equipment_models, create_equipment, create_repair_requests, create_spare_parts,
+    create_locations,
+)
+
+START = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("filters", [
+    {"institution_id": "abc"},
+    {"institution_id": {"in": "1,x"}},
+    {"institution_id": {"gt": 1}},
+    {"compatible_model_id": {"notin": [1]}},
+])
+def test_custom_fields_are_validated(filters):
+    with pytest.raises(InvalidFilterError) as error:
+        SparePartRepository().parse_filters(filters)
+    assert error.value.field == next(iter(filters))
+
+def test_custom_fields_are_cast_once():
+    repository = RepairRequestRepository()
+    plan = repository.parse_filters(json.dumps({
+        "equipment_institution_id": {"in": "1,2"},
+        "equipment_category_id": "3",
+        "equipment_serial_number_or_equipment_equipment_model_name": 42,
+    }))
+
+    assert plan.condition("equipment_institution_id").value == [1, 2]
+    assert plan.condition("equipment_category_id").value == 3
+    assert plan.condition("equipment_serial_number_or_equipment_equipment_model_name").value == "42"
+    assert repository.parse_filters(plan.canonical) is plan
+
+    with pytest.raises(InvalidFilterError):
+        repository.parse_filters({"equipment_serial_number_or_equipment_equipment_model_name": {"in": "a,b"}})
+
+@pytest.mark.parametrize("path, filters", [
+    ("/api/spare-parts/", {"institution_id": "abc"}),
+    ("/api/repair-requests/", {"equipment_institution_id": {"in": "x,y"}}),
+    ("/api/institutions/", {"name_or_address": {"like": "a"}}),
+    ("/api/equipment/", {"equipment_model_name_or_serial_number": ["a"]}),
+])
+async def test_malformed_custom_filters_are_422(client, database, path, filters):
+    response = await client.get(path, params={"filters": json.dumps(filters)})
+    assert response.status_code == 422, response.text
+    assert response.json()["fields"] == next(iter(filters))
+
+async def test_custom_filters_apply_operators(client, database):
+    first, second, third = await create_institutions(database, 3)
+    model_id, = await create_equipment_models(database, 1)
+    request_ids = []
+    for institution_id in (first, second, third):
+        equipment_id, = await create_equipment(database, institution_id, model_id)
+        request_ids += await create_repair_requests(database, equipment_id, [START])
+    spare_part_ids = await create_spare_parts(database, 3)
+    for spare_part_id, institution_id in zip(spare_part_ids, (first, second, third)):
+        await create_locations(database, spare_part_id, {institution_id: 1})
+
+    response = await client.get("/api/repair-requests/", params={"filters": json.dumps({"equipment_institution_id": {"in": f"{first},{third}"}})})
+    assert response.status_code == 200, response.text
+    assert sorted(item["id"] for item in response.json()["items"]) == [request_ids[0], request_ids[2]]
+
+    response = await client.get("/api/spare-parts/", params={"filters": json.dumps({"institution_id": str(second)})})
+    assert response.status_code == 200, response.text
+    assert [item["id"] for item in response.json()["items"]] == [spare_part_ids[1]]
@@ -0,0 +1,54 @@
+import time
+from collections import Counter
+
+import pytest
+from sqlalchemy import text
+
+from src.global_search.models import SearchHitType
+from src.global_search.services import GlobalSearchServices
+from tests.factories import create_institutions, create_spare_parts
+
+
+async def test_repeated_types_return_hits_once(client, database):
+    await create_institutions(database, 2)
+    await create_spare_parts(database, 1)
+
+    response = await client.get("/api/search", params=[("q", "Institution"), ("types", "institution"), ("types", "institution")])
+    assert response.status_code == 200
+    hits = [(hit["type"], hit["id"]) for hit in response.json()["items"]]
+    assert sorted(hits) == [("institution", 1), ("institution", 2)]
+
+ROWS = 100_000
+SEED = [
+    "INSERT INTO institution (name, address, contact_email, contact_phone) "
+    "SELECT 'Institution ' || g, 'Street ' || g, 'institution' || g || '@example.com', '+380680000001' FROM generate_series(1, :rows) g",
+    "INSERT INTO equipment_model (name) SELECT 'Model ' || g FROM generate_series(1, :rows) g",
+    "INSERT INTO equipment (location, serial_number, installed, institution_id, equipment_model_id) "
+    "SELECT 'Room 1', 'SN-' || g, now(), g, g FROM generate_series(1, :rows) g",
+    "INSERT INTO spare_part (name, min_quantity) SELECT 'Spare part ' || g, 1 FROM generate_series(1, :rows) g",
+    "INSERT INTO repair_request (issue, urgency, last_status, manager_note, engineer_note, equipment_id) "
+    "SELECT 'Issue ' || g, 'non_critical', 'not_taken', '', '', g FROM generate_series(1, :rows) g",
+]
+
+@pytest.mark.benchmark
+async def test_search_over_100k_rows_per_table(database, statements):
+    for stmt in SEED:
+        await database.execute(text(stmt), {"rows": ROWS})
+    await database.commit()
+    for table in ("institution", "equipment_model", "equipment", "spare_part", "repair_request"):
+        await database.execute(text(f"ANALYZE {table}"))
+
+    timings = []
+    for _ in range(3):
+        statements.reset()
+        started = time.perf_counter()
+        response = await GlobalSearchServices.search(database, "123", limit=50)
+        timings.append(time.perf_counter() - started)
+        # Every type in one UNION, a single round trip.
+        assert statements.count == 1
+
+    # Hundreds of rows match "123" in every table, each type still gets its own 50.
+    hits = Counter(hit.type for hit in response.items)
+    assert hits == dict.fromkeys(SearchHitType, 50)
+    assert all(hit.rank >= next_hit.rank for hit, next_hit in zip(response.items, response.items[1:]))
+    assert min(timings) < 2
@@ -0,0 +1,44 @@
+import base64
+import json
+
+import pytest
+
+from src.manufacturer.schemas import Manufacturer
+from src.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def tamper(values: list, backwards: bool = False) -> str:
+    raw = json.dumps({"v": values, "b": backwards}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+KEYS = [(Manufacturer.name, False), (Manufacturer.id, False)]
+
+def test_decode_cursor_round_trip():
+    cursor = decode_cursor(encode_cursor(["Philips", 3]), KEYS)
+    assert cursor.values == ["Philips", 3]
+    assert not cursor.backwards
+
+@pytest.mark.parametrize("cursor", [
+    "not-base64!!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    tamper(["Philips"]),
+    tamper(["Philips", "3"]),
+    tamper([3, 3]),
+])
+def test_decode_cursor_rejects_tampered(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, KEYS)
+
+async def test_tampered_cursor_is_unprocessable(client, database):
+    database.add_all([Manufacturer(name=f"Manufacturer {i}") for i in range(3)])
+    await database.commit()
+
+    page = (await client.get("/api/manufacturers/", params={"mode": "cursor", "limit": 2})).json()
+    assert page["next_cursor"]
+
+    response = await client.get("/api/manufacturers/", params={"mode": "cursor", "limit": 2, "cursor": page["next_cursor"][:-4]})
+    assert response.status_code == 422
+    assert response.json()["fields"] == "cursor"
+
+    response = await client.get("/api/manufacturers/", params={"mode": "cursor", "limit": 2, "cursor": tamper(["x", "drop table"])})
+    assert response.status_code == 422
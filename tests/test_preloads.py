@@ -0,0 +1,69 @@
+import time
+
+import pytest
+from sqlalchemy import select, event
+
+from src.database import engine
+from src.repair_request.schemas import RepairRequest
+from src.utils import build_relation
+from tests.factories import REPAIR_REQUEST_LIST_PRELOADS, create_loaded_repair_requests
+
+pytestmark = pytest.mark.benchmark
+
+PAGE = 100
+FAILURE_TYPES, USED_PARTS, PHOTOS, STATUS_RECORDS = 2, 2, 3, 4
+
+
+async def load_page(database, preloads: list[str]) -> tuple[list[RepairRequest], int, float]:
+    rows = 0
+    def count_rows(conn, cursor, statement, parameters, context, executemany):
+        nonlocal rows
+        rows += max(cursor.rowcount, 0)
+
+    stmt = select(RepairRequest).options(*build_relation(RepairRequest, preloads)).order_by(RepairRequest.id).limit(PAGE)
+    database.expunge_all()
+    event.listen(engine.sync_engine, "after_cursor_execute", count_rows)
+    try:
+        started = time.perf_counter()
+        requests = list((await database.execute(stmt)).unique().scalars().all())
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine.sync_engine, "after_cursor_execute", count_rows)
+    return requests, rows, elapsed
+
+def summary(requests: list[RepairRequest]) -> list[tuple]:
+    return [
+        (
+            request.id,
+            request.equipment.institution.id,
+            sorted(failure_type.id for failure_type in request.failure_types),
+            sorted((usp.spare_part.id, usp.institution.id) for usp in request.used_spare_parts),
+            sorted(photo.file_path for photo in request.photos),
+            sorted((record.id, record.assigned_engineer.id) for record in request.status_history),
+        )
+        for request in requests
+    ]
+
+async def test_list_preloads_do_not_multiply_rows(database, manager):
+    await create_loaded_repair_requests(database, manager.id, PAGE * 2, FAILURE_TYPES, USED_PARTS, PHOTOS, STATUS_RECORDS)
+    # Every segment forced to joinedload, what build_relation used to do for all preloads.
+    joined_preloads = [
+        ".".join(f"{part}:joined" for part in preload.split(".")) for preload in REPAIR_REQUEST_LIST_PRELOADS
+    ]
+
+    results = {}
+    for name, preloads in (("joined", joined_preloads), ("chosen", REPAIR_REQUEST_LIST_PRELOADS)):
+        runs = [await load_page(database, preloads) for _ in range(3)]
+        requests, rows, _ = runs[-1]
+        results[name] = summary(requests), rows, min(elapsed for *_, elapsed in runs)
+
+    joined_summary, joined_rows, joined_elapsed = results["joined"]
+    chosen_summary, chosen_rows, chosen_elapsed = results["chosen"]
+    assert chosen_summary == joined_summary
+    assert len(chosen_summary) == PAGE
+
+    # The joins return the product of the sibling collections for every request.
+    assert joined_rows == PAGE * FAILURE_TYPES * USED_PARTS * PHOTOS * STATUS_RECORDS
+    # One row per request, then one IN query per collection with its own rows.
+    assert chosen_rows == PAGE * (1 + FAILURE_TYPES + USED_PARTS + PHOTOS + STATUS_RECORDS)
+    assert chosen_elapsed < joined_elapsed
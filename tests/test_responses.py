@@ -0,0 +1,64 @@
+import time
+from datetime import datetime, date, timezone, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import select
+from starlette.responses import JSONResponse
+
+from src.conversion import to_models
+from src.pagination import PaginationResponse
+from src.repair_request.models import RepairRequestInfo
+from src.repair_request.schemas import RepairRequest, RepairRequestStatus, Urgency
+from src.responses import ORJSONResponse
+from src.utils import build_relation
+from tests.factories import REPAIR_REQUEST_LIST_PRELOADS, create_loaded_repair_requests
+
+
+def test_renders_like_json_response():
+    content = {
+        "status": RepairRequestStatus.in_progress,
+        "urgency": Urgency.critical,
+        "created_at": datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone(timedelta(hours=3))),
+        "naive": datetime(2024, 5, 1, 12),
+        "day": date(2024, 5, 1),
+        "whole": Decimal("12"),
+        "fraction": Decimal("12.50"),
+        "text": "Запит",
+        "nested": [{"id": 1, "status": RepairRequestStatus.finished}],
+    }
+
+    assert ORJSONResponse(content).body == JSONResponse(jsonable_encoder(content)).body
+
+def test_rejects_unknown_types():
+    with pytest.raises(TypeError):
+        ORJSONResponse({"value": object()})
+
+def best_time(render, content, runs: int = 50) -> tuple[bytes, float]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        body = render(content)
+        timings.append(time.perf_counter() - started)
+    return body, min(timings)
+
+@pytest.mark.benchmark
+async def test_repair_request_page_serialization(database, manager):
+    await create_loaded_repair_requests(database, manager.id, 100)
+    rows = (await database.execute(
+        select(RepairRequest).options(*build_relation(RepairRequest, REPAIR_REQUEST_LIST_PRELOADS)).order_by(RepairRequest.id)
+    )).unique().scalars().all()
+    page = PaginationResponse[RepairRequestInfo](
+        page=1, limit=100, total=100, pages=1, items=to_models(RepairRequestInfo, rows), has_next=False, has_prev=False,
+    )
+    # What FastAPI hands to the response class after serializing the response_model.
+    content = jsonable_encoder(page)
+
+    json_body, json_time = best_time(lambda content: JSONResponse(content).body, content)
+    orjson_body, orjson_time = best_time(lambda content: ORJSONResponse(content).body, content)
+
+    assert orjson_body == json_body
+    # fields_response passes the page model itself.
+    assert ORJSONResponse(page).body == json_body
+    assert orjson_time < json_time
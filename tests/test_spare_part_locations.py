@@ -0,0 +1,66 @@
+import time
+
+import pytest
+from sqlalchemy import select, literal_column
+
+from src.spare_part.repository import SparePartRepository
+from src.spare_part.schemas import Location, SparePart
+from tests.factories import create_spare_parts, create_locations, create_institutions, create_equipment_models
+
+pytestmark = pytest.mark.benchmark
+
+INSTITUTIONS = 200
+
+
+# Location id, quantity and row version by institution.
+async def location_rows(database, spare_part_id: int) -> dict[int, tuple[int, int, str]]:
+    rows = await database.execute(
+        select(Location.institution_id, Location.id, Location.quantity, literal_column("location.xmin::text"))
+        .where(Location.spare_part_id == spare_part_id)
+    )
+    return {institution_id: (id_, quantity, xmin) for institution_id, id_, quantity, xmin in rows}
+
+async def timed_update(database, statements, spare_part_id: int, quantities: dict[int, int], compatible_models_ids: list[int]):
+    statements.reset()
+    started = time.perf_counter()
+    await SparePartRepository().update(spare_part_id, {
+        "id": spare_part_id,
+        "locations": [{"institution_id": institution_id, "quantity": quantity} for institution_id, quantity in quantities.items()],
+        "compatible_models_ids": compatible_models_ids,
+    }, database)
+    return statements.count, time.perf_counter() - started
+
+async def test_location_sync_of_200_institutions(database, statements):
+    institution_ids = await create_institutions(database, INSTITUTIONS)
+    model_ids = await create_equipment_models(database, 20)
+    small_id, spare_part_id = await create_spare_parts(database, 2)
+    await create_locations(database, small_id, {institution_id: 5 for institution_id in institution_ids[:2]})
+    await create_locations(database, spare_part_id, {institution_id: 5 for institution_id in institution_ids})
+
+    baseline, baseline_elapsed = await timed_update(database, statements, small_id, {institution_ids[0]: 5, institution_ids[1]: 6}, model_ids[:2])
+    before = await location_rows(database, spare_part_id)
+
+    # Unchanged list: no location is rewritten and no movement is recorded.
+    quantities = {institution_id: 5 for institution_id in institution_ids}
+    count, elapsed = await timed_update(database, statements, spare_part_id, quantities, model_ids)
+    assert count == baseline - 1
+    assert await location_rows(database, spare_part_id) == before
+
+    # Half of the quantities change, only those rows get a new version.
+    quantities.update({institution_id: 7 for institution_id in institution_ids[::2]})
+    count, elapsed = await timed_update(database, statements, spare_part_id, quantities, model_ids[5:])
+    after = await location_rows(database, spare_part_id)
+    assert count == baseline
+    assert {institution_id for institution_id in after if after[institution_id][2] != before[institution_id][2]} == set(institution_ids[::2])
+    assert {institution_id: row[0] for institution_id, row in after.items()} == {institution_id: row[0] for institution_id, row in before.items()}
+
+    # Ten institutions are dropped, the others keep their rows.
+    for institution_id in institution_ids[-10:]:
+        del quantities[institution_id]
+    count, elapsed = await timed_update(database, statements, spare_part_id, quantities, model_ids[5:])
+    assert count == baseline
+    assert (await location_rows(database, spare_part_id)).keys() == quantities.keys()
+    assert (await database.execute(select(SparePart.total_quantity).where(SparePart.id == spare_part_id))).scalar() == sum(quantities.values())
+
+    # The statements stay constant, the time can only grow with the rows they carry.
+    assert elapsed < baseline_elapsed * 20 + 0.5
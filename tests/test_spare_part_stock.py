@@ -0,0 +1,99 @@
+import asyncio
+from datetime import datetime, timezone
+
+from sqlalchemy import select, func, event
+
+from src.database import engine, session_factory
+from src.institution.repository import InstitutionRepository
+from src.repair_request.repository import RepairRequestRepository
+from src.spare_part.repository import SparePartRepository
+from src.spare_part.schemas import SparePart, StockStatus, Location, StockMovement
+from src.spare_part.stock import refresh_stock
+from tests.factories import (
+    create_spare_parts, create_locations, create_institutions, create_equipment_models, create_equipment,
+    create_repair_requests,
+)
+
+START = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+async def stock_of(database, spare_part_id: int) -> tuple[int, StockStatus]:
+    database.expire_all()
+    row = (await database.execute(select(SparePart.total_quantity, SparePart.stock_status).where(SparePart.id == spare_part_id))).one()
+    return tuple(row)
+
+async def test_institution_delete_refreshes_stock_of_its_locations(database):
+    kept, deleted = await create_institutions(database, 2)
+    spare_part_id, = await create_spare_parts(database, 1, min_quantity=5)
+    await create_locations(database, spare_part_id, {kept: 3, deleted: 4})
+    await refresh_stock(database, [spare_part_id])
+    await database.commit()
+    assert await stock_of(database, spare_part_id) == (7, StockStatus.in_stock)
+
+    await InstitutionRepository().delete(deleted, database)
+
+    assert await stock_of(database, spare_part_id) == (3, StockStatus.low_stock)
+
+async def test_spare_parts_sort_by_stock_status(client, database):
+    institution_id, = await create_institutions(database, 1)
+    in_stock, low, out = await create_spare_parts(database, 3, min_quantity=5)
+    await create_locations(database, in_stock, {institution_id: 5})
+    await create_locations(database, low, {institution_id: 1})
+    await refresh_stock(database, [in_stock, low, out])
+    await database.commit()
+
+    for sort_order, expected in (("asc", [out, low, in_stock]), ("desc", [in_stock, low, out])):
+        response = await client.get("/api/spare-parts/", params={"sort_by": "stock_status", "sort_order": sort_order})
+        assert response.status_code == 200, response.text
+        assert [item["id"] for item in response.json()["items"]] == expected
+
+async def test_concurrent_stock_writers_do_not_deadlock(database):
+    used_from, edited = await create_institutions(database, 2)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_id, = await create_equipment(database, used_from, model_id)
+    request_ids = await create_repair_requests(database, equipment_id, [START] * 6)
+    spare_part_ids = await create_spare_parts(database, 3)
+    for spare_part_id in spare_part_ids:
+        await create_locations(database, spare_part_id, {used_from: 1000, edited: 10})
+
+    errors = []
+    def on_error(context):
+        errors.append(context.original_exception)
+    event.listen(engine.sync_engine, "handle_error", on_error)
+
+    async def use_parts(request_id: int):
+        async with session_factory() as session:
+            for quantity in range(1, 6):
+                await RepairRequestRepository().update(request_id, {"id": request_id, "used_spare_parts": [
+                    {"spare_part_id": spare_part_id, "institution_id": used_from, "quantity": quantity, "note": ""}
+                    for spare_part_id in spare_part_ids
+                ]}, session)
+
+    async def edit_parts(spare_part_id: int):
+        async with session_factory() as session:
+            for min_quantity in range(1, 6):
+                await SparePartRepository().update(spare_part_id, {"id": spare_part_id, "min_quantity": min_quantity}, session)
+
+    try:
+        results = await asyncio.gather(
+            *[use_parts(request_id) for request_id in request_ids],
+            *[edit_parts(spare_part_id) for spare_part_id in spare_part_ids],
+            return_exceptions=True,
+        )
+    finally:
+        event.remove(engine.sync_engine, "handle_error", on_error)
+
+    assert results == [None] * (len(request_ids) + len(spare_part_ids))
+    assert errors == []
+
+    database.expire_all()
+    rows = (await database.execute(select(Location.spare_part_id, Location.institution_id, Location.quantity))).all()
+    assert sorted(rows) == sorted(
+        (spare_part_id, institution_id, 1000 - 5 * len(request_ids) if institution_id == used_from else 10)
+        for spare_part_id in spare_part_ids
+        for institution_id in (used_from, edited)
+    )
+    totals = (await database.execute(select(SparePart.total_quantity))).scalars().all()
+    assert totals == [1000 - 5 * len(request_ids) + 10] * len(spare_part_ids)
+    ledger = (await database.execute(select(func.sum(StockMovement.delta)))).scalar()
+    assert ledger == -5 * len(request_ids) * len(spare_part_ids)
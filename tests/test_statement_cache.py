@@ -0,0 +1,40 @@
+import json
+
+from src.auth.repository import AuthRepository
+from src.manufacturer.schemas import Manufacturer
+from src.statement_cache import statement_cache, compiled_cache_counter
+
+
+async def test_get_by_email_builds_statement_once(database, manager):
+    repo = AuthRepository()
+    assert (await repo.get_by_email(manager.email, database)).id == manager.id
+
+    hits, misses = statement_cache.hits, statement_cache.misses
+    compiled_hits = compiled_cache_counter.hits
+
+    assert await repo.get_by_email("nobody@example.com", database) is None
+    assert (await repo.get_by_email(manager.email, database)).id == manager.id
+    assert (statement_cache.hits - hits, statement_cache.misses - misses) == (2, 0)
+    assert compiled_cache_counter.hits - compiled_hits == 2
+
+async def test_get_by_email_keys_on_preloads(database, manager):
+    repo = AuthRepository()
+    await repo.get_by_email(manager.email, database)
+    misses = statement_cache.misses
+
+    user = await repo.get_by_email(manager.email, database, preloads=["workplace"])
+    assert user.workplace is None
+    assert statement_cache.misses - misses == 1
+
+async def test_filter_values_reuse_compiled_statement(client, database):
+    database.add_all([Manufacturer(name=f"Manufacturer {i}") for i in range(3)])
+    await database.commit()
+
+    async def names(term: str) -> list[str]:
+        response = await client.get("/api/manufacturers/", params={"filters": json.dumps({"name": {"ilike": term}})})
+        return [item["name"] for item in response.json()["items"]]
+
+    assert await names("Manufacturer 1") == ["Manufacturer 1"]
+    misses = compiled_cache_counter.misses
+    assert await names("Manufacturer 2") == ["Manufacturer 2"]
+    assert compiled_cache_counter.misses == misses
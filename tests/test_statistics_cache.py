@@ -0,0 +1,81 @@
+from datetime import datetime, timezone
+
+from src.repair_request.repository import RepairRequestRepository
+from src.statistics.cache import statistics_cache, statistics_cache_key
+from src.statistics.models import StatisticsFilters, StatisticsTimeStep, TimeFrame
+from src.statistics.rollup import backfill_daily_stats
+from src.statistics.services import StatisticsServices
+from tests.factories import create_institutions, create_equipment_models, create_equipment, create_repair_requests
+
+START = datetime(2024, 3, 4, 12, tzinfo=timezone.utc)
+
+
+def filters(from_date: datetime | None, to_date: datetime | None, institution_ids: list[int], step=StatisticsTimeStep.month) -> StatisticsFilters:
+    return StatisticsFilters(
+        time_frame=TimeFrame(from_date=from_date, to_date=to_date, step=step),
+        institution_ids=institution_ids,
+        equipment_model_ids=[],
+        failure_type_ids=[],
+    )
+
+def test_equivalent_filters_share_a_key():
+    key = statistics_cache_key(filters(datetime(2024, 3, 1), datetime(2024, 5, 1), [1, 2, 3]), limit=7)
+
+    # Reordered and repeated ids, a from_date in the partial period before March and a
+    # to_date later in May select the same rows.
+    assert statistics_cache_key(filters(datetime(2024, 2, 15, 10), datetime(2024, 5, 31, 23), [3, 1, 2, 1]), limit=7) == key
+
+    assert statistics_cache_key(filters(datetime(2024, 2, 1), datetime(2024, 5, 1), [1, 2, 3]), limit=7) != key
+    assert statistics_cache_key(filters(datetime(2024, 3, 1), datetime(2024, 6, 1), [1, 2, 3]), limit=7) != key
+    assert statistics_cache_key(filters(datetime(2024, 3, 1), datetime(2024, 5, 1), [1, 2]), limit=7) != key
+    assert statistics_cache_key(filters(datetime(2024, 3, 1), datetime(2024, 5, 1), [1, 2, 3], StatisticsTimeStep.week), limit=7) != key
+    assert statistics_cache_key(filters(datetime(2024, 3, 1), datetime(2024, 5, 1), [1, 2, 3]), limit=5) != key
+
+async def test_metrics_count_hits_and_misses(client, database):
+    institution_ids = await create_institutions(database, 2)
+
+    async def metrics() -> dict:
+        return (await client.get("/api/metrics/statistics-cache")).json()
+
+    async def dashboard(from_date: str, ids: list[int]) -> None:
+        params = {"from_date": from_date, "to_date": "2024-05-20T00:00:00", "step": "month", "institution_ids": ids}
+        assert (await client.get("/api/statistics/", params=params)).status_code == 200
+
+    before = await metrics()
+    await dashboard("2024-03-01T00:00:00", institution_ids)
+    await dashboard("2024-02-10T00:00:00", institution_ids[::-1])
+    after = await metrics()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    assert after["size"] == 1
+
+    await dashboard("2024-01-01T00:00:00", institution_ids)
+    assert (await metrics())["misses"] - before["misses"] == 2
+    assert (await metrics())["size"] == 2
+
+async def test_repair_request_writes_clear_the_cache(database):
+    institution_id, = await create_institutions(database, 1)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_id, = await create_equipment(database, institution_id, model_id)
+    request_id, = await create_repair_requests(database, equipment_id, [START])
+    await backfill_daily_stats(database)
+    dashboard_filters = filters(None, None, [])
+    repository = RepairRequestRepository()
+
+    async def warm() -> int:
+        response = await StatisticsServices.get_dashboard(database, dashboard_filters)
+        assert len(statistics_cache) == 1
+        return sum(point.count for point in response.time_dynamics)
+
+    assert await warm() == 1
+    created = await repository.create({"issue": "Issue", "urgency": "non_critical", "equipment_id": equipment_id}, database)
+    assert not len(statistics_cache)
+
+    assert await warm() == 2
+    await repository.update(request_id, {"id": request_id, "manager_note": "Checked"}, database)
+    assert not len(statistics_cache)
+
+    assert await warm() == 2
+    await repository.delete(created.id, database)
+    assert not len(statistics_cache)
+    assert await warm() == 1
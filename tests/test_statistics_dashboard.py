@@ -0,0 +1,69 @@
+import os
+import time
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from src.statistics.cache import statistics_cache
+from src.statistics.models import StatisticsFilters, StatisticsTimeStep, TimeFrame
+from src.statistics.rollup import backfill_daily_stats
+from src.statistics.services import StatisticsServices
+from tests.factories import create_institutions, create_equipment_models, create_equipment, create_failure_types, create_spare_parts
+
+pytestmark = pytest.mark.benchmark
+
+REQUESTS = 200_000
+START = datetime(2022, 1, 1, tzinfo=timezone.utc)
+# One request every 7 minutes spreads them over about two and a half years.
+SEED = [
+    "INSERT INTO repair_request (issue, urgency, last_status, manager_note, engineer_note, equipment_id, created_at, completed_at) "
+    "SELECT 'Issue ' || g, 'non_critical', CASE WHEN g % 3 = 0 THEN 'finished' ELSE 'not_taken' END::repairrequeststatus, '', '', "
+    "1 + g % :equipment, CAST(:start AS timestamptz) + g * interval '7 minutes', "
+    "CASE WHEN g % 3 = 0 THEN CAST(:start AS timestamptz) + g * interval '7 minutes' + (g % 72) * interval '1 hour' END "
+    "FROM generate_series(1, :requests) g",
+    "INSERT INTO failure_type_repair_request (repair_request_id, failure_type_id) SELECT id, 1 + id % 5 FROM repair_request",
+    "INSERT INTO used_spare_part (repair_request_id, spare_part_id, institution_id, quantity, note) "
+    "SELECT id, 1 + id % 5, 1 + id % 10, 1 + id % 3, '' FROM repair_request WHERE id % 4 = 0",
+]
+
+
+async def dashboard(database, filters: StatisticsFilters, max_connections: int):
+    timings = []
+    for _ in range(3):
+        statistics_cache.clear()
+        started = time.perf_counter()
+        response = await StatisticsServices.get_dashboard(database, filters, max_connections=max_connections)
+        timings.append(time.perf_counter() - started)
+    return response, min(timings)
+
+
+async def test_concurrent_widgets_match_sequential_over_a_large_range(database):
+    institution_ids = await create_institutions(database, 10)
+    model_ids = await create_equipment_models(database, 10)
+    for institution_id, model_id in zip(institution_ids, model_ids):
+        await create_equipment(database, institution_id, model_id, count=10)
+    await create_failure_types(database, 5)
+    await create_spare_parts(database, 5)
+    for stmt in SEED:
+        await database.execute(text(stmt), {"equipment": 100, "start": START, "requests": REQUESTS})
+    await database.commit()
+    await backfill_daily_stats(database)
+    for table in ("repair_request", "failure_type_repair_request", "used_spare_part", "repair_request_daily_stat"):
+        await database.execute(text(f"ANALYZE {table}"))
+
+    for step in (StatisticsTimeStep.week, StatisticsTimeStep.month):
+        filters = StatisticsFilters(
+            time_frame=TimeFrame(from_date=datetime(2022, 1, 1), to_date=datetime(2024, 12, 31), step=step),
+            institution_ids=[],
+            equipment_model_ids=[],
+            failure_type_ids=[],
+        )
+        sequential, sequential_time = await dashboard(database, filters, max_connections=1)
+        concurrent, concurrent_time = await dashboard(database, filters, max_connections=4)
+
+        assert concurrent == sequential
+        assert sum(point.count for point in sequential.time_dynamics) > REQUESTS * 0.9
+        # Widgets only overlap when the database has cores to run them on.
+        if (os.cpu_count() or 1) >= 4:
+            assert concurrent_time < sequential_time
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from src.repair_request.schemas import RepairRequest
+from src.statistics.models import ExportFormat
+from tests.factories import create_institutions, create_equipment_models, create_equipment, repair_request_row
+
+# Current RSS of a fresh interpreter right before one export and its peak while the export
+# runs, sampled from /proc since ru_maxrss would report the peak of the imports. In KiB.
+EXPORT_SCRIPT = """
+import asyncio, os, sys, threading
+import src.main
+from src.database import engine, session_factory
+from src.statistics.models import ExportFormat
+from src.statistics.services import StatisticsServices
+
+engine.echo = False
+PAGE_KIB = os.sysconf("SC_PAGE_SIZE") // 1024
+
+def rss() -> int:
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * PAGE_KIB
+
+async def main():
+    peak, done = 0, threading.Event()
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, rss())
+            done.wait(0.005)
+
+    async with session_factory() as session:
+        baseline = rss()
+        sampler = threading.Thread(target=sample)
+        sampler.start()
+        response = await StatisticsServices.export_statistics(session, None, ExportFormat(sys.argv[1]))
+        size = 0
+        async for chunk in response.body_iterator:
+            size += len(chunk)
+        done.set()
+        sampler.join()
+    print(baseline, peak, size)
+
+asyncio.run(main())
+"""
+
+async def add_repair_requests(database, equipment_ids: list[int], count: int) -> None:
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        repair_request_row(equipment_ids[i % len(equipment_ids)], start + timedelta(minutes=i), f"Issue {i} " + "x" * 200)
+        for i in range(count)
+    ]
+    for i in range(0, count, 5000):
+        await database.execute(insert(RepairRequest), rows[i:i + 5000])
+    await database.commit()
+
+def export_rss_growth(export_format: ExportFormat) -> tuple[int, int]:
+    output = subprocess.run(
+        [sys.executable, "-c", EXPORT_SCRIPT, export_format.value],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    baseline, peak, size = map(int, output[-3:])
+    return peak - baseline, size
+
+@pytest.mark.benchmark
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="samples RSS from /proc")
+@pytest.mark.parametrize("export_format", list(ExportFormat))
+async def test_export_peak_rss_stays_flat(database, export_format):
+    if export_format == ExportFormat.parquet:
+        pytest.importorskip("pyarrow")
+
+    institution_id, = await create_institutions(database, 1)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_ids = await create_equipment(database, institution_id, model_id, count=50)
+
+    await add_repair_requests(database, equipment_ids, 2_000)
+    small_growth, small_size = export_rss_growth(export_format)
+
+    await add_repair_requests(database, equipment_ids, 38_000)
+    large_growth, large_size = export_rss_growth(export_format)
+
+    assert large_size > small_size * 5
+    # 20 times the rows, the peak may only move by allocator noise.
+    assert large_growth - small_growth < 8 * 1024, (small_growth, large_growth)
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import event, func, select, text
+
+from src.database import engine
+from src.repair_request.schemas import RepairRequest
+from src.statistics.filters import time_frame_bounds, time_frame_conditions
+from src.statistics.models import StatisticsFilters, StatisticsTimeStep, TimeFrame
+from src.statistics.services import StatisticsServices
+from tests.factories import create_institutions, create_equipment_models, create_equipment, create_repair_requests
+
+UTC = timezone.utc
+
+
+@pytest.mark.parametrize("step, from_date, lower", [
+    (StatisticsTimeStep.day, datetime(2024, 3, 5), datetime(2024, 3, 5)),
+    (StatisticsTimeStep.day, datetime(2024, 3, 5, 10), datetime(2024, 3, 6)),
+    (StatisticsTimeStep.week, datetime(2024, 3, 4), datetime(2024, 3, 4)),
+    (StatisticsTimeStep.week, datetime(2024, 3, 5), datetime(2024, 3, 11)),
+    (StatisticsTimeStep.month, datetime(2024, 12, 1), datetime(2024, 12, 1)),
+    (StatisticsTimeStep.month, datetime(2024, 12, 15), datetime(2025, 1, 1)),
+    (StatisticsTimeStep.year, datetime(2024, 6, 1), datetime(2025, 1, 1)),
+])
+def test_lower_bound_skips_partial_first_period(step, from_date, lower):
+    assert time_frame_bounds(TimeFrame(from_date=from_date, step=step))[0] == lower
+
+def test_upper_bound_covers_last_period():
+    time_frame = TimeFrame(to_date=datetime(2024, 3, 5, 10), step=StatisticsTimeStep.month)
+    assert time_frame_bounds(time_frame) == (None, datetime(2024, 4, 1))
+
+def test_open_time_frame_has_no_bounds():
+    assert time_frame_bounds(TimeFrame(step=StatisticsTimeStep.day)) == (None, None)
+
+@pytest.fixture
+async def repair_requests(database):
+    institution_id, = await create_institutions(database, 1)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_ids = await create_equipment(database, institution_id, model_id, count=20)
+    start = datetime(2022, 1, 1, tzinfo=UTC)
+    for equipment_id in equipment_ids:
+        await create_repair_requests(database, equipment_id, [start + timedelta(hours=7 * i + equipment_id) for i in range(300)])
+    await database.execute(text("ANALYZE repair_request"))
+    return equipment_ids
+
+@pytest.fixture
+def plans(schema):
+    # EXPLAINs every statement reading repair_request right before it runs.
+    captured: list[str] = []
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if "FROM repair_request" in statement or "JOIN repair_request" in statement:
+            cursor.execute(f"EXPLAIN {statement}", parameters)
+            captured.append("\n".join(row[0] for row in cursor.fetchall()))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", explain)
+    yield captured
+    event.remove(engine.sync_engine, "before_cursor_execute", explain)
+
+def filters(**time_frame) -> StatisticsFilters:
+    return StatisticsFilters(
+        time_frame=TimeFrame(step=StatisticsTimeStep.day, **time_frame),
+        institution_ids=[],
+        equipment_model_ids=[],
+        failure_type_ids=[],
+    )
+
+@pytest.mark.parametrize("widget", [
+    StatisticsServices.get_institution,
+    StatisticsServices.get_equipment_breakdowns,
+    StatisticsServices.get_average_repair_time,
+])
+async def test_widgets_use_created_at_index(database, repair_requests, plans, widget):
+    data = filters(from_date=datetime(2022, 3, 1, tzinfo=UTC), to_date=datetime(2022, 3, 2, tzinfo=UTC))
+    await widget(database, data, limit=5)
+    assert "ix_repair_request_created_at" in plans[-1]
+    assert "Seq Scan on repair_request" not in plans[-1]
+
+async def test_equipment_time_range_uses_composite_index(database, repair_requests, plans):
+    time_frame = TimeFrame(from_date=datetime(2022, 3, 1, tzinfo=UTC), to_date=datetime(2022, 6, 1, tzinfo=UTC), step=StatisticsTimeStep.month)
+    await database.execute(
+        select(func.count(RepairRequest.id))
+        .where(RepairRequest.equipment_id == repair_requests[0], *time_frame_conditions(RepairRequest.created_at, time_frame))
+    )
+    assert "ix_repair_request_equipment_id_created_at" in plans[-1]
+
+async def test_truncated_predicate_cannot_use_index(database, repair_requests, plans):
+    day = datetime(2022, 3, 1, tzinfo=UTC)
+    await database.execute(select(func.count(RepairRequest.id)).where(func.date_trunc("day", RepairRequest.created_at) == day))
+    assert "ix_repair_request_created_at" not in plans[-1]
@@ -0,0 +1,107 @@
+import asyncio
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import BackgroundTasks
+from sqlalchemy import select, update
+
+from src.database import session_factory
+from src.exceptions import DomainError
+from src.statistics.jobs import ExportJobServices
+from src.statistics.models import StatisticsFilters, StatisticsTimeStep, TimeFrame, ExportFormat, ExportJobStatus
+from src.statistics.schemas import ExportJob
+from tests.factories import create_institutions, create_equipment_models, create_equipment, create_repair_requests
+
+FILTERS = StatisticsFilters(
+    time_frame=TimeFrame(step=StatisticsTimeStep.month),
+    institution_ids=[],
+    equipment_model_ids=[],
+    failure_type_ids=[],
+)
+
+
+@pytest.fixture
+def jobs(tmp_path) -> ExportJobServices:
+    return ExportJobServices(static_files_dir=str(tmp_path), proxy_url_to_static_files_dir="https://example/", ttl=3600, heartbeat_timeout=60)
+
+async def enqueue(jobs: ExportJobServices, export_format: ExportFormat = ExportFormat.xlsx, filters: StatisticsFilters = FILTERS):
+    background_tasks = BackgroundTasks()
+    async with session_factory() as session:
+        job = await jobs.enqueue(session, filters, export_format, background_tasks)
+    return job, background_tasks
+
+async def test_concurrent_enqueues_share_one_job(database, jobs):
+    results = await asyncio.gather(*[enqueue(jobs) for _ in range(8)])
+
+    assert len({job.id for job, _ in results}) == 1
+    assert sum(len(background_tasks.tasks) for _, background_tasks in results) == 1
+    assert len((await database.execute(select(ExportJob))).scalars().all()) == 1
+
+async def test_jobs_are_shared_by_format_not_filters(database, jobs):
+    job, _ = await enqueue(jobs)
+    other_filters = FILTERS.model_copy(update={"institution_ids": [1, 2], "time_frame": TimeFrame(step=StatisticsTimeStep.week)})
+
+    same_file, background_tasks = await enqueue(jobs, filters=other_filters)
+    assert same_file.id == job.id
+    assert not background_tasks.tasks
+
+    other_format, background_tasks = await enqueue(jobs, ExportFormat.csv)
+    assert other_format.id != job.id
+    assert len(background_tasks.tasks) == 1
+
+async def test_get_expires_outdated_jobs(database, jobs, tmp_path):
+    job, _ = await enqueue(jobs)
+    await jobs.run(job.id)
+    file_name = (await database.get(ExportJob, job.id)).file_name
+    assert (tmp_path / file_name).exists()
+
+    await database.execute(
+        update(ExportJob)
+        .where(ExportJob.id == job.id)
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(seconds=1))
+    )
+    await database.commit()
+
+    async with session_factory() as session:
+        with pytest.raises(DomainError):
+            await jobs.get(session, job.id)
+    assert not (tmp_path / file_name).exists()
+
+async def test_stale_job_is_failed_and_not_reused(database, jobs):
+    stale, _ = await enqueue(jobs)
+    await database.execute(
+        update(ExportJob)
+        .where(ExportJob.id == stale.id)
+        .values(status=ExportJobStatus.running, heartbeat_at=datetime.now(timezone.utc) - timedelta(minutes=5))
+    )
+    await database.commit()
+
+    job, background_tasks = await enqueue(jobs)
+    assert job.id != stale.id
+    assert len(background_tasks.tasks) == 1
+
+    async with session_factory() as session:
+        stale = await jobs.get(session, stale.id)
+    assert stale.status == ExportJobStatus.failed
+    assert stale.error
+
+async def test_job_writes_export(database, jobs, tmp_path):
+    institution_id, = await create_institutions(database, 1)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_id, = await create_equipment(database, institution_id, model_id)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    await create_repair_requests(database, equipment_id, [start + timedelta(hours=i) for i in range(2500)])
+
+    for export_format in ExportFormat:
+        if export_format == ExportFormat.parquet:
+            pytest.importorskip("pyarrow")
+
+        job, _ = await enqueue(jobs, export_format)
+        await jobs.run(job.id)
+
+        async with session_factory() as session:
+            job = await jobs.get(session, job.id)
+        assert job.status == ExportJobStatus.finished, job.error
+        assert job.rows_written > 2500
+        assert os.path.getsize(tmp_path / job.download_url.rsplit("/", 1)[-1]) > 0
@@ -0,0 +1,111 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, insert
+
+from src.database import session_factory
+from src.equipment.repository import EquipmentRepository
+from src.equipment_model.repository import EquipmentModelRepository
+from src.failure_type.repository import FailureTypeRepository
+from src.failure_type.schemas import FailureTypeRepairRequest
+from src.institution.repository import InstitutionRepository
+from src.repair_request.schemas import UsedSparePart, RepairRequest
+from src.spare_part.repository import SparePartRepository
+from src.statistics.rollup import backfill_daily_stats, refresh_repair_request_day
+from src.statistics.schemas import RepairRequestDailyStat
+from tests.factories import (
+    create_institutions, create_equipment_models, create_equipment, create_repair_requests, create_failure_types,
+    create_spare_parts, repair_request_row,
+)
+
+START = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+async def rollup_rows(database) -> list[tuple]:
+    stat = RepairRequestDailyStat
+    columns = [stat.day, stat.institution_id, stat.equipment_model_id, stat.failure_type_id, stat.request_count, stat.spare_part_quantity]
+    return [tuple(row) for row in (await database.execute(select(*columns).order_by(*columns))).all()]
+
+async def assert_rollup_is_fresh(database):
+    rows = await rollup_rows(database)
+    await backfill_daily_stats(database)
+    assert rows == await rollup_rows(database)
+
+async def seed(database):
+    institution_ids = await create_institutions(database, 2)
+    model_ids = await create_equipment_models(database, 2)
+    failure_type_ids = await create_failure_types(database, 2)
+    spare_part_id, = await create_spare_parts(database, 1)
+
+    equipment_ids = [
+        *await create_equipment(database, institution_ids[0], model_ids[0]),
+        *await create_equipment(database, institution_ids[1], model_ids[1]),
+    ]
+    request_ids = []
+    for equipment_id in equipment_ids:
+        request_ids += await create_repair_requests(database, equipment_id, [START + timedelta(days=day) for day in (0, 1, 3)])
+
+    await database.execute(insert(FailureTypeRepairRequest), [
+        {"repair_request_id": request_id, "failure_type_id": failure_type_ids[i % 2]} for i, request_id in enumerate(request_ids)
+    ])
+    # Requests on the second institution's equipment use spare parts from the first one's stock.
+    await database.execute(insert(UsedSparePart), [
+        {"repair_request_id": request_id, "spare_part_id": spare_part_id, "institution_id": institution_ids[0], "quantity": 2, "note": ""}
+        for request_id in request_ids[3:]
+    ])
+    await database.commit()
+    await backfill_daily_stats(database)
+    return institution_ids, model_ids, failure_type_ids, spare_part_id, equipment_ids
+
+async def test_concurrent_refreshes_of_a_day_do_not_double_count(database):
+    institution_id, = await create_institutions(database, 1)
+    model_id, = await create_equipment_models(database, 1)
+    first, second = await create_equipment(database, institution_id, model_id, count=2)
+
+    async with session_factory() as a, session_factory() as b:
+        async def create(session, equipment_id: int) -> int:
+            return (await session.execute(insert(RepairRequest).values(repair_request_row(equipment_id, START)).returning(RepairRequest.id))).scalar()
+
+        await refresh_repair_request_day(a, await create(a, first))
+        second_refresh = asyncio.create_task(refresh_repair_request_day(b, await create(b, second)))
+        await asyncio.sleep(0.2)
+        # The second transaction waits for the day until the first one commits.
+        assert not second_refresh.done()
+
+        await a.commit()
+        await second_refresh
+        await b.commit()
+
+    rows = await rollup_rows(database)
+    assert rows == [(START.date(), institution_id, model_id, None, 2, 0)]
+    await assert_rollup_is_fresh(database)
+
+async def test_moving_equipment_moves_its_requests(database):
+    institution_ids, model_ids, _, _, equipment_ids = await seed(database)
+    await EquipmentRepository().update(equipment_ids[0], {"institution_id": institution_ids[1], "equipment_model_id": model_ids[1]}, database)
+    await assert_rollup_is_fresh(database)
+
+async def test_deleting_equipment_removes_its_requests(database):
+    *_, equipment_ids = await seed(database)
+    await EquipmentRepository().delete(equipment_ids[1], database)
+    await assert_rollup_is_fresh(database)
+
+async def test_deleting_institution_removes_its_requests_and_used_parts(database):
+    institution_ids, *_ = await seed(database)
+    await InstitutionRepository().delete(institution_ids[0], database)
+    await assert_rollup_is_fresh(database)
+
+async def test_deleting_equipment_model_removes_its_requests(database):
+    _, model_ids, *_ = await seed(database)
+    await EquipmentModelRepository().delete(model_ids[0], database)
+    await assert_rollup_is_fresh(database)
+
+async def test_deleting_failure_type_removes_its_rows(database):
+    _, _, failure_type_ids, *_ = await seed(database)
+    await FailureTypeRepository().delete(failure_type_ids[0], database)
+    await assert_rollup_is_fresh(database)
+
+async def test_deleting_spare_part_removes_used_quantities(database):
+    _, _, _, spare_part_id, _ = await seed(database)
+    await SparePartRepository().delete(spare_part_id, database)
+    await assert_rollup_is_fresh(database)
@@ -0,0 +1,77 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select, func
+
+from src.institution.repository import InstitutionRepository
+from src.repair_request.repository import RepairRequestRepository
+from src.spare_part.ledger import get_stock_at, take_stock_snapshot, StockLevel
+from src.spare_part.repository import SparePartRepository
+from src.spare_part.schemas import Location
+from tests.factories import (
+    create_institutions, create_equipment_models, create_equipment, create_repair_requests, create_spare_parts,
+    create_locations,
+)
+
+START = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+async def current_stock(database) -> list[StockLevel]:
+    rows = await database.execute(
+        select(Location.spare_part_id, Location.institution_id, Location.quantity)
+        .where(Location.quantity != 0)
+        .order_by(Location.spare_part_id, Location.institution_id)
+    )
+    return [StockLevel(*row) for row in rows]
+
+def used(*parts: tuple[int, int, int]) -> list[dict]:
+    return [
+        {"spare_part_id": spare_part_id, "institution_id": institution_id, "quantity": quantity, "note": ""}
+        for spare_part_id, institution_id, quantity in parts
+    ]
+
+def locations(quantities: dict[int, int]) -> list[dict]:
+    return [{"institution_id": institution_id, "quantity": quantity} for institution_id, quantity in quantities.items()]
+
+async def test_stock_at_replays_every_change(database):
+    first, second, third = await create_institutions(database, 3)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_id, = await create_equipment(database, first, model_id)
+    request_id, other_request_id = await create_repair_requests(database, equipment_id, [START, START])
+    part, other_part = await create_spare_parts(database, 2)
+    await create_locations(database, part, {first: 10, second: 5})
+    await create_locations(database, other_part, {first: 3, third: 8})
+    requests, spare_parts = RepairRequestRepository(), SparePartRepository()
+
+    before_ledger = (await database.execute(select(func.clock_timestamp()))).scalar()
+    await take_stock_snapshot(database)
+
+    changes = [
+        lambda: requests.update(request_id, {"id": request_id, "used_spare_parts": used((part, first, 4), (other_part, third, 2))}, database),
+        lambda: spare_parts.update(part, {"id": part, "locations": locations({first: 6, second: 9, third: 1})}, database),
+        lambda: take_stock_snapshot(database),
+        # Consuming all of a location removes it.
+        lambda: requests.update(other_request_id, {"id": other_request_id, "used_spare_parts": used((other_part, first, 3), (part, second, 2))}, database),
+        lambda: requests.update(request_id, {"id": request_id, "used_spare_parts": []}, database),
+        lambda: spare_parts.update(other_part, {"id": other_part, "locations": locations({first: 2, third: 12})}, database),
+        lambda: InstitutionRepository().delete(third, database),
+        lambda: spare_parts.delete(other_part, database),
+    ]
+    checkpoints = []
+    for change in changes:
+        await change()
+        database.expire_all()
+        at = (await database.execute(select(func.clock_timestamp()))).scalar()
+        checkpoints.append((at, await current_stock(database)))
+
+    # Every change but the snapshot moves stock.
+    assert len({tuple(stock) for _, stock in checkpoints}) == len(changes) - 1
+    for at, stock in checkpoints:
+        assert await get_stock_at(database, at) == stock
+        assert await get_stock_at(database, at, spare_part_id=part) == [level for level in stock if level.spare_part_id == part]
+        assert await get_stock_at(database, at, institution_id=third) == [level for level in stock if level.institution_id == third]
+
+    assert await get_stock_at(database, before_ledger) == []
+    # The deleted institution and spare part keep their history.
+    at, stock = checkpoints[5]
+    assert StockLevel(other_part, third, 12) in stock
+    assert StockLevel(other_part, third, 12) in await get_stock_at(database, at)
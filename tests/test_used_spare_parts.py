@@ -0,0 +1,85 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+
+from src.exceptions import DomainError, DomainErrorCode
+from src.repair_request.repository import RepairRequestRepository
+from src.repair_request.schemas import UsedSparePart
+from src.spare_part.schemas import Location, SparePart
+from tests.factories import (
+    create_institutions, create_equipment_models, create_equipment, create_repair_requests, create_spare_parts,
+    create_locations, create_failure_types,
+)
+
+START = datetime(2024, 5, 1, 12, tzinfo=timezone.utc)
+
+
+async def seed(database, spare_part_count: int):
+    institution_id, = await create_institutions(database, 1)
+    model_id, = await create_equipment_models(database, 1)
+    equipment_id, = await create_equipment(database, institution_id, model_id)
+    request_id, = await create_repair_requests(database, equipment_id, [START])
+    spare_part_ids = await create_spare_parts(database, spare_part_count)
+    for spare_part_id in spare_part_ids:
+        await create_locations(database, spare_part_id, {institution_id: 10})
+    return institution_id, request_id, spare_part_ids
+
+def used(institution_id: int, spare_part_ids: list[int], quantity: int) -> list[dict]:
+    return [
+        {"spare_part_id": spare_part_id, "institution_id": institution_id, "quantity": quantity, "note": ""}
+        for spare_part_id in spare_part_ids
+    ]
+
+async def locations(database) -> dict[int, int]:
+    database.expire_all()
+    return dict((await database.execute(select(Location.spare_part_id, Location.quantity))).all())
+
+async def update_statements(database, statements, request_id: int, data: dict) -> int:
+    statements.reset()
+    await RepairRequestRepository().update(request_id, {"id": request_id, **data}, database)
+    return statements.count
+
+@pytest.mark.parametrize("spare_part_count", [2, 15])
+async def test_used_spare_parts_update_is_constant_round_trips(database, statements, spare_part_count):
+    institution_id, request_id, spare_part_ids = await seed(database, spare_part_count)
+    failure_type_ids = await create_failure_types(database, spare_part_count)
+
+    # UPDATE request, DELETE and INSERT used parts, lock parts and locations, upsert
+    # locations, INSERT movements, lock parts, refresh totals and statuses, four for the
+    # rollup day, then SELECT the request.
+    first = await update_statements(database, statements, request_id, {"used_spare_parts": used(institution_id, spare_part_ids, 3)})
+    assert first == 15
+    assert await locations(database) == dict.fromkeys(spare_part_ids, 7)
+
+    # Giving back, consuming more and dropping parts costs the same.
+    changed = used(institution_id, spare_part_ids[1:], 5)
+    changed[0]["quantity"] = 1
+    assert await update_statements(database, statements, request_id, {"used_spare_parts": changed}) == first
+    assert await locations(database) == {spare_part_ids[0]: 10, spare_part_ids[1]: 9, **dict.fromkeys(spare_part_ids[2:], 5)}
+
+    # UPDATE request, sync_association's DELETE and INSERT, the rollup day and the SELECT.
+    assert await update_statements(database, statements, request_id, {"failure_types_ids": failure_type_ids}) == 8
+    assert await update_statements(database, statements, request_id, {"failure_types_ids": failure_type_ids[1:]}) == 8
+
+async def test_emptied_location_is_removed(database):
+    institution_id, request_id, spare_part_ids = await seed(database, 2)
+
+    await RepairRequestRepository().update(request_id, {"id": request_id, "used_spare_parts": used(institution_id, spare_part_ids, 10)}, database)
+    assert await locations(database) == {}
+    totals = (await database.execute(select(SparePart.total_quantity))).scalars().all()
+    assert totals == [0, 0]
+
+    await RepairRequestRepository().update(request_id, {"id": request_id, "used_spare_parts": []}, database)
+    assert await locations(database) == dict.fromkeys(spare_part_ids, 10)
+    assert (await database.execute(select(UsedSparePart))).scalars().all() == []
+
+async def test_over_consumption_is_rejected(database):
+    institution_id, request_id, spare_part_ids = await seed(database, 1)
+
+    with pytest.raises(DomainError) as error:
+        await RepairRequestRepository().update(request_id, {"id": request_id, "used_spare_parts": used(institution_id, spare_part_ids, 11)}, database)
+    assert error.value.code == DomainErrorCode.check_constraint
+
+    await database.rollback()
+    assert await locations(database) == dict.fromkeys(spare_part_ids, 10)